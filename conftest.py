@@ -1,13 +1,111 @@
 import uuid
+from contextlib import contextmanager
 
 import pytest
 from django.contrib.auth.models import User
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 
 from events.models import Event, Venue
+from eventservice.redis_client import get_redis
+from eventservice.throttling import TokenBucketThrottle
 from orders.models import Order, Ticket, TicketType
 
 
+@pytest.fixture(autouse=True)
+def disable_response_cache(settings):
+    settings.RESPONSE_CACHE = False
+
+
+@pytest.fixture(autouse=True)
+def unthrottled(monkeypatch):
+    # Buckets outlive a test in Redis; tests of a limit set its rate with throttle_rates.
+    monkeypatch.setattr(TokenBucketThrottle, "THROTTLE_RATES", {})
+
+
+@pytest.fixture
+def throttle_rates(monkeypatch):
+    rates = {}
+    monkeypatch.setattr(TokenBucketThrottle, "THROTTLE_RATES", rates)
+    yield rates
+    keys = list(get_redis().scan_iter("throttle:*"))
+    if keys:
+        get_redis().delete(*keys)
+
+
+@pytest.fixture(autouse=True)
+def uncollected_static_files(settings):
+    # Tests run without collectstatic, so there is no manifest of hashed file names.
+    settings.STORAGES = {
+        **settings.STORAGES,
+        "staticfiles": {"BACKEND": "django.contrib.staticfiles.storage.StaticFilesStorage"},
+    }
+
+
+def full_scans(plan: dict, limited: bool = False) -> list[str]:
+    """Relations read in full: sequential scans, and index scans with no index condition
+    unless a ``Limit`` above them stops after the first rows in index order."""
+    scans = []
+    if plan["Node Type"] == "Seq Scan":
+        scans.append(plan["Relation Name"])
+    elif plan["Node Type"] in ("Index Scan", "Index Only Scan"):
+        if "Index Cond" not in plan and not limited:
+            scans.append(plan["Relation Name"])
+
+    # Rows stream through the outer side of a nested loop, so a limit still applies there.
+    limited = plan["Node Type"] == "Limit" or (limited and plan["Node Type"] == "Nested Loop")
+    for child in plan.get("Plans", []):
+        scans += full_scans(child, limited and child["Parent Relationship"] == "Outer")
+    return scans
+
+
+@pytest.fixture
+def assert_no_seq_scans():
+    """Fail if any statement run inside the block has to read a whole table.
+
+    Sequential scans are disabled for the planner, so on small test tables it still picks
+    an index whenever one fits the query and falls back to a full scan only when none does.
+    """
+
+    @contextmanager
+    def _assert_no_seq_scans():
+        with CaptureQueriesContext(connection) as context:
+            yield
+        with connection.cursor() as cursor:
+            cursor.execute("SET LOCAL enable_seqscan = off")
+            for query in context.captured_queries:
+                if query["sql"].split(None, 1)[0] not in ("SELECT", "WITH", "UPDATE", "DELETE"):
+                    continue
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {query['sql']}")
+                relations = full_scans(cursor.fetchone()[0][0]["Plan"])
+                assert not relations, f"Full scan of {relations}: {query['sql']}"
+
+    return _assert_no_seq_scans
+
+
+@pytest.fixture
+def capture_sql():
+    """Record the SQL of every statement run inside the block.
+
+    Unlike CaptureQueriesContext this does not read the connection's query log, which each
+    test client request resets.
+    """
+
+    @contextmanager
+    def _capture_sql():
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        with connection.execute_wrapper(record):
+            yield statements
+
+    return _capture_sql
+
+
 @pytest.fixture
 def create_user():
     def _create_user(username: str, password: str = "password123", **kwargs) -> User:
@@ -1,8 +1,20 @@
 #!/bin/sh
 
-while ! nc -z db 5432; do
+while ! nc -z "${POSTGRES_HOST:-db}" "${POSTGRES_PORT:-5432}"; do
   sleep 0.1
 done
 
+# Processes of one container share their Prometheus metrics through this directory.
+if [ -n "$PROMETHEUS_MULTIPROC_DIR" ]; then
+  rm -rf "$PROMETHEUS_MULTIPROC_DIR"
+  mkdir -p "$PROMETHEUS_MULTIPROC_DIR"
+fi
+
+# Worker and beat containers pass their own command.
+if [ "$#" -gt 0 ]; then
+  exec "$@"
+fi
+
 python manage.py migrate
-python manage.py runserver 0.0.0.0:8000
\ No newline at end of file
+python manage.py collectstatic --noinput
+exec gunicorn -c gunicorn.conf.py
@@ -0,0 +1,49 @@
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchVector
+from django.db.models import Q
+from rest_framework.filters import SearchFilter
+
+SEARCH_CONFIG = "english"
+
+EVENT_SEARCH_VECTOR = SearchVector("name", weight="A", config=SEARCH_CONFIG) + SearchVector(
+    "description", weight="B", config=SEARCH_CONFIG
+)
+
+
+def prefix_search_query(terms: list[str]) -> SearchQuery | None:
+    words = [word for term in terms for word in re.findall(r"\w+", term)]
+    if not words:
+        return None
+    return SearchQuery(
+        " & ".join(f"{word}:*" for word in words), search_type="raw", config=SEARCH_CONFIG
+    )
+
+
+class FullTextSearchFilter(SearchFilter):
+    """Search through a stored Postgres ``SearchVectorField`` instead of ``icontains`` scans.
+
+    Views set ``search_vector_field`` to the vector to match every term against as a
+    prefix, ``search_trigram_field`` to a trigram-indexed column for typo-tolerant
+    matches and, optionally, ``search_exact_fields`` for columns compared verbatim.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        query = prefix_search_query(terms)
+        if query is None:
+            return queryset
+
+        condition = Q(**{view.search_vector_field: query})
+        trigram_field = getattr(view, "search_trigram_field", None)
+        if trigram_field:
+            condition |= Q(**{f"{trigram_field}__trigram_word_similar": " ".join(terms)})
+        for field in getattr(view, "search_exact_fields", ()):
+            condition |= Q(**{f"{field}__in": terms})
+
+        return queryset.filter(condition)
+
+    def to_html(self, request, queryset, view):
+        if not getattr(view, "search_vector_field", None):
+            return ""
+        return super().to_html(request, queryset, view)
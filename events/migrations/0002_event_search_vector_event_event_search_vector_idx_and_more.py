@@ -0,0 +1,45 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:22
+
+import django.contrib.postgres.indexes
+import django.contrib.postgres.search
+from django.conf import settings
+from django.contrib.postgres.operations import TrigramExtension
+from django.contrib.postgres.search import SearchVector
+from django.db import migrations
+
+
+def fill_search_vector(apps, schema_editor):
+    Event = apps.get_model("events", "Event")
+    name = SearchVector("name", weight="A", config="english")
+    description = SearchVector("description", weight="B", config="english")
+    Event.objects.update(search_vector=name + description)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0001_initial"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        TrigramExtension(),
+        migrations.AddField(
+            model_name="event",
+            name="search_vector",
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["search_vector"], name="event_search_vector_idx"
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="event",
+            index=django.contrib.postgres.indexes.GinIndex(
+                fields=["name"], name="event_name_trgm_idx", opclasses=["gin_trgm_ops"]
+            ),
+        ),
+        migrations.RunPython(fill_search_vector, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,25 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0002_event_search_vector_event_event_search_vector_idx_and_more"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="event",
+            index=models.Index(fields=["date", "id"], name="event_date_id_idx"),
+        ),
+        migrations.AddConstraint(
+            model_name="venue",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("capacity__gte", 0)), name="venue_capacity_non_negative"
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.1.15 on 2026-10-18 20:45
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_event_date_id_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="event",
+            name="waiting_room",
+            field=models.BooleanField(default=False),
+        ),
+    ]
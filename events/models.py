@@ -1,3 +1,5 @@
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
 
 
@@ -6,6 +8,13 @@ class Venue(models.Model):
     address = models.CharField(max_length=255)
     capacity = models.IntegerField()
 
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(capacity__gte=0), name="venue_capacity_non_negative"
+            )
+        ]
+
     def __str__(self):
         return self.name
 
@@ -16,6 +25,16 @@ class Event(models.Model):
     date = models.DateField()
     venue = models.ForeignKey(Venue, on_delete=models.CASCADE)
     organizer = models.ForeignKey("auth.User", on_delete=models.CASCADE)
+    search_vector = SearchVectorField(null=True, editable=False)
+    # Buyers must queue for admission before they can order tickets for the event.
+    waiting_room = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["date", "id"], name="event_date_id_idx"),
+            GinIndex(fields=["search_vector"], name="event_search_vector_idx"),
+            GinIndex(fields=["name"], name="event_name_trgm_idx", opclasses=["gin_trgm_ops"]),
+        ]
 
     def __str__(self):
         return f"{self.name} ({self.date} - {self.venue.name})"
@@ -5,4 +5,4 @@ class IsOrganizerOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.organizer == request.user
+        return obj.organizer_id == request.user.pk
@@ -16,10 +16,19 @@ class VenueSerializer(serializers.ModelSerializer):
         return value
 
 
+class CurrentUserIdDefault(serializers.CurrentUserDefault):
+    """The requesting user's id, which token-authenticated users carry without a query."""
+
+    def __call__(self, serializer_field):
+        return super().__call__(serializer_field).pk
+
+
 class EventSerializer(serializers.ModelSerializer):
-    organizer = serializers.HiddenField(default=serializers.CurrentUserDefault())
+    organizer = serializers.HiddenField(source="organizer_id", default=CurrentUserIdDefault())
+    venue_name = serializers.CharField(source="venue.name", read_only=True)
+    tickets_available = serializers.IntegerField(read_only=True)
 
     class Meta:
 
         model = Event
-        fields = "__all__"
+        exclude = ["search_vector"]
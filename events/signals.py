@@ -0,0 +1,21 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from events.filters import EVENT_SEARCH_VECTOR
+from events.models import Event, Venue
+from eventservice.cache import bump_version_on_commit
+
+
+@receiver([post_save, post_delete], sender=Venue)
+def bump_venue_version(sender, **kwargs):
+    bump_version_on_commit("venue")
+
+
+@receiver([post_save, post_delete], sender=Event)
+def bump_event_version(sender, **kwargs):
+    bump_version_on_commit("event")
+
+
+@receiver(post_save, sender=Event)
+def update_event_search_vector(sender, instance, **kwargs):
+    Event.objects.filter(pk=instance.pk).update(search_vector=EVENT_SEARCH_VECTOR)
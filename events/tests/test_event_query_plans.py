@@ -0,0 +1,29 @@
+import pytest
+from django.urls import reverse
+
+from orders.models import Ticket
+
+
+@pytest.fixture
+def catalog(create_event, create_ticket):
+    events = [create_event(name=f"Concert {number}") for number in range(3)]
+    for event in events:
+        create_ticket(event=event)
+    return events
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("params", [{}, {"page_size": 1}, {"search": "concert"}])
+def test_event_list_uses_indexes(api_client, catalog, assert_no_seq_scans, params):
+    with assert_no_seq_scans():
+        response = api_client.get(reverse("event-list"), params)
+        if response.data["next"]:
+            api_client.get(response.data["next"])
+
+
+@pytest.mark.django_db
+def test_event_detail_uses_indexes(api_client, catalog, assert_no_seq_scans):
+    Ticket.objects.filter(event=catalog[0]).update(shard_count=2)
+
+    with assert_no_seq_scans():
+        api_client.get(reverse("event-detail", args=[catalog[0].id]))
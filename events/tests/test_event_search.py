@@ -0,0 +1,51 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from events.models import Event
+
+
+@pytest.fixture
+def catalog(create_event):
+    return [
+        create_event(name="Rock Concert", description="Loud guitars all night"),
+        create_event(name="Opera Gala", description="An evening of arias"),
+        create_event(name="Jazz Brunch", description="Smooth jazz and pancakes"),
+    ]
+
+
+def search_names(api_client, term: str) -> set[str]:
+    response = api_client.get(reverse("event-list"), {"search": term})
+    assert response.status_code == status.HTTP_200_OK
+    return {event["name"] for event in response.data["results"]}
+
+
+@pytest.mark.django_db
+def test_search_vector_follows_saves(create_event):
+    event = create_event(name="Rock Concert")
+    event.name = "Folk Festival"
+    event.save()
+
+    assert Event.objects.filter(search_vector="festival").get() == event
+    assert not Event.objects.filter(search_vector="rock").exists()
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "term, expected",
+    [
+        ("concert", {"Rock Concert"}),
+        ("conc", {"Rock Concert"}),
+        ("pancakes", {"Jazz Brunch"}),
+        ("evening aria", {"Opera Gala"}),
+        ("concrt", {"Rock Concert"}),
+        ("ballet", set()),
+    ],
+)
+def test_search_events(api_client, catalog, term: str, expected: set[str]):
+    assert search_names(api_client, term) == expected
+
+
+@pytest.mark.django_db
+def test_search_without_words_lists_everything(api_client, catalog):
+    assert search_names(api_client, "!!") == {event.name for event in catalog}
@@ -3,6 +3,7 @@ from django.urls import reverse
 from rest_framework import status
 
 from events.models import Event
+from orders.models import TicketType
 
 
 @pytest.mark.django_db
@@ -51,7 +52,7 @@ def test_list_event_success(api_client, create_event) -> None:
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 2
+    assert len(response.data["results"]) == 2
 
 
 @pytest.mark.django_db
@@ -131,3 +132,46 @@ def test_delete_event_failure_not_organizer(api_client, create_event, create_use
 
     assert response.status_code == status.HTTP_403_FORBIDDEN
     assert Event.objects.count() == 1
+
+
+@pytest.mark.django_db
+def test_list_event_includes_venue_and_ticket_availability(api_client, create_event, create_ticket):
+    event = create_event(name="Event1")
+    create_ticket(event=event, type=TicketType.standard, available_quantity=10)
+    create_ticket(event=event, type=TicketType.vip, available_quantity=5)
+    create_event(name="Event2")
+    url = reverse("event-list")
+    response = api_client.get(url)
+
+    results = {result["name"]: result for result in response.data["results"]}
+    assert results["Event1"]["venue_name"] == event.venue.name
+    assert results["Event1"]["tickets_available"] == 15
+    assert results["Event2"]["tickets_available"] == 0
+
+
+@pytest.mark.django_db
+def test_list_event_paginates_with_cursor(api_client, create_event) -> None:
+    for number in range(5):
+        create_event(name=f"Event{number}")
+    url = reverse("event-list")
+    response = api_client.get(url, {"page_size": 3})
+
+    assert len(response.data["results"]) == 3
+    response = api_client.get(response.data["next"])
+    assert len(response.data["results"]) == 2
+    assert response.data["next"] is None
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("events_count", [2, 20])
+def test_list_event_query_count_is_constant(
+    api_client, create_event, create_ticket, django_assert_num_queries, events_count
+) -> None:
+    for number in range(events_count):
+        create_ticket(event=create_event(name=f"Event{number}"))
+    url = reverse("event-list")
+
+    with django_assert_num_queries(1):
+        response = api_client.get(url)
+
+    assert len(response.data["results"]) == events_count
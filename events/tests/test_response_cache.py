@@ -0,0 +1,76 @@
+import pytest
+from django.core.cache import cache
+from django.urls import reverse
+from rest_framework import status
+
+from eventservice.cache import local_cache, version_key
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.RESPONSE_CACHE = True
+    cache.delete_many([version_key(label) for label in ("venue", "event", "ticket")])
+    local_cache.clear()
+
+
+@pytest.mark.django_db
+def test_cached_list_skips_database(
+    response_cache, api_client, create_venue, django_assert_num_queries
+):
+    create_venue(name="Venue1")
+    url = reverse("venue-list")
+    first = api_client.get(url)
+
+    with django_assert_num_queries(0):
+        second = api_client.get(url)
+
+    assert second.status_code == status.HTTP_200_OK
+    assert second.data == first.data
+    assert second["ETag"] == first["ETag"]
+
+
+@pytest.mark.django_db
+def test_matching_etag_returns_not_modified(
+    response_cache, api_client, create_event, django_assert_num_queries
+):
+    event = create_event(name="Event1")
+    url = reverse("event-detail", args=[event.id])
+    etag = api_client.get(url)["ETag"]
+
+    with django_assert_num_queries(0):
+        response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_304_NOT_MODIFIED
+    assert not response.content
+
+
+@pytest.mark.django_db
+def test_write_bumps_version(
+    response_cache, api_client, create_venue, django_capture_on_commit_callbacks
+):
+    venue = create_venue(name="Old Name")
+    url = reverse("venue-detail", args=[venue.id])
+    etag = api_client.get(url)["ETag"]
+
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.patch(url, data={"name": "New Name"}, format="json")
+    response = api_client.get(url, HTTP_IF_NONE_MATCH=etag)
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["name"] == "New Name"
+    assert response["ETag"] != etag
+
+
+@pytest.mark.django_db
+def test_order_refreshes_cached_ticket_availability(
+    response_cache, api_client, create_user, create_ticket, django_capture_on_commit_callbacks
+):
+    ticket = create_ticket(available_quantity=10)
+    url = reverse("ticket-detail", args=[ticket.id])
+    assert api_client.get(url).data["available_quantity"] == 10
+
+    api_client.force_authenticate(user=create_user("customer"))
+    with django_capture_on_commit_callbacks(execute=True):
+        api_client.post(reverse("order-list"), data={"ticket": ticket.id, "quantity": 3})
+
+    assert api_client.get(url).data["available_quantity"] == 7
@@ -1,17 +1,89 @@
+from django.db.models import OuterRef, Subquery, Sum
+from django.db.models.functions import Coalesce
 from django.shortcuts import render
-from rest_framework import permissions, viewsets
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
 
+from events.filters import FullTextSearchFilter
 from events.models import Event, Venue
+from events.pagination import EventCursorPagination
 from events.permissions import IsOrganizerOrReadOnly
 from events.serializers import EventSerializer, VenueSerializer
+from eventservice.cache import CachedResponseMixin
+from eventservice.db_router import ReadReplicaMixin
+from eventservice.throttling import UserTokenBucketThrottle
+from orders import waiting_room
+from orders.models import Ticket, TicketShard
 
 
-class VenueViewSet(viewsets.ModelViewSet):
+class VenueViewSet(ReadReplicaMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = ("venue",)
     queryset = Venue.objects.all()
     serializer_class = VenueSerializer
 
 
-class EventViewSet(viewsets.ModelViewSet):
+class EventViewSet(ReadReplicaMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = ("event", "venue", "ticket")
     queryset = Event.objects.all()
     serializer_class = EventSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly, IsOrganizerOrReadOnly]
+    pagination_class = EventCursorPagination
+    filter_backends = [FullTextSearchFilter]
+
+    throttle_scope = "queue"
+    throttle_classes = [UserTokenBucketThrottle]
+
+    search_vector_field = "search_vector"
+    search_trigram_field = "name"
+
+    def get_queryset(self):
+        tickets = (
+            Ticket.objects.filter(event=OuterRef("pk"))
+            .order_by()
+            .values("event")
+            .annotate(total=Sum("available_quantity"))
+            .values("total")
+        )
+        shards = (
+            TicketShard.objects.filter(ticket__event=OuterRef("pk"))
+            .order_by()
+            .values("ticket__event")
+            .annotate(total=Sum("available_quantity"))
+            .values("total")
+        )
+        return Event.objects.select_related("venue").annotate(
+            tickets_available=Coalesce(Subquery(tickets), 0) + Coalesce(Subquery(shards), 0)
+        )
+
+    def get_throttles(self):
+        # Every join takes a place in line, so scripted joins must not crowd out buyers.
+        if self.action == "queue":
+            return super().get_throttles()
+        return []
+
+    @action(detail=True, methods=["post"], permission_classes=[permissions.IsAuthenticated])
+    def queue(self, request, pk=None):
+        """Join the event's waiting room and get a queue token to order with."""
+        event_id = self.event_id()
+        if not Event.objects.filter(pk=event_id, waiting_room=True).exists():
+            raise NotFound("This event has no waiting room.")
+        return Response(waiting_room.join(event_id, request.user), status=status.HTTP_201_CREATED)
+
+    @action(
+        detail=True,
+        url_path="queue/position",
+        authentication_classes=[],
+        permission_classes=[permissions.AllowAny],
+    )
+    def queue_position(self, request, pk=None):
+        """Position of a queue token, answered from Redis alone so buyers can poll it."""
+        token = request.headers.get(waiting_room.HEADER)
+        return Response(waiting_room.position(self.event_id(), token))
+
+    def event_id(self) -> int:
+        try:
+            return int(self.kwargs["pk"])
+        except ValueError:
+            raise NotFound()
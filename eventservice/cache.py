@@ -0,0 +1,138 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from redis.exceptions import RedisError
+from rest_framework import status
+from rest_framework.response import Response
+
+from eventservice.db_router import read_from_replica
+
+logger = logging.getLogger(__name__)
+
+# Cached GET responses are keyed by the URL and the current version of every model they
+# are built from. Saving or deleting one of those models bumps its version, so old
+# entries are never read again and simply age out. The same key doubles as the ETag.
+
+
+class LocalLRUCache:
+    """Small thread-safe in-process cache that sits in front of Redis."""
+
+    def __init__(self, maxsize: int) -> None:
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+local_cache = LocalLRUCache(settings.RESPONSE_CACHE_LOCAL_SIZE)
+
+
+def version_key(label: str) -> str:
+    return f"version:{label}"
+
+
+def get_versions(labels) -> list[int]:
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            # Seed from the clock so a flushed Redis never repeats an old version.
+            cache.add(key, time.time_ns(), timeout=None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def bump_version(label: str) -> None:
+    try:
+        cache.incr(version_key(label))
+    except ValueError:
+        cache.add(version_key(label), time.time_ns(), timeout=None)
+    except RedisError:
+        logger.warning("Could not bump the %s cache version.", label, exc_info=True)
+
+
+def bump_version_on_commit(label: str) -> None:
+    transaction.on_commit(lambda: bump_version(label))
+
+
+def etag_matches(request, etag: str) -> bool:
+    header = request.headers.get("If-None-Match", "")
+    tags = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+    return etag in tags or "*" in tags
+
+
+class CachedResponseMixin:
+    """Serve ``list`` and ``retrieve`` from the versioned response cache.
+
+    ``cache_models`` names every model whose changes must invalidate the response.
+    """
+
+    cache_models: tuple[str, ...] = ()
+
+    def list(self, request, *args, **kwargs):
+        return self.cached_response(super().list, request, *args, **kwargs)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.cached_response(super().retrieve, request, *args, **kwargs)
+
+    def cached_response(self, handler, request, *args, **kwargs):
+        if not settings.RESPONSE_CACHE or request.accepted_renderer.format != "json":
+            return handler(request, *args, **kwargs)
+
+        try:
+            versions = get_versions(self.cache_models)
+        except RedisError:
+            logger.warning("Response cache is unavailable.", exc_info=True)
+            return handler(request, *args, **kwargs)
+
+        digest = hashlib.sha256(f"{versions}:{request.build_absolute_uri()}".encode()).hexdigest()
+        key = f"response_entry:{digest}"
+        etag = f'"{digest[:32]}"'
+
+        if etag_matches(request, etag):
+            return Response(status=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+
+        entry = local_cache.get(key)
+        if entry is None:
+            entry = cache.get(key)
+        if entry is None:
+            response = handler(request, *args, **kwargs)
+            if response.status_code != status.HTTP_200_OK:
+                return response
+            # A replica may not have replayed the write behind the versions read above yet,
+            # for up to DB_PRIMARY_PIN_SECONDS, so what one built is kept no longer than that.
+            from_replica = bool(settings.DATABASE_REPLICAS) and read_from_replica.get()
+            entry = (response.data, from_replica)
+            timeout = (
+                settings.DB_PRIMARY_PIN_SECONDS if from_replica else settings.RESPONSE_CACHE_TIMEOUT
+            )
+            cache.set(key, entry, timeout)
+        data, from_replica = entry
+        if not from_replica:
+            # Local entries are only evicted, never expired.
+            local_cache.set(key, entry)
+
+        return Response(data, headers={"ETag": etag})
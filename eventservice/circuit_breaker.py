@@ -0,0 +1,121 @@
+import logging
+
+from redis.exceptions import RedisError
+
+from eventservice.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# The breaker's state lives in Redis so every worker process stops calling a failing
+# service together. Failures are counted in a fixed window; reaching the threshold opens
+# the circuit for the recovery timeout. After that it is half-open: a single caller is let
+# through as a probe, and its success closes the circuit while its failure opens it again.
+# If Redis itself is down the breaker stays out of the way and lets calls through.
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, OPEN, HALF_OPEN)
+
+ALLOW_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return 'open'
+end
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    return 'closed'
+end
+if redis.call('SET', KEYS[3], 1, 'NX', 'EX', ARGV[1]) then
+    return 'half_open'
+end
+return 'open'
+"""
+
+FAILURE_SCRIPT = """
+if redis.call('EXISTS', KEYS[2]) == 0 then
+    local failures = redis.call('INCR', KEYS[4])
+    if failures == 1 then
+        redis.call('EXPIRE', KEYS[4], ARGV[2])
+    end
+    if failures < tonumber(ARGV[1]) then
+        return 0
+    end
+end
+redis.call('SET', KEYS[1], 1, 'EX', ARGV[3])
+redis.call('SET', KEYS[2], 1)
+redis.call('DEL', KEYS[3], KEYS[4])
+return 1
+"""
+
+SUCCESS_SCRIPT = """
+redis.call('DEL', KEYS[1], KEYS[2], KEYS[3], KEYS[4])
+return 1
+"""
+
+_allow = get_redis().register_script(ALLOW_SCRIPT)
+_failure = get_redis().register_script(FAILURE_SCRIPT)
+_success = get_redis().register_script(SUCCESS_SCRIPT)
+
+# Every breaker created in this process, by name, for the metrics collector.
+breakers: dict[str, "CircuitBreaker"] = {}
+
+
+class CircuitBreaker:
+    def __init__(
+        self, name: str, failure_threshold: int, failure_window: int, recovery_timeout: int
+    ) -> None:
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.failure_window = failure_window
+        self.recovery_timeout = recovery_timeout
+        breakers[name] = self
+
+    @property
+    def keys(self) -> list[str]:
+        # open, tripped, probe, failures
+        return [f"circuit:{self.name}:{key}" for key in ("open", "tripped", "probe", "failures")]
+
+    def allow(self) -> str:
+        """Return the state a call is admitted under, or ``OPEN`` if it must not be made."""
+        try:
+            return _allow(keys=self.keys, args=[self.recovery_timeout]).decode()
+        except RedisError:
+            logger.warning("Circuit %s is unavailable, letting the call through.", self.name)
+            return CLOSED
+
+    def record_failure(self) -> None:
+        try:
+            opened = _failure(
+                keys=self.keys,
+                args=[self.failure_threshold, self.failure_window, self.recovery_timeout],
+            )
+        except RedisError:
+            logger.warning("Could not record a failure on circuit %s.", self.name)
+            return
+        if opened:
+            logger.error(
+                "Circuit %s is open, calls are paused for %s seconds.",
+                self.name,
+                self.recovery_timeout,
+            )
+
+    def record_success(self) -> None:
+        """Close the circuit after a successful half-open probe."""
+        try:
+            _success(keys=self.keys)
+        except RedisError:
+            logger.warning("Could not close circuit %s.", self.name)
+            return
+        logger.info("Circuit %s is closed.", self.name)
+
+    def open_for(self) -> int:
+        """Seconds until the open circuit lets a probe through, or 0 if it is not open."""
+        try:
+            return max(get_redis().ttl(self.keys[0]), 0)
+        except RedisError:
+            return 0
+
+    def state(self) -> str:
+        opened, tripped = get_redis().exists(self.keys[0]), get_redis().exists(self.keys[1])
+        if opened:
+            return OPEN
+        return HALF_OPEN if tripped else CLOSED
@@ -1,4 +1,4 @@
-from environs import Env
+from environs import Env, validate
 
 
 class Settings:
@@ -11,10 +11,29 @@ class Settings:
         self.DB_NAME: str = self.env.str("POSTGRES_DB")
         self.DB_USER: str = self.env.str("POSTGRES_USER")
         self.DB_PASSWORD: str = self.env.str("POSTGRES_PASSWORD")
+        self.DB_CONN_MAX_AGE: int = self.env.int("DB_CONN_MAX_AGE", 60)
+        self.DB_CONN_HEALTH_CHECKS: bool = self.env.bool("DB_CONN_HEALTH_CHECKS", True)
+        self.DB_TRANSACTION_POOLING: bool = self.env.bool("DB_TRANSACTION_POOLING", False)
+        self.DB_REPLICA_HOSTS: list[str] = self.env.list("POSTGRES_REPLICA_HOSTS", [])
+        self.DB_PRIMARY_PIN_SECONDS: int = self.env.int("DB_PRIMARY_PIN_SECONDS", 5)
         self.DJANGO_SECRET_KEY: str = self.env.str("DJANGO_SECRET_KEY")
+        self.DEBUG: bool = self.env.bool("DEBUG", False)
+        self.ALLOWED_HOSTS: list[str] = self.env.list("ALLOWED_HOSTS", ["localhost", "127.0.0.1"])
+        self.WEB_WORKERS: int = self.env.int("WEB_WORKERS", 0)
+        self.WEB_WORKER_CLASS: str = self.env.str("WEB_WORKER_CLASS", "gthread")
+        self.WEB_THREADS: int = self.env.int("WEB_THREADS", 4)
+        self.WEB_TIMEOUT: int = self.env.int("WEB_TIMEOUT", 30)
         self.CELERY_BROKER_URL: str = self.env.str("CELERY_BROKER_URL")
         self.CELERY_RESULT_BACKEND: str = self.env.str("CELERY_RESULT_BACKEND")
         self.CELERY_TIMEZONE: str = self.env.str("CELERY_TIMEZONE")
+        self.CELERY_METRICS_PORT: int = self.env.int("CELERY_METRICS_PORT", 0)
+        self.METRICS_ALLOWED_NETWORKS: list[str] = self.env.list(
+            "METRICS_ALLOWED_NETWORKS", ["127.0.0.1/32", "::1/128"]
+        )
+        self.REDIS_URL: str = self.env.str("REDIS_URL", "redis://redis:6379/0")
+        self.RESPONSE_CACHE: bool = self.env.bool("RESPONSE_CACHE", True)
+        self.RESPONSE_CACHE_TIMEOUT: int = self.env.int("RESPONSE_CACHE_TIMEOUT", 300)
+        self.RESPONSE_CACHE_LOCAL_SIZE: int = self.env.int("RESPONSE_CACHE_LOCAL_SIZE", 1024)
         self.AWS_ACCESS_KEY_ID: str = self.env.str("AWS_ACCESS_KEY_ID")
         self.AWS_SECRET_ACCESS_KEY: str = self.env.str("AWS_SECRET_ACCESS_KEY")
         self.AWS_DEFAULT_REGION: str = self.env.str("AWS_DEFAULT_REGION")
@@ -22,6 +41,50 @@ class Settings:
         self.ENDPOINT_URL: str = self.env.str("ENDPOINT_URL")
         self.SENDER: str = self.env.str("SENDER")
         self.MAX_TRIES: int = int(self.env("MAX_TRIES"))
+        self.SES_MAX_CONNECTIONS: int = self.env.int("SES_MAX_CONNECTIONS", 10)
+        self.NOTIFICATION_BATCH_SIZE: int = self.env.int("NOTIFICATION_BATCH_SIZE", 500)
+        self.NOTIFICATION_CONCURRENCY: int = self.env.int("NOTIFICATION_CONCURRENCY", 10)
+        self.NOTIFICATION_BULK_TEMPLATES: bool = self.env.bool("NOTIFICATION_BULK_TEMPLATES", False)
+        self.NOTIFICATION_RETRY_BACKOFF: int = self.env.int("NOTIFICATION_RETRY_BACKOFF", 2)
+        self.NOTIFICATION_RETRY_BACKOFF_MAX: int = self.env.int(
+            "NOTIFICATION_RETRY_BACKOFF_MAX", 600
+        )
+        self.NOTIFICATION_MAX_DEFERRALS: int = self.env.int("NOTIFICATION_MAX_DEFERRALS", 60)
+        self.SES_CIRCUIT_FAILURE_THRESHOLD: int = self.env.int("SES_CIRCUIT_FAILURE_THRESHOLD", 5)
+        self.SES_CIRCUIT_FAILURE_WINDOW: int = self.env.int("SES_CIRCUIT_FAILURE_WINDOW", 30)
+        self.SES_CIRCUIT_RECOVERY_TIMEOUT: int = self.env.int("SES_CIRCUIT_RECOVERY_TIMEOUT", 60)
+        self.ORDER_ENGINE: str = self.env.str(
+            "ORDER_ENGINE",
+            "row_lock",
+            validate=validate.OneOf(["row_lock", "conditional_update"]),
+        )
+        self.ORDER_HOLD_TTL: int = self.env.int("ORDER_HOLD_TTL", 0)
+        self.TICKET_RESERVATIONS: bool = self.env.bool("TICKET_RESERVATIONS", False)
+        self.TICKET_RESERVATION_TTL: int = self.env.int("TICKET_RESERVATION_TTL", 60)
+        self.WAITING_ROOM_RATE: float = self.env.float("WAITING_ROOM_RATE", 20)
+        self.WAITING_ROOM_MIN_RATE: float = self.env.float("WAITING_ROOM_MIN_RATE", 1)
+        self.WAITING_ROOM_MAX_RATE: float = self.env.float("WAITING_ROOM_MAX_RATE", 500)
+        self.WAITING_ROOM_TARGET_LATENCY: float = self.env.float(
+            "WAITING_ROOM_TARGET_LATENCY", 0.25
+        )
+        self.WAITING_ROOM_TOKEN_TTL: int = self.env.int("WAITING_ROOM_TOKEN_TTL", 3600)
+        self.THROTTLE_ORDERS_USER_RATE: str = self.env.str("THROTTLE_ORDERS_USER_RATE", "30/min")
+        self.THROTTLE_ORDERS_EVENT_RATE: str = self.env.str("THROTTLE_ORDERS_EVENT_RATE", "500/s")
+        self.THROTTLE_REGISTRATION_IP_RATE: str = self.env.str(
+            "THROTTLE_REGISTRATION_IP_RATE", "10/h"
+        )
+        self.THROTTLE_LOGIN_IP_RATE: str = self.env.str("THROTTLE_LOGIN_IP_RATE", "20/min")
+        self.THROTTLE_QUEUE_USER_RATE: str = self.env.str("THROTTLE_QUEUE_USER_RATE", "10/min")
+        self.NUM_PROXIES: int = self.env.int("NUM_PROXIES", 0)
+        self.PASSWORD_HASH_WORKERS: int = self.env.int("PASSWORD_HASH_WORKERS", 0)
+        self.PASSWORD_HASH_BACKLOG: int = self.env.int(
+            "PASSWORD_HASH_BACKLOG", self.WEB_THREADS // 4
+        )
+        self.JWT_SIGNING_KEY: str = self.env.str("JWT_SIGNING_KEY", "")
+        self.JWT_ACCESS_TOKEN_LIFETIME: int = self.env.int("JWT_ACCESS_TOKEN_LIFETIME", 300)
+        self.JWT_REFRESH_TOKEN_LIFETIME: int = self.env.int("JWT_REFRESH_TOKEN_LIFETIME", 86400)
+        self.IDEMPOTENCY_KEY_TTL: int = self.env.int("IDEMPOTENCY_KEY_TTL", 86400)
+        self.IDEMPOTENCY_LOCK_TIMEOUT: int = self.env.int("IDEMPOTENCY_LOCK_TIMEOUT", 10)
 
 
 settings = Settings()
@@ -0,0 +1,99 @@
+import logging
+import random
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+from redis.exceptions import RedisError
+from rest_framework.permissions import SAFE_METHODS
+
+from eventservice.redis_client import get_redis
+
+logger = logging.getLogger(__name__)
+
+# Views opt in to replica reads with ReadReplicaMixin, which sets this flag for the rest
+# of a safe request once it has been authenticated. Sessions, users and everything else
+# are read from the primary, as is anything the router sees while the flag is unset.
+read_from_replica: ContextVar[bool] = ContextVar("read_from_replica", default=False)
+
+
+class ReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if settings.DATABASE_REPLICAS and read_from_replica.get():
+            return random.choice(settings.DATABASE_REPLICAS)
+        return DEFAULT_DB_ALIAS
+
+    def db_for_write(self, model, **hints):
+        # Explicit, so instances loaded from a replica are still saved to the primary.
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+@contextmanager
+def primary_reads():
+    token = read_from_replica.set(False)
+    try:
+        yield
+    finally:
+        read_from_replica.reset(token)
+
+
+def pin_key(user) -> str:
+    return f"primary_pin:{user.pk}"
+
+
+def pin_to_primary(user) -> None:
+    """Read ``user``'s requests from the primary for DB_PRIMARY_PIN_SECONDS, long enough
+    for the replicas to catch up with what they just wrote."""
+    if not settings.DATABASE_REPLICAS or not user.is_authenticated:
+        return
+    try:
+        get_redis().set(pin_key(user), 1, ex=settings.DB_PRIMARY_PIN_SECONDS)
+    except RedisError:
+        logger.warning("Could not pin user %s to the primary.", user.pk, exc_info=True)
+
+
+def is_pinned(user) -> bool:
+    if not user.is_authenticated:
+        return False
+    try:
+        return bool(get_redis().exists(pin_key(user)))
+    except RedisError:
+        # Without the pin a user might not see their own writes, so stay on the primary.
+        logger.warning("Could not read the primary pin of user %s.", user.pk, exc_info=True)
+        return True
+
+
+class ReadReplicaMixin:
+    """Serve safe ``replica_actions`` requests from a read replica.
+
+    The decision is made after authentication, so sessions and users always come from
+    the primary. Successful writes pin the user to the primary for a short window.
+    """
+
+    replica_actions: tuple[str, ...] = ("list", "retrieve")
+
+    def initial(self, request, *args, **kwargs):
+        super().initial(request, *args, **kwargs)
+        if self.reads_from_replica(request):
+            self.replica_token = read_from_replica.set(True)
+
+    def reads_from_replica(self, request) -> bool:
+        if not settings.DATABASE_REPLICAS or request.method not in SAFE_METHODS:
+            return False
+        return self.action in self.replica_actions and not is_pinned(request.user)
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        token = getattr(self, "replica_token", None)
+        if token is not None:
+            read_from_replica.reset(token)
+            self.replica_token = None
+        if request.method not in SAFE_METHODS and response.status_code < 400:
+            pin_to_primary(request.user)
+        return super().finalize_response(request, response, *args, **kwargs)
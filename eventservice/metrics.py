@@ -0,0 +1,160 @@
+import ipaddress
+import logging
+import os
+import time
+from contextlib import ExitStack
+
+from celery.signals import task_postrun, task_prerun, task_retry, worker_init
+from django.conf import settings
+from django.db import connections
+from django.http import Http404, HttpResponse
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import StateSetMetricFamily
+from redis.exceptions import RedisError
+
+from eventservice.circuit_breaker import STATES, breakers
+
+logger = logging.getLogger(__name__)
+
+# Metrics are plain in-process counters and histograms: recording one is a dictionary
+# lookup and an addition, so they stay on in production. When PROMETHEUS_MULTIPROC_DIR is
+# set (gunicorn or prefork Celery workers) every process writes its values to files there
+# and a scrape adds them up.
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "Time spent handling a request, by view and action.",
+    ["view", "action", "method", "status"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "Database queries run while handling a request.",
+    ["view", "action"],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89),
+)
+TASK_DURATION = Histogram(
+    "celery_task_duration_seconds",
+    "Time a Celery task ran for, by final state.",
+    ["task", "state"],
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 300),
+)
+TASK_RETRIES = Counter("celery_task_retries", "Celery task retries scheduled.", ["task"])
+
+
+class CircuitBreakerCollector:
+    """Report each circuit breaker's state, read from Redis when Prometheus scrapes."""
+
+    def collect(self):
+        metric = StateSetMetricFamily(
+            "circuit_breaker_state", "State of each circuit breaker.", labels=["circuit"]
+        )
+        for name, breaker in breakers.items():
+            try:
+                state = breaker.state()
+            except RedisError:
+                logger.warning("Could not read the state of circuit %s.", name, exc_info=True)
+                continue
+            metric.add_metric([name], {value: value == state for value in STATES})
+        yield metric
+
+
+REGISTRY.register(CircuitBreakerCollector())
+
+
+def get_registry() -> CollectorRegistry:
+    if "PROMETHEUS_MULTIPROC_DIR" not in os.environ:
+        return REGISTRY
+    registry = CollectorRegistry()
+    multiprocess.MultiProcessCollector(registry)
+    registry.register(CircuitBreakerCollector())
+    return registry
+
+
+def scraper_allowed(request) -> bool:
+    """Whether the connecting address, not a forwarded one, is in METRICS_ALLOWED_NETWORKS."""
+    address = ipaddress.ip_address(request.META["REMOTE_ADDR"])
+    return any(
+        address in ipaddress.ip_network(network) for network in settings.METRICS_ALLOWED_NETWORKS
+    )
+
+
+def metrics(request):
+    # Lock waits, sold-out counts and per-view latency are not for the public.
+    if not scraper_allowed(request):
+        raise Http404
+    return HttpResponse(generate_latest(get_registry()), content_type=CONTENT_TYPE_LATEST)
+
+
+class QueryCounter:
+    def __init__(self) -> None:
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def view_labels(request) -> tuple[str, str]:
+    """The view class and viewset action that handled ``request``."""
+    match = request.resolver_match
+    if match is None:
+        return "unmatched", ""
+    view = getattr(match.func, "cls", match.func)
+    actions = getattr(match.func, "actions", None) or {}
+    return view.__name__, actions.get(request.method.lower(), "")
+
+
+class MetricsMiddleware:
+    def __init__(self, get_response) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = QueryCounter()
+        started = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - started
+
+        view, action = view_labels(request)
+        REQUEST_LATENCY.labels(view, action, request.method, response.status_code).observe(elapsed)
+        REQUEST_QUERIES.labels(view, action).observe(queries.count)
+        return response
+
+
+# Celery runs these in the worker process that executes the task. Start times are keyed
+# by task id, which also keeps thread pool workers apart.
+task_started: dict[str, float] = {}
+
+
+@task_prerun.connect
+def start_task_timer(task_id, **kwargs):
+    task_started[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def observe_task_duration(task_id, task, state=None, **kwargs):
+    started = task_started.pop(task_id, None)
+    if started is not None:
+        TASK_DURATION.labels(task.name, state or "UNKNOWN").observe(time.perf_counter() - started)
+
+
+@task_retry.connect
+def count_task_retry(sender, **kwargs):
+    TASK_RETRIES.labels(sender.name).inc()
+
+
+@worker_init.connect
+def serve_worker_metrics(**kwargs):
+    if settings.CELERY_METRICS_PORT:
+        start_http_server(settings.CELERY_METRICS_PORT, registry=get_registry())
@@ -0,0 +1,10 @@
+from functools import cache
+
+import redis
+
+from eventservice.config import settings
+
+
+@cache
+def get_redis() -> redis.Redis:
+    return redis.Redis.from_url(settings.REDIS_URL)
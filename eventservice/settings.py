@@ -10,8 +10,11 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+from datetime import timedelta
 from pathlib import Path
 
+from django.core.exceptions import ImproperlyConfigured
+
 from eventservice.config import settings
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -22,12 +25,12 @@ BASE_DIR = Path(__file__).resolve().parent.parent
 # See https://docs.djangoproject.com/en/5.2/howto/deployment/checklist/
 
 # SECURITY WARNING: keep the secret key used in production secret!
-SECRET_KEY = "django-insecure-&9g09=bqex(c4h$c_viwtm_b^0lm90%2d0-_x543+ell+usy8f"
+SECRET_KEY = settings.DJANGO_SECRET_KEY
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = settings.DEBUG
 
-ALLOWED_HOSTS = []
+ALLOWED_HOSTS = settings.ALLOWED_HOSTS
 
 
 # Application definition
@@ -39,6 +42,7 @@ INSTALLED_APPS = [
     "django.contrib.sessions",
     "django.contrib.messages",
     "django.contrib.staticfiles",
+    "django.contrib.postgres",
     "rest_framework",
     "events",
     "orders",
@@ -46,7 +50,9 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    "eventservice.metrics.MetricsMiddleware",
     "django.middleware.security.SecurityMiddleware",
+    "whitenoise.middleware.WhiteNoiseMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -86,9 +92,50 @@ DATABASES = {
         "PASSWORD": settings.DB_PASSWORD,
         "HOST": settings.DB_HOST,
         "PORT": settings.DB_PORT,
+        # Each web thread and Celery worker keeps its connection for DB_CONN_MAX_AGE seconds
+        # instead of opening one per request, and checks it still works before reusing it.
+        "CONN_MAX_AGE": settings.DB_CONN_MAX_AGE,
+        "CONN_HEALTH_CHECKS": settings.DB_CONN_HEALTH_CHECKS,
+        # Behind pgbouncer in transaction mode consecutive transactions may run on different
+        # server connections, so named cursors cannot outlive one. Row locks taken by
+        # select_for_update() are unaffected: they are always held inside transaction.atomic().
+        "DISABLE_SERVER_SIDE_CURSORS": settings.DB_TRANSACTION_POOLING,
+    }
+}
+
+# Catalog reads and order history lists go to a random replica, except for users who
+# wrote within the last DB_PRIMARY_PIN_SECONDS, so they always see their own changes.
+# Replicas share the primary's port, database and credentials.
+DATABASE_REPLICAS = [f"replica_{number}" for number in range(len(settings.DB_REPLICA_HOSTS))]
+DATABASES.update(
+    {
+        alias: {**DATABASES["default"], "HOST": host, "TEST": {"MIRROR": "default"}}
+        for alias, host in zip(DATABASE_REPLICAS, settings.DB_REPLICA_HOSTS)
+    }
+)
+DATABASE_ROUTERS = ["eventservice.db_router.ReplicaRouter"]
+DB_PRIMARY_PIN_SECONDS = settings.DB_PRIMARY_PIN_SECONDS
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": settings.REDIS_URL,
+        "KEY_PREFIX": "evently",
     }
 }
 
+# Read-only venue, event and ticket responses are cached in Redis with an in-process LRU
+# in front of it. Entries are keyed by model versions bumped on every write. Entries built
+# from a replica, which may lag behind those versions, expire after DB_PRIMARY_PIN_SECONDS
+# and skip the in-process LRU.
+RESPONSE_CACHE = settings.RESPONSE_CACHE
+RESPONSE_CACHE_TIMEOUT = settings.RESPONSE_CACHE_TIMEOUT
+RESPONSE_CACHE_LOCAL_SIZE = settings.RESPONSE_CACHE_LOCAL_SIZE
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
@@ -125,8 +172,144 @@ USE_TZ = True
 # https://docs.djangoproject.com/en/5.2/howto/static-files/
 
 STATIC_URL = "static/"
+STATIC_ROOT = BASE_DIR / "staticfiles"
+
+# Gunicorn workers serve collected static files themselves through WhiteNoise, compressed
+# and with content hashes in their names so browsers can cache them forever.
+STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "whitenoise.storage.CompressedManifestStaticFilesStorage"},
+}
 
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = "django.db.models.BigAutoField"
+
+# How OrderSerializer takes stock from unsharded tickets: "row_lock" locks the ticket row
+# with SELECT ... FOR UPDATE, "conditional_update" decrements it with a single UPDATE.
+ORDER_ENGINE = settings.ORDER_ENGINE
+
+# Seconds a pending order holds its tickets before the sweeper cancels it and returns the
+# stock. 0 keeps pending orders forever.
+ORDER_HOLD_TTL = settings.ORDER_HOLD_TTL
+
+REDIS_URL = settings.REDIS_URL
+
+# Pre-reserve stock in Redis before an order reaches Postgres, so sold-out requests are
+# rejected without a database round trip. Holds not confirmed within the TTL are returned.
+TICKET_RESERVATIONS = settings.TICKET_RESERVATIONS
+TICKET_RESERVATION_TTL = settings.TICKET_RESERVATION_TTL
+
+# Buyers of events with a waiting room queue for a signed token and are admitted at
+# WAITING_ROOM_RATE per second to start with. The rate then follows the average order
+# latency: it rises while that stays under WAITING_ROOM_TARGET_LATENCY seconds and is
+# halved above it, within WAITING_ROOM_MIN_RATE and WAITING_ROOM_MAX_RATE.
+WAITING_ROOM_RATE = settings.WAITING_ROOM_RATE
+WAITING_ROOM_MIN_RATE = settings.WAITING_ROOM_MIN_RATE
+WAITING_ROOM_MAX_RATE = settings.WAITING_ROOM_MAX_RATE
+WAITING_ROOM_TARGET_LATENCY = settings.WAITING_ROOM_TARGET_LATENCY
+WAITING_ROOM_TOKEN_TTL = settings.WAITING_ROOM_TOKEN_TTL
+
+# API requests authenticate with a JWT (see SIMPLE_JWT) or, for the browsable API, a
+# session. A bad token is answered with 401; requests without one still get 403. Views
+# with a throttle_scope are rate limited by token buckets in Redis, per user, client
+# address or event as "<scope>_<kind>" rates allow. An empty rate turns a limit off. The
+# client address is the socket's peer unless NUM_PROXIES trusted proxies in front of the API
+# append it to X-Forwarded-For; otherwise clients could pick their own address there.
+REST_FRAMEWORK = {
+    "DEFAULT_AUTHENTICATION_CLASSES": [
+        "users.authentication.BearerAuthentication",
+        "rest_framework.authentication.SessionAuthentication",
+        "rest_framework.authentication.BasicAuthentication",
+    ],
+    "DEFAULT_THROTTLE_RATES": {
+        "orders_user": settings.THROTTLE_ORDERS_USER_RATE or None,
+        "orders_event": settings.THROTTLE_ORDERS_EVENT_RATE or None,
+        "registration_ip": settings.THROTTLE_REGISTRATION_IP_RATE or None,
+        "login_ip": settings.THROTTLE_LOGIN_IP_RATE or None,
+        "queue_user": settings.THROTTLE_QUEUE_USER_RATE or None,
+    },
+    "NUM_PROXIES": settings.NUM_PROXIES,
+}
+
+# Registration hashes passwords on PASSWORD_HASH_WORKERS threads per process (a quarter of
+# WEB_THREADS by default), with up to PASSWORD_HASH_BACKLOG more waiting; further
+# registrations get a 503 with Retry-After. Unless the two together stay below WEB_THREADS,
+# a burst occupies every request thread before anyone is turned away.
+PASSWORD_HASH_WORKERS = settings.PASSWORD_HASH_WORKERS or max(settings.WEB_THREADS // 4, 1)
+PASSWORD_HASH_BACKLOG = settings.PASSWORD_HASH_BACKLOG
+if 1 < settings.WEB_THREADS <= PASSWORD_HASH_WORKERS + PASSWORD_HASH_BACKLOG:
+    raise ImproperlyConfigured(
+        f"PASSWORD_HASH_WORKERS ({PASSWORD_HASH_WORKERS}) plus PASSWORD_HASH_BACKLOG "
+        f"({PASSWORD_HASH_BACKLOG}) must be less than WEB_THREADS ({settings.WEB_THREADS})."
+    )
+
+# Bearer tokens from /api/users/token/ authenticate API requests without a database read:
+# the request's user is built from the token's claims (id, username, is_staff). Claims are
+# copied from the refresh token, so a role change shows up at the next login, and access
+# tokens expire after JWT_ACCESS_TOKEN_LIFETIME seconds. Tokens are signed with
+# JWT_SIGNING_KEY, or SECRET_KEY without one; whoever has the key can mint any user's token.
+SIMPLE_JWT = {
+    "SIGNING_KEY": settings.JWT_SIGNING_KEY or SECRET_KEY,
+    "ACCESS_TOKEN_LIFETIME": timedelta(seconds=settings.JWT_ACCESS_TOKEN_LIFETIME),
+    "REFRESH_TOKEN_LIFETIME": timedelta(seconds=settings.JWT_REFRESH_TOKEN_LIFETIME),
+    "AUTH_HEADER_TYPES": ("Bearer",),
+    "TOKEN_USER_CLASS": "users.authentication.ClaimsUser",
+}
+
+# Order requests with an Idempotency-Key header run once; retries within
+# IDEMPOTENCY_KEY_TTL seconds get the stored response. Duplicates arriving while the first
+# is still running wait up to IDEMPOTENCY_LOCK_TIMEOUT seconds for its response.
+IDEMPOTENCY_KEY_TTL = settings.IDEMPOTENCY_KEY_TTL
+IDEMPOTENCY_LOCK_TIMEOUT = settings.IDEMPOTENCY_LOCK_TIMEOUT
+
+# The outbox relay hands order confirmations to Celery in batches of up to this many
+# emails, sent with at most NOTIFICATION_CONCURRENCY SES calls in flight. Bulk templated
+# sends put up to 50 recipients in each call.
+NOTIFICATION_BATCH_SIZE = settings.NOTIFICATION_BATCH_SIZE
+NOTIFICATION_CONCURRENCY = settings.NOTIFICATION_CONCURRENCY
+NOTIFICATION_BULK_TEMPLATES = settings.NOTIFICATION_BULK_TEMPLATES
+
+# Emails that fail for a transient reason (throttling, timeouts, SES 5xx) are retried by
+# Celery up to MAX_TRIES times in all, after NOTIFICATION_RETRY_BACKOFF * 2**n seconds with
+# full jitter, capped at NOTIFICATION_RETRY_BACKOFF_MAX. After SES_CIRCUIT_FAILURE_THRESHOLD
+# such failures within SES_CIRCUIT_FAILURE_WINDOW seconds every worker stops calling SES
+# for SES_CIRCUIT_RECOVERY_TIMEOUT seconds. Emails held back by the open circuit wait for it
+# to close without using up their tries, at most NOTIFICATION_MAX_DEFERRALS times.
+MAX_TRIES = settings.MAX_TRIES
+NOTIFICATION_RETRY_BACKOFF = settings.NOTIFICATION_RETRY_BACKOFF
+NOTIFICATION_RETRY_BACKOFF_MAX = settings.NOTIFICATION_RETRY_BACKOFF_MAX
+NOTIFICATION_MAX_DEFERRALS = settings.NOTIFICATION_MAX_DEFERRALS
+SES_CIRCUIT_FAILURE_THRESHOLD = settings.SES_CIRCUIT_FAILURE_THRESHOLD
+SES_CIRCUIT_FAILURE_WINDOW = settings.SES_CIRCUIT_FAILURE_WINDOW
+SES_CIRCUIT_RECOVERY_TIMEOUT = settings.SES_CIRCUIT_RECOVERY_TIMEOUT
+
+# Notification tasks spend their time waiting on SES. They go to their own queue, served
+# by a thread pool worker whose threads share one event loop and SES client.
+CELERY_TASK_ROUTES = {
+    "orders.tasks.send_*": {"queue": "notifications"},
+}
+
+# Workers record task durations and retries, and serve them on CELERY_METRICS_PORT.
+CELERY_IMPORTS = ["eventservice.metrics"]
+CELERY_METRICS_PORT = settings.CELERY_METRICS_PORT
+
+# The API serves its metrics at /metrics only to clients connecting from these networks,
+# such as the Prometheus scraper's; everyone else gets a 404.
+METRICS_ALLOWED_NETWORKS = settings.METRICS_ALLOWED_NETWORKS
+
+CELERY_BEAT_SCHEDULE = {
+    "expire-ticket-reservations": {
+        "task": "orders.tasks.expire_ticket_reservations",
+        "schedule": 30.0,
+    },
+    "release-expired-order-holds": {
+        "task": "orders.tasks.release_expired_order_holds",
+        "schedule": 60.0,
+    },
+    "purge-idempotency-keys": {
+        "task": "orders.tasks.purge_idempotency_keys",
+        "schedule": 3600.0,
+    },
+}
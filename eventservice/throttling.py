@@ -0,0 +1,147 @@
+import logging
+import time
+
+from redis.exceptions import RedisError
+from rest_framework.throttling import SimpleRateThrottle
+
+from eventservice.cache import LocalLRUCache
+from eventservice.redis_client import get_redis
+from orders.models import Ticket
+from orders.reservations import mirrored_event
+
+logger = logging.getLogger(__name__)
+
+# Token buckets kept in Redis, one hash per scope and client. A bucket holds up to the
+# rate's number of requests and refills continuously over its period, so a client may
+# burst up to the full allowance and then gets one request per period / number. Checking
+# a bucket is one script call. When Redis is unavailable requests are let through.
+
+TOKEN_BUCKET_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local refill = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated_at')
+local tokens = tonumber(bucket[1] or ARGV[1])
+local updated_at = tonumber(bucket[2] or ARGV[3])
+tokens = math.min(capacity, tokens + math.max(now - updated_at, 0) * refill)
+local allowed = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    allowed = 1
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated_at', ARGV[3])
+redis.call('PEXPIRE', KEYS[1], math.ceil((capacity - tokens) / refill * 1000) + 1000)
+return {allowed, tostring((1 - tokens) / refill)}
+"""
+
+_take = get_redis().register_script(TOKEN_BUCKET_SCRIPT)
+
+
+class TokenBucketThrottle(SimpleRateThrottle):
+    """Throttle views with a ``throttle_scope`` per ``kind`` of client.
+
+    The rate comes from ``DEFAULT_THROTTLE_RATES["<throttle_scope>_<kind>"]``. Views
+    without a scope, and scopes without a rate, are not throttled.
+    """
+
+    kind: str
+    cache_format = "throttle:%(scope)s:%(ident)s"
+
+    def __init__(self) -> None:
+        # The scope, and so the rate, is only known once the view calls allow_request().
+        self.retry_after = None
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self.scope = f"{scope}_{self.kind}"
+        self.rate = self.THROTTLE_RATES.get(self.scope)
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        return all(self.take(key) for key in self.get_cache_keys(request, view))
+
+    def take(self, key: str) -> bool:
+        try:
+            allowed, wait = _take(
+                keys=[key],
+                args=[self.num_requests, self.num_requests / self.duration, time.time()],
+            )
+        except RedisError:
+            logger.warning("Could not check throttle %s.", key, exc_info=True)
+            return True
+        if not allowed:
+            self.retry_after = float(wait)
+        return bool(allowed)
+
+    def get_cache_keys(self, request, view) -> list[str]:
+        key = self.get_cache_key(request, view)
+        return [] if key is None else [key]
+
+    def cache_key(self, ident) -> str:
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def wait(self):
+        return self.retry_after
+
+
+class UserTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per user, or per address for anonymous requests."""
+
+    kind = "user"
+
+    def get_cache_key(self, request, view):
+        if request.user and request.user.is_authenticated:
+            return self.cache_key(request.user.pk)
+        return self.cache_key(self.get_ident(request))
+
+
+class IPTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per client address, whoever is logged in."""
+
+    kind = "ip"
+
+    def get_cache_key(self, request, view):
+        return self.cache_key(self.get_ident(request))
+
+
+# A ticket's event only picks the bucket, so each process remembers it instead of
+# querying it for every order. Tickets mirrored for reservations also carry their event
+# in Redis, which keeps a sold-out order rejected without touching the database.
+ticket_events = LocalLRUCache(4096)
+
+
+def ticket_event(ticket_id) -> int | None:
+    try:
+        ticket_id = int(ticket_id)
+    except (TypeError, ValueError):
+        return None
+    event_id = ticket_events.get(ticket_id)
+    if event_id is not None:
+        return event_id
+    event_id = mirrored_event(ticket_id)
+    if event_id is None:
+        event_id = Ticket.objects.filter(pk=ticket_id).values_list("event_id", flat=True).first()
+    if event_id is not None:
+        ticket_events.set(ticket_id, event_id)
+    return event_id
+
+
+class EventTokenBucketThrottle(TokenBucketThrottle):
+    """One bucket per event, shared by everyone ordering its tickets. A batch takes a
+    request from the bucket of every event it orders for."""
+
+    kind = "event"
+
+    def get_cache_keys(self, request, view):
+        data = request.data if isinstance(request.data, dict) else {}
+        if "ticket" in data:
+            tickets = [data["ticket"]]
+        else:
+            items = data.get("items")
+            items = items if isinstance(items, list) else []
+            tickets = [item.get("ticket") for item in items if isinstance(item, dict)]
+        events = {ticket_event(ticket_id) for ticket_id in tickets} - {None}
+        return [self.cache_key(event_id) for event_id in sorted(events)]
@@ -20,6 +20,7 @@ from django.urls import include, path
 from rest_framework.routers import DefaultRouter
 
 from events.views import EventViewSet, VenueViewSet
+from eventservice.metrics import metrics
 from orders.views import OrderViewSet, TicketViewSet
 
 router = DefaultRouter()
@@ -34,4 +35,5 @@ urlpatterns = [
     path("api-auth/", include("rest_framework.urls")),
     path("api/", include(router.urls)),
     path("api/users/", include("users.urls")),
+    path("metrics", metrics, name="metrics"),
 ]
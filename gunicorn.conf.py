@@ -0,0 +1,26 @@
+import multiprocessing
+
+from prometheus_client import multiprocess
+
+from eventservice.config import settings
+
+# By default each worker serves the WSGI application from a pool of WEB_THREADS threads.
+# Uvicorn workers serve the ASGI application instead, but every view here is synchronous
+# and Django hands each ASGI request's sync code to a new thread, which costs more than it
+# saves (compare them with `python manage.py bench_serving`).
+
+bind = "0.0.0.0:8000"
+worker_class = settings.WEB_WORKER_CLASS
+workers = settings.WEB_WORKERS or multiprocessing.cpu_count() * 2 + 1
+threads = settings.WEB_THREADS
+timeout = settings.WEB_TIMEOUT
+wsgi_app = (
+    "eventservice.asgi:application"
+    if "uvicorn" in worker_class.lower()
+    else "eventservice.wsgi:application"
+)
+accesslog = "-"
+
+
+def child_exit(server, worker):
+    multiprocess.mark_process_dead(worker.pid)
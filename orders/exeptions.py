@@ -1,6 +1,38 @@
-class CreateOrderException(Exception):
-    pass
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class CreateOrderException(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "Not enough available ticket."
+    default_code = "not_enough_tickets"
+
+
+class IdempotencyKeyReused(APIException):
+    status_code = status.HTTP_422_UNPROCESSABLE_ENTITY
+    default_detail = "This Idempotency-Key was already used for a different request."
+    default_code = "idempotency_key_reused"
+
+
+class IdempotencyKeyInUse(APIException):
+    status_code = status.HTTP_409_CONFLICT
+    default_detail = "A request with this Idempotency-Key is still being processed."
+    default_code = "idempotency_key_in_use"
+
+
+class WaitingRoomUnavailable(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "The waiting room is unavailable, try again shortly."
+    default_code = "waiting_room_unavailable"
 
 
 class NotAuthenticatedException(Exception):
     pass
+
+
+class TransientSendError(Exception):
+    """An email could not be sent right now but may go through if retried later."""
+
+
+class CircuitOpenError(TransientSendError):
+    """An email was not sent because the SES circuit is open; SES was not called."""
@@ -0,0 +1,77 @@
+import random
+from datetime import datetime, timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from eventservice.cache import bump_version_on_commit
+from orders import reservations
+from orders.models import Order, PaidStatus, Ticket, TicketShard
+
+# A pending order with ``expires_at`` set is a hold on its tickets. Once the hold
+# expires the order is cancelled and the quantity goes back to the ticket.
+
+EXPIRE_BATCH_SQL = f"""
+WITH expired AS (
+    SELECT id FROM {Order._meta.db_table}
+    WHERE status = %s AND expires_at <= %s
+    ORDER BY expires_at
+    LIMIT %s
+    FOR UPDATE SKIP LOCKED
+), cancelled AS (
+    UPDATE {Order._meta.db_table} AS hold SET status = %s
+    FROM expired WHERE hold.id = expired.id
+    RETURNING hold.ticket_id, hold.quantity
+)
+SELECT ticket_id, SUM(quantity), COUNT(*) FROM cancelled GROUP BY ticket_id ORDER BY ticket_id
+"""
+
+
+def hold_expiry() -> datetime | None:
+    if not settings.ORDER_HOLD_TTL:
+        return None
+    return timezone.now() + timedelta(seconds=settings.ORDER_HOLD_TTL)
+
+
+def restock(quantities: dict[int, int]) -> None:
+    """Give stock back with one ``UPDATE`` per ticket, in ascending ticket id order."""
+    if quantities:
+        bump_version_on_commit("ticket")
+    shard_counts = dict(Ticket.objects.filter(pk__in=quantities).values_list("pk", "shard_count"))
+    for ticket_id in sorted(shard_counts):
+        if shard_counts[ticket_id]:
+            TicketShard.objects.filter(
+                ticket_id=ticket_id, number=random.randrange(shard_counts[ticket_id])
+            ).update(available_quantity=F("available_quantity") + quantities[ticket_id])
+        else:
+            Ticket.objects.filter(pk=ticket_id).update(
+                available_quantity=F("available_quantity") + quantities[ticket_id]
+            )
+
+
+def release_expired_batch(now: datetime, batch_size: int) -> int:
+    """Cancel up to ``batch_size`` expired holds and return their stock in one transaction."""
+    with transaction.atomic():
+        with connection.cursor() as cursor:
+            cursor.execute(
+                EXPIRE_BATCH_SQL, [PaidStatus.pending, now, batch_size, PaidStatus.cancelled]
+            )
+            rows = cursor.fetchall()
+
+        quantities = {ticket_id: quantity for ticket_id, quantity, _ in rows}
+        restock(quantities)
+        transaction.on_commit(lambda: reservations.restock(quantities))
+
+    return sum(count for _, _, count in rows)
+
+
+def release_expired_holds(batch_size: int = 10000) -> int:
+    now = timezone.now()
+    released = 0
+    while True:
+        batch = release_expired_batch(now, batch_size)
+        released += batch
+        if batch < batch_size:
+            return released
@@ -0,0 +1,206 @@
+import hashlib
+import json
+import logging
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from redis.exceptions import RedisError
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from eventservice.redis_client import get_redis
+from orders.exeptions import IdempotencyKeyInUse, IdempotencyKeyReused
+from orders.metrics import replayed_from_database, replayed_from_redis
+from orders.models import IdempotencyKey
+
+logger = logging.getLogger(__name__)
+
+# A request carrying an Idempotency-Key runs once per user and key. Its response is saved
+# in the same transaction as the orders it created, so a retry finds either both or
+# neither, and is copied to Redis so replays skip the database. While the first request
+# runs, a Redis lock makes duplicates wait for its response instead of running again.
+# Without Redis, the unique (user, key) row does the same: a duplicate's insert blocks
+# until the first transaction commits and then fails. Failed requests store nothing and
+# may be retried with the same key.
+
+HEADER = "Idempotency-Key"
+MAX_KEY_LENGTH = 255
+POLL_INTERVAL = 0.05
+
+RELEASE_SCRIPT = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+_release = get_redis().register_script(RELEASE_SCRIPT)
+
+
+def response_key(user_id: int, key: str) -> str:
+    return f"idempotency:{user_id}:{key}"
+
+
+def lock_key(user_id: int, key: str) -> str:
+    return f"idempotency:{user_id}:{key}:lock"
+
+
+def fingerprint(request) -> str:
+    """Tell a retry from a different request that reuses its key."""
+    body = json.dumps(request.data, sort_keys=True, cls=DjangoJSONEncoder)
+    return hashlib.sha256(f"{request.method} {request.path}\n{body}".encode()).hexdigest()
+
+
+def replay(stored: dict, request_fingerprint: str) -> Response:
+    if stored["fingerprint"] != request_fingerprint:
+        raise IdempotencyKeyReused()
+    return Response(
+        stored["data"], status=stored["status"], headers={"Idempotent-Replayed": "true"}
+    )
+
+
+def read_stored(user_id: int, key: str) -> dict | None:
+    try:
+        stored = get_redis().get(response_key(user_id, key))
+    except RedisError:
+        logger.warning("Could not read idempotent response %s from Redis.", key, exc_info=True)
+        return None
+    return json.loads(stored) if stored is not None else None
+
+
+def store(user_id: int, key: str, stored: dict) -> None:
+    try:
+        get_redis().set(
+            response_key(user_id, key),
+            json.dumps(stored, cls=DjangoJSONEncoder),
+            ex=settings.IDEMPOTENCY_KEY_TTL,
+        )
+    except RedisError:
+        logger.warning("Could not save idempotent response %s to Redis.", key, exc_info=True)
+
+
+def acquire(user_id: int, key: str) -> str | None:
+    """Return a lock token, or ``None`` if another request with the key is in flight.
+
+    Without Redis every request goes ahead and the database row serializes them.
+    """
+    token = uuid.uuid4().hex
+    try:
+        locked = get_redis().set(
+            lock_key(user_id, key), token, nx=True, ex=settings.IDEMPOTENCY_LOCK_TIMEOUT
+        )
+    except RedisError:
+        logger.warning("Could not lock idempotency key %s.", key, exc_info=True)
+        return token
+    return token if locked else None
+
+
+def release(user_id: int, key: str, token: str) -> None:
+    try:
+        _release(keys=[lock_key(user_id, key)], args=[token])
+    except RedisError:
+        logger.warning("Could not unlock idempotency key %s.", key, exc_info=True)
+
+
+def wait_for_response(user_id: int, key: str) -> dict | None:
+    deadline = time.monotonic() + settings.IDEMPOTENCY_LOCK_TIMEOUT
+    while time.monotonic() < deadline:
+        time.sleep(POLL_INTERVAL)
+        stored = read_stored(user_id, key)
+        if stored is not None:
+            return stored
+        try:
+            if not get_redis().exists(lock_key(user_id, key)):
+                # The first request failed and stored nothing: this one may run instead.
+                return None
+        except RedisError:
+            return None
+    raise IdempotencyKeyInUse()
+
+
+def read_from_database(user_id: int, key: str) -> dict | None:
+    record = (
+        IdempotencyKey.objects.filter(user_id=user_id, key=key)
+        .values("fingerprint", "status_code", "response")
+        .first()
+    )
+    if record is None:
+        return None
+    return {
+        "fingerprint": record["fingerprint"],
+        "status": record["status_code"],
+        "data": record["response"],
+    }
+
+
+def execute(handler, user_id: int, key: str, request_fingerprint: str) -> Response:
+    try:
+        with transaction.atomic():
+            record = IdempotencyKey.objects.create(
+                user_id=user_id, key=key, fingerprint=request_fingerprint
+            )
+            response = handler()
+            record.status_code = response.status_code
+            record.response = response.data
+            record.save(update_fields=["status_code", "response"])
+    except IntegrityError:
+        # A duplicate that got past the Redis lock waited here for the first to commit.
+        stored = read_from_database(user_id, key)
+        if stored is None:
+            raise
+        replayed_from_database.inc()
+        return replay(stored, request_fingerprint)
+
+    store(
+        user_id,
+        key,
+        {"fingerprint": request_fingerprint, "status": response.status_code, "data": response.data},
+    )
+    return response
+
+
+def idempotent(request, handler) -> Response:
+    """Run ``handler`` once per user and Idempotency-Key, replaying its response after."""
+    key = request.headers.get(HEADER)
+    if key is None or not request.user.is_authenticated:
+        return handler()
+    if not key or len(key) > MAX_KEY_LENGTH:
+        raise ValidationError({HEADER: f"Must be 1 to {MAX_KEY_LENGTH} characters long."})
+
+    user_id = request.user.pk
+    request_fingerprint = fingerprint(request)
+    while True:
+        stored = read_stored(user_id, key)
+        if stored is not None:
+            replayed_from_redis.inc()
+            return replay(stored, request_fingerprint)
+
+        token = acquire(user_id, key)
+        if token is not None:
+            break
+        stored = wait_for_response(user_id, key)
+        if stored is not None:
+            replayed_from_redis.inc()
+            return replay(stored, request_fingerprint)
+
+    try:
+        # Redis may have lost the response: the database row is authoritative.
+        stored = read_from_database(user_id, key)
+        if stored is not None:
+            store(user_id, key, stored)
+            replayed_from_database.inc()
+            return replay(stored, request_fingerprint)
+        return execute(handler, user_id, key, request_fingerprint)
+    finally:
+        release(user_id, key, token)
+
+
+def purge_expired_keys() -> int:
+    cutoff = timezone.now() - timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    deleted, _ = IdempotencyKey.objects.filter(created_at__lt=cutoff).delete()
+    return deleted
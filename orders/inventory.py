@@ -0,0 +1,151 @@
+import random
+
+from django.conf import settings
+from django.db import connection
+from django.db.models import F
+
+from eventservice.cache import bump_version_on_commit
+from orders.exeptions import CreateOrderException
+from orders.metrics import (
+    conditional_update_wait,
+    row_lock_wait,
+    sharded_wait,
+    sold_out_in_database,
+)
+from orders.models import Ticket, TicketShard
+
+ROW_LOCK = "row_lock"
+CONDITIONAL_UPDATE = "conditional_update"
+
+# All functions below must be called inside ``transaction.atomic()``.
+
+
+def distribute_stock(ticket: Ticket, shard_count: int) -> None:
+    """Move the remaining stock of ``ticket`` into ``shard_count`` counter shards.
+
+    A ``shard_count`` of 0 folds every shard back into ``Ticket.available_quantity``.
+    """
+    ticket = Ticket.objects.select_for_update().get(pk=ticket.pk)
+    shards = TicketShard.objects.select_for_update().filter(ticket=ticket).order_by("number")
+    total = ticket.available_quantity + sum(shard.available_quantity for shard in shards)
+
+    TicketShard.objects.filter(ticket=ticket).delete()
+    if shard_count:
+        base, extra = divmod(total, shard_count)
+        TicketShard.objects.bulk_create(
+            TicketShard(ticket=ticket, number=number, available_quantity=base + (number < extra))
+            for number in range(shard_count)
+        )
+
+    Ticket.objects.filter(pk=ticket.pk).update(
+        available_quantity=0 if shard_count else total, shard_count=shard_count
+    )
+
+
+def reserve_locked(ticket: Ticket, quantity: int) -> Ticket:
+    with row_lock_wait.time():
+        ticket = Ticket.objects.select_for_update().get(pk=ticket.pk)
+
+    if quantity > ticket.available_quantity:
+        sold_out_in_database.inc()
+        raise CreateOrderException("Not enough available ticket.")
+
+    ticket.available_quantity -= quantity
+    ticket.save(update_fields=["available_quantity"])
+    return ticket
+
+
+def reserve_conditional(ticket: Ticket, quantity: int) -> Ticket:
+    """Take stock with one conditional ``UPDATE``; the row lock lasts only until commit."""
+    with connection.cursor() as cursor, conditional_update_wait.time():
+        cursor.execute(
+            f"UPDATE {Ticket._meta.db_table} "
+            "SET available_quantity = available_quantity - %s "
+            "WHERE id = %s AND available_quantity >= %s "
+            "RETURNING price",
+            [quantity, ticket.pk, quantity],
+        )
+        row = cursor.fetchone()
+
+    if row is None:
+        sold_out_in_database.inc()
+        raise CreateOrderException("Not enough available ticket.")
+
+    ticket.price = row[0]
+    return ticket
+
+
+def reserve_sharded(ticket: Ticket, quantity: int) -> Ticket:
+    """Decrement one randomly picked shard, falling back to the others when it runs dry.
+
+    Each attempt is a single conditional ``UPDATE``, so concurrent buyers only contend
+    when they land on the same shard. If no single shard can cover ``quantity``, the
+    shards are locked in ``number`` order and drained together.
+    """
+    numbers = list(range(ticket.shard_count))
+    start = random.randrange(ticket.shard_count)
+
+    with sharded_wait.time():
+        for number in numbers[start:] + numbers[:start]:
+            updated = TicketShard.objects.filter(
+                ticket=ticket, number=number, available_quantity__gte=quantity
+            ).update(available_quantity=F("available_quantity") - quantity)
+            if updated:
+                return ticket
+
+        shards = list(
+            TicketShard.objects.select_for_update()
+            .filter(ticket=ticket, available_quantity__gt=0)
+            .order_by("number")
+        )
+    if quantity > sum(shard.available_quantity for shard in shards):
+        sold_out_in_database.inc()
+        raise CreateOrderException("Not enough available ticket.")
+
+    remaining = quantity
+    for shard in shards:
+        taken = min(shard.available_quantity, remaining)
+        shard.available_quantity -= taken
+        remaining -= taken
+        if not remaining:
+            break
+    TicketShard.objects.bulk_update(shards, ["available_quantity"])
+    return ticket
+
+
+def reserve(ticket: Ticket, quantity: int) -> Ticket:
+    bump_version_on_commit("ticket")
+    if ticket.shard_count:
+        return reserve_sharded(ticket, quantity)
+    if settings.ORDER_ENGINE == CONDITIONAL_UPDATE:
+        return reserve_conditional(ticket, quantity)
+    return reserve_locked(ticket, quantity)
+
+
+def reserve_many(tickets: list[Ticket], quantities: dict[int, int]) -> dict[int, Ticket]:
+    """Take stock for several tickets at once, all or nothing.
+
+    Ticket rows are always locked in ascending id order, so concurrent checkouts that
+    share tickets queue up instead of deadlocking.
+    """
+    bump_version_on_commit("ticket")
+    reserved = {}
+    unsharded = [ticket.pk for ticket in tickets if not ticket.shard_count]
+
+    if unsharded and settings.ORDER_ENGINE == ROW_LOCK:
+        with row_lock_wait.time():
+            locked = list(
+                Ticket.objects.select_for_update().filter(pk__in=unsharded).order_by("pk")
+            )
+        for ticket in locked:
+            if quantities[ticket.pk] > ticket.available_quantity:
+                sold_out_in_database.inc()
+                raise CreateOrderException("Not enough available ticket.")
+            ticket.available_quantity -= quantities[ticket.pk]
+        Ticket.objects.bulk_update(locked, ["available_quantity"])
+        reserved = {ticket.pk: ticket for ticket in locked}
+
+    for ticket in sorted(tickets, key=lambda ticket: ticket.pk):
+        if ticket.pk not in reserved:
+            reserved[ticket.pk] = reserve(ticket, quantities[ticket.pk])
+    return reserved
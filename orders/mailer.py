@@ -0,0 +1,69 @@
+import asyncio
+import os
+import threading
+from contextlib import AsyncExitStack
+
+from django.conf import settings
+
+from eventservice.circuit_breaker import CircuitBreaker
+from orders.utils import create_client
+
+
+class SESClientPool:
+    """An event loop thread and one SES client shared by every task in a worker process.
+
+    aiobotocore clients belong to the loop that opened them, so coroutines are submitted
+    to this long-lived loop instead of each task running its own ``asyncio.run()``. The
+    client keeps its HTTP connections (and TLS sessions) open between tasks.
+    """
+
+    def __init__(self) -> None:
+        self.loop = None
+        self.client = None
+        self._pid = None
+        self._thread = None
+        self._stack = None
+        self._lock = threading.Lock()
+
+    def start(self) -> None:
+        with self._lock:
+            if self.loop is not None and self._pid == os.getpid():
+                return
+            # A forked child inherits the attributes but not the loop thread.
+            loop = asyncio.new_event_loop()
+            thread = threading.Thread(target=loop.run_forever, name="ses-loop", daemon=True)
+            thread.start()
+            self.loop, self._thread, self._pid = loop, thread, os.getpid()
+            asyncio.run_coroutine_threadsafe(self._open(), loop).result()
+
+    def stop(self) -> None:
+        with self._lock:
+            if self.loop is None or self._pid != os.getpid():
+                return
+            asyncio.run_coroutine_threadsafe(self._close(), self.loop).result()
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self._thread.join()
+            self.loop.close()
+            self.loop = self._thread = self._pid = None
+
+    def run(self, coroutine):
+        """Run ``coroutine`` on the pool's loop and wait for its result."""
+        self.start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def _open(self) -> None:
+        self._stack = AsyncExitStack()
+        self.client = await self._stack.enter_async_context(create_client())
+
+    async def _close(self) -> None:
+        await self._stack.aclose()
+        self.client = self._stack = None
+
+
+ses = SESClientPool()
+ses_circuit = CircuitBreaker(
+    "ses",
+    failure_threshold=settings.SES_CIRCUIT_FAILURE_THRESHOLD,
+    failure_window=settings.SES_CIRCUIT_FAILURE_WINDOW,
+    recovery_timeout=settings.SES_CIRCUIT_RECOVERY_TIMEOUT,
+)
@@ -0,0 +1,81 @@
+import statistics
+import time
+import uuid
+from datetime import date
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from rest_framework.test import APIClient
+
+from events.models import Event, Venue
+from orders.models import Order, Ticket
+from users.serializers import ClaimsTokenObtainPairSerializer
+
+AUTH_TABLES = (User._meta.db_table, "django_session")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare database queries and latency per request of session and JWT authentication "
+        "on the order history endpoint."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500)
+        parser.add_argument("--orders", type=int, default=20)
+        parser.add_argument("--path", default="/api/orders/")
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+        ticket = Ticket.objects.create(event=event, price=1, quantity=1, available_quantity=1)
+        Order.objects.bulk_create(
+            Order(user=user, ticket=ticket, quantity=1, total_price=1)
+            for _ in range(options["orders"])
+        )
+
+        session = APIClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        session.force_login(user)
+        access = ClaimsTokenObtainPairSerializer.get_token(user).access_token
+        jwt = APIClient(HTTP_HOST=settings.ALLOWED_HOSTS[0])
+        jwt.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+
+        try:
+            self.stdout.write(
+                f"{'auth':<8} {'queries':>8} {'auth queries':>13} {'mean ms':>8} {'p50 ms':>8}"
+            )
+            for name, client in (("session", session), ("jwt", jwt)):
+                queries, auth_queries, timings = self.measure(
+                    client, options["path"], options["requests"]
+                )
+                self.stdout.write(
+                    f"{name:<8} {queries:>8.1f} {auth_queries:>13.1f} "
+                    f"{statistics.fmean(timings):>8.2f} {statistics.median(timings):>8.2f}"
+                )
+        finally:
+            session.logout()
+            venue.delete()
+            user.delete()
+
+    def measure(self, client, path: str, requests: int) -> tuple[float, float, list[float]]:
+        """Queries and auth queries per request, and each request's milliseconds."""
+        assert client.get(path).status_code == 200
+        statements = []
+
+        def record(execute, sql, params, many, context):
+            statements.append(sql)
+            return execute(sql, params, many, context)
+
+        timings = []
+        with connection.execute_wrapper(record):
+            for _ in range(requests):
+                started = time.perf_counter()
+                client.get(path)
+                timings.append((time.perf_counter() - started) * 1000)
+        auth_queries = [sql for sql in statements if any(table in sql for table in AUTH_TABLES)]
+        return len(statements) / requests, len(auth_queries) / requests, timings
@@ -0,0 +1,307 @@
+import asyncio
+import json
+import random
+import statistics
+import subprocess
+import time
+import uuid
+from collections import Counter
+from datetime import date, datetime, timezone
+from importlib import import_module
+from pathlib import Path
+
+import aiohttp
+from django.conf import settings
+from django.contrib.auth import BACKEND_SESSION_KEY, HASH_SESSION_KEY, SESSION_KEY
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils.crypto import get_random_string
+
+from events.models import Event, Venue
+from eventservice.cache import bump_version
+from orders.models import Order, OutboxMessage, Ticket
+from orders.reservations import mirror_ticket
+
+SCENARIOS = ("browse", "tickets", "hot_ticket", "history")
+
+# Server environment that turns order throttling off. Every hot_ticket order comes from a
+# few users for one event, so the limits would otherwise answer most of them with a 429.
+UNTHROTTLED_ORDERS = {"THROTTLE_ORDERS_USER_RATE": "", "THROTTLE_ORDERS_EVENT_RATE": ""}
+
+INSERT_HISTORY_SQL = f"""
+INSERT INTO {Order._meta.db_table}
+    (user_id, ticket_id, quantity, total_price, status, created_at)
+SELECT user_id, %s, 1, 1, 'paid', now() - make_interval(secs => i)
+FROM unnest(%s::bigint[]) AS user_id, generate_series(1, %s) AS i
+"""
+
+
+def percentile(latencies: list[float], percent: int) -> float:
+    if len(latencies) < 2:
+        return latencies[0] if latencies else 0.0
+    return statistics.quantiles(latencies, n=100, method="inclusive")[percent - 1]
+
+
+def current_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+class Run:
+    """Latencies and status codes of one scenario."""
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.latencies: list[float] = []
+        self.statuses: Counter = Counter()
+        self.elapsed = 0.0
+
+    async def request(self, session: aiohttp.ClientSession, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            async with session.request(method, url, **kwargs) as response:
+                body = await response.read()
+                status = response.status
+        except aiohttp.ClientError:
+            body, status = b"", 0
+        self.latencies.append((time.perf_counter() - started) * 1000)
+        self.statuses[status] += 1
+        return json.loads(body) if status == 200 else None
+
+    def summary(self) -> dict:
+        errors = sum(
+            count for status, count in self.statuses.items() if status == 0 or status >= 500
+        )
+        summary = {
+            "requests": len(self.latencies),
+            "errors": errors,
+            "throttled": self.statuses[429],
+            "statuses": {str(status): count for status, count in sorted(self.statuses.items())},
+            "elapsed_sec": round(self.elapsed, 3),
+            "requests_per_sec": round(len(self.latencies) / self.elapsed, 1),
+            "latency_ms": {
+                "p50": round(percentile(self.latencies, 50), 2),
+                "p95": round(percentile(self.latencies, 95), 2),
+                "p99": round(percentile(self.latencies, 99), 2),
+                "max": round(max(self.latencies, default=0), 2),
+            },
+        }
+        if self.name == "hot_ticket":
+            summary["orders_per_sec"] = round(self.statuses[201] / self.elapsed, 1)
+        return summary
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test a running server on the booking hot path: catalog browsing, ticket "
+        "listing, concurrent orders for one hot ticket and order history paging. Seeds its "
+        "own users and events in the server's database, so run it where that database is "
+        "reachable, e.g. `docker-compose exec api python manage.py bench_booking`. Writes "
+        "p50/p95/p99 latency and throughput per scenario to a JSON file."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--base-url", default="http://localhost:8000")
+        parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS))
+        parser.add_argument("--requests", type=int, default=2000, help="Requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--events", type=int, default=100)
+        parser.add_argument("--history", type=int, default=200, help="Orders per user.")
+        parser.add_argument(
+            "--hot-stock", type=int, help="Stock of the hot ticket, --requests by default."
+        )
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--output", type=Path, help="Defaults to bench-results/booking-<commit>.json."
+        )
+        parser.add_argument("--compare", type=Path, help="An earlier result file to diff with.")
+
+    def handle(self, *args, **options):
+        commit = current_commit()
+        output = options["output"] or Path("bench-results") / f"booking-{commit or 'local'}.json"
+        baseline = json.loads(options["compare"].read_text()) if options["compare"] else None
+        self.random = random.Random(options["seed"])
+        self.session_keys = []
+
+        users = self.create_users(options["concurrency"])
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        try:
+            self.seed(users, venue, options)
+            cookies = [self.login(user) for user in users]
+            runs = asyncio.run(self.run_scenarios(cookies, options))
+        finally:
+            self.clean_up(users, venue)
+
+        results = {
+            "commit": commit,
+            "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "base_url": options["base_url"],
+            "options": {
+                name: options[name]
+                for name in ("requests", "concurrency", "events", "history", "hot_stock", "seed")
+            },
+            "scenarios": {run.name: run.summary() for run in runs},
+        }
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2) + "\n")
+
+        self.report(results, baseline)
+        self.stdout.write(f"Results written to {output}")
+
+    def create_users(self, count: int) -> list[User]:
+        prefix = f"bench_{uuid.uuid4().hex[:8]}"
+        return User.objects.bulk_create(
+            User(username=f"{prefix}_{number}", email=f"{prefix}_{number}@example.com")
+            for number in range(count)
+        )
+
+    def seed(self, users: list[User], venue: Venue, options) -> None:
+        events = Event.objects.bulk_create(
+            Event(
+                name=f"Benchmark event {number}",
+                description="Load test",
+                date=date.today(),
+                venue=venue,
+                organizer=users[0],
+            )
+            for number in range(options["events"])
+        )
+        tickets = Ticket.objects.bulk_create(
+            Ticket(event=event, price=10, quantity=100, available_quantity=100) for event in events
+        )
+        stock = options["hot_stock"] if options["hot_stock"] is not None else options["requests"]
+        hot_ticket = Ticket.objects.create(
+            event=events[0], price=10, quantity=max(stock, 1), available_quantity=stock
+        )
+        mirror_ticket(hot_ticket.pk)
+        # Bulk inserts skip the signals that invalidate cached event and ticket lists.
+        bump_version("event")
+        bump_version("ticket")
+        self.hot_ticket_id = hot_ticket.pk
+        self.event_ids = [event.pk for event in events]
+        self.ticket_ids = [ticket.pk for ticket in tickets]
+
+        with connection.cursor() as cursor:
+            cursor.execute(
+                INSERT_HISTORY_SQL,
+                [tickets[-1].pk, [user.pk for user in users], options["history"]],
+            )
+            cursor.execute(f"ANALYZE {Order._meta.db_table}")
+
+    def login(self, user: User) -> dict:
+        """Open a session for ``user`` directly, so no request pays for password hashing."""
+        session = import_module(settings.SESSION_ENGINE).SessionStore()
+        session[SESSION_KEY] = str(user.pk)
+        session[BACKEND_SESSION_KEY] = "django.contrib.auth.backends.ModelBackend"
+        session[HASH_SESSION_KEY] = user.get_session_auth_hash()
+        session.create()
+        self.session_keys.append(session.session_key)
+        return {
+            settings.SESSION_COOKIE_NAME: session.session_key,
+            settings.CSRF_COOKIE_NAME: get_random_string(32),
+        }
+
+    async def run_scenarios(self, cookies: list[dict], options) -> list[Run]:
+        sessions = [
+            aiohttp.ClientSession(
+                base_url=options["base_url"],
+                cookies=user_cookies,
+                headers={"X-CSRFToken": user_cookies[settings.CSRF_COOKIE_NAME]},
+            )
+            for user_cookies in cookies
+        ]
+        try:
+            runs = []
+            for name in options["scenarios"]:
+                self.stdout.write(f"Running {name}...")
+                runs.append(await self.run(name, sessions, options["requests"]))
+            return runs
+        finally:
+            await asyncio.gather(*(session.close() for session in sessions))
+
+    async def run(self, name: str, sessions: list[aiohttp.ClientSession], requests: int) -> Run:
+        """Let every user repeat the scenario's step until ``requests`` have been sent."""
+        run = Run(name)
+        step = getattr(self, name)
+
+        async def user(session):
+            while len(run.latencies) < requests:
+                await step(run, session)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(user(session) for session in sessions))
+        run.elapsed = time.perf_counter() - started
+        return run
+
+    async def browse(self, run: Run, session) -> None:
+        page = await run.request(session, "GET", "/api/events/")
+        if page and page.get("next"):
+            await run.request(session, "GET", page["next"])
+        await run.request(session, "GET", f"/api/events/{self.random.choice(self.event_ids)}/")
+
+    async def tickets(self, run: Run, session) -> None:
+        await run.request(session, "GET", "/api/tickets/")
+        await run.request(session, "GET", f"/api/tickets/{self.random.choice(self.ticket_ids)}/")
+
+    async def hot_ticket(self, run: Run, session) -> None:
+        await run.request(
+            session, "POST", "/api/orders/", json={"ticket": self.hot_ticket_id, "quantity": 1}
+        )
+
+    async def history(self, run: Run, session) -> None:
+        url = "/api/orders/?page_size=20"
+        while url:
+            page = await run.request(session, "GET", url)
+            url = page and page["next"]
+
+    def clean_up(self, users: list[User], venue: Venue) -> None:
+        order_ids = list(Order.objects.filter(user__in=users).values_list("pk", flat=True))
+        OutboxMessage.objects.filter(payload__order_id__in=order_ids).delete()
+        session_model = import_module(settings.SESSION_ENGINE).SessionStore.get_model_class()
+        session_model.objects.filter(session_key__in=self.session_keys).delete()
+        venue.delete()
+        User.objects.filter(pk__in=[user.pk for user in users]).delete()
+
+    def report(self, results: dict, baseline: dict | None) -> None:
+        self.stdout.write(
+            f"{'scenario':<12} {'req/s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} "
+            f"{'errors':>7} {'429s':>7} {'orders/s':>9}"
+        )
+        for name, summary in results["scenarios"].items():
+            latency = summary["latency_ms"]
+            self.stdout.write(
+                f"{name:<12} {summary['requests_per_sec']:>9.1f} {latency['p50']:>9.2f} "
+                f"{latency['p95']:>9.2f} {latency['p99']:>9.2f} {summary['errors']:>7} "
+                f"{summary['throttled']:>7} {summary.get('orders_per_sec', ''):>9}"
+            )
+        if any(summary["throttled"] for summary in results["scenarios"].values()):
+            unthrottled = " ".join(f"{name}=" for name in UNTHROTTLED_ORDERS)
+            self.stdout.write(
+                "Requests were throttled, so the results measure 429s. Start the server with "
+                f"{unthrottled} to measure the full path."
+            )
+
+        if baseline is None:
+            return
+        self.stdout.write(f"\nChange against {baseline.get('commit') or 'baseline'}:")
+        for name, summary in results["scenarios"].items():
+            before = baseline["scenarios"].get(name)
+            if before is None:
+                continue
+            changes = [
+                f"req/s {self.change(before['requests_per_sec'], summary['requests_per_sec'])}"
+            ] + [
+                f"{key} {self.change(before['latency_ms'][key], summary['latency_ms'][key])}"
+                for key in ("p50", "p95", "p99")
+            ]
+            self.stdout.write(f"{name:<12} " + "  ".join(changes))
+
+    def change(self, before: float, after: float) -> str:
+        if not before:
+            return "n/a"
+        return f"{(after - before) / before:+.1%}"
@@ -0,0 +1,96 @@
+import asyncio
+import os
+import random
+import subprocess
+import sys
+
+from events.models import Venue
+from orders.management.commands import bench_booking
+from orders.management.commands.bench_serving import free_port, wait_until_ready
+
+
+class Command(bench_booking.Command):
+    help = (
+        "Run the booking scenarios against gunicorn opening a Postgres connection per "
+        "request, keeping persistent connections and, with --pgbouncer, going through "
+        "pgbouncer in transaction mode."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--scenarios",
+            nargs="+",
+            choices=bench_booking.SCENARIOS,
+            default=list(bench_booking.SCENARIOS),
+        )
+        parser.add_argument("--requests", type=int, default=1000, help="Requests per scenario.")
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--events", type=int, default=100)
+        parser.add_argument("--history", type=int, default=100, help="Orders per user.")
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument("--max-age", type=int, default=60, help="CONN_MAX_AGE to compare.")
+        parser.add_argument("--pgbouncer", metavar="HOST:PORT", help="Also run through pgbouncer.")
+        parser.add_argument("--workers", type=int, help="Gunicorn workers, WEB_WORKERS by default.")
+        parser.add_argument("--threads", type=int, help="Threads per gthread worker.")
+
+    def handle(self, *args, **options):
+        persistent = {"DB_CONN_MAX_AGE": str(options["max_age"]), "DB_CONN_HEALTH_CHECKS": "true"}
+        modes = {"per_request": {"DB_CONN_MAX_AGE": "0"}, "persistent": persistent}
+        if options["pgbouncer"]:
+            host, port = options["pgbouncer"].rsplit(":", 1)
+            modes["pgbouncer"] = {
+                **persistent,
+                "POSTGRES_HOST": host,
+                "POSTGRES_PORT": port,
+                "DB_TRANSACTION_POOLING": "true",
+            }
+        # Every mode orders the hot ticket, so none of them runs into a sold-out ticket.
+        options["hot_stock"] = options["requests"] * len(modes)
+
+        gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+        if options["workers"]:
+            gunicorn += ["--workers", str(options["workers"])]
+        if options["threads"]:
+            gunicorn += ["--threads", str(options["threads"])]
+
+        self.random = random.Random(options["seed"])
+        self.session_keys = []
+        users = self.create_users(options["concurrency"])
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        try:
+            self.seed(users, venue, options)
+            cookies = [self.login(user) for user in users]
+            results = {}
+            for name, env in modes.items():
+                port = free_port()
+                process = subprocess.Popen(
+                    [*gunicorn, "--bind", f"127.0.0.1:{port}"],
+                    env={**os.environ, **bench_booking.UNTHROTTLED_ORDERS, **env},
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                try:
+                    wait_until_ready(port)
+                    base_url = f"http://127.0.0.1:{port}"
+                    runs = asyncio.run(
+                        self.run_scenarios(cookies, {**options, "base_url": base_url})
+                    )
+                finally:
+                    process.terminate()
+                    process.wait()
+                results[name] = {run.name: run.summary() for run in runs}
+        finally:
+            self.clean_up(users, venue)
+
+        self.stdout.write(
+            f"{'connections':<12} {'scenario':<12} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} "
+            f"{'errors':>7} {'429s':>7}"
+        )
+        for name, scenarios in results.items():
+            for scenario, summary in scenarios.items():
+                latency = summary["latency_ms"]
+                self.stdout.write(
+                    f"{name:<12} {scenario:<12} {summary['requests_per_sec']:>9.1f} "
+                    f"{latency['p50']:>9.2f} {latency['p99']:>9.2f} {summary['errors']:>7} "
+                    f"{summary['throttled']:>7}"
+                )
@@ -0,0 +1,78 @@
+import statistics
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.utils import timezone
+
+from events.models import Event, Venue
+from orders.holds import release_expired_batch
+from orders.models import Order, PaidStatus, Ticket
+
+INSERT_HOLDS_SQL = f"""
+INSERT INTO {Order._meta.db_table}
+    (user_id, ticket_id, quantity, total_price, status, created_at, expires_at)
+SELECT %s, (%s::bigint[])[1 + i %% %s], 1, 1, %s, now(), now() - interval '1 minute'
+FROM generate_series(1, %s) AS i
+"""
+
+
+class Command(BaseCommand):
+    help = "Measure how fast expired order holds are cancelled and their stock returned."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--holds", type=int, default=1_000_000)
+        parser.add_argument("--tickets", type=int, default=100)
+        parser.add_argument("--batch-size", type=int, default=10000)
+
+    def handle(self, *args, **options):
+        holds, batch_size = options["holds"], options["batch_size"]
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+
+        try:
+            tickets = Ticket.objects.bulk_create(
+                Ticket(event=event, price=1, quantity=holds, available_quantity=0)
+                for _ in range(options["tickets"])
+            )
+            ticket_ids = [ticket.pk for ticket in tickets]
+
+            self.stdout.write(f"Inserting {holds} expired holds...")
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    INSERT_HOLDS_SQL,
+                    [user.pk, ticket_ids, len(ticket_ids), PaidStatus.pending, holds],
+                )
+                cursor.execute(f"ANALYZE {Order._meta.db_table}")
+
+            now = timezone.now()
+            latencies = []
+            started = time.perf_counter()
+            while True:
+                batch_started = time.perf_counter()
+                released = release_expired_batch(now, batch_size)
+                latencies.append(time.perf_counter() - batch_started)
+                if released < batch_size:
+                    break
+            elapsed = time.perf_counter() - started
+
+            returned = sum(
+                Ticket.objects.filter(pk__in=ticket_ids).values_list(
+                    "available_quantity", flat=True
+                )
+            )
+            self.stdout.write(
+                f"Released {returned} holds in {elapsed:.2f}s ({returned / elapsed:.0f} holds/s), "
+                f"{len(latencies)} batches of {batch_size}: "
+                f"p50 {statistics.median(latencies) * 1000:.1f} ms, "
+                f"max {max(latencies) * 1000:.1f} ms"
+            )
+        finally:
+            venue.delete()
+            user.delete()
@@ -0,0 +1,101 @@
+import threading
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from events.models import Event, Venue
+from orders.inventory import distribute_stock, reserve_conditional, reserve_locked, reserve_sharded
+from orders.models import Order, Ticket
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure orders/sec of the row-lock, conditional-update and sharded inventory paths "
+        "on one hot ticket. "
+        "Every buyer holds its own database connection, so Postgres max_connections must be "
+        "above the highest --concurrency value."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--concurrency", type=int, nargs="+", default=[1, 8, 64, 256])
+        parser.add_argument("--orders", type=int, default=2000, help="Orders placed per run.")
+        parser.add_argument("--shards", type=int, default=16)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+
+        try:
+            self.stdout.write(f"{'buyers':>8} {'row lock':>14} {'conditional':>14} {'sharded':>14}")
+            for concurrency in options["concurrency"]:
+                results = [
+                    self.run(event, user, reserve_locked, 0, concurrency, options["orders"]),
+                    self.run(event, user, reserve_conditional, 0, concurrency, options["orders"]),
+                    self.run(
+                        event,
+                        user,
+                        reserve_sharded,
+                        options["shards"],
+                        concurrency,
+                        options["orders"],
+                    ),
+                ]
+                self.stdout.write(
+                    f"{concurrency:>8}" + "".join(f" {result:>10.0f} o/s" for result in results)
+                )
+        finally:
+            venue.delete()
+            user.delete()
+
+    def run(self, event, user, reserve, shards: int, concurrency: int, orders: int) -> float:
+        ticket = Ticket.objects.create(
+            event=event, price=1, quantity=orders, available_quantity=orders
+        )
+        if shards:
+            with transaction.atomic():
+                distribute_stock(ticket, shards)
+            ticket.refresh_from_db()
+
+        budget = iter(range(orders))
+        budget_lock = threading.Lock()
+        start = threading.Barrier(concurrency + 1)
+
+        def buyer():
+            connection.ensure_connection()
+            start.wait()
+            try:
+                while True:
+                    with budget_lock:
+                        if next(budget, None) is None:
+                            return
+                    with transaction.atomic():
+                        reserve(ticket, 1)
+                        Order.objects.create(
+                            user=user, ticket=ticket, quantity=1, total_price=ticket.price
+                        )
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=buyer) for _ in range(concurrency)]
+        for thread in threads:
+            thread.start()
+        start.wait()
+        started = time.perf_counter()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - started
+
+        ticket = Ticket.objects.get(pk=ticket.pk)
+        sold = Order.objects.filter(ticket=ticket).count()
+        if sold != orders or ticket.total_available_quantity != 0:
+            raise CommandError(
+                f"Inconsistent stock: {sold} sold, {ticket.total_available_quantity} left."
+            )
+        return orders / elapsed
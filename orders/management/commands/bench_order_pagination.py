@@ -0,0 +1,74 @@
+import statistics
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from events.models import Event, Venue
+from orders.models import Order, Ticket
+from orders.pagination import keyset_page
+
+INSERT_ORDERS_SQL = f"""
+INSERT INTO {Order._meta.db_table}
+    (user_id, ticket_id, quantity, total_price, status, created_at)
+SELECT %s, %s, 1, 1, 'paid', now() - make_interval(secs => i)
+FROM generate_series(1, %s) AS i
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare OFFSET and keyset latency of shallow and deep order history pages."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=500_000)
+        parser.add_argument("--pages", type=int, nargs="+", default=[1, 1000])
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        size = options["page_size"]
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+
+        try:
+            ticket = Ticket.objects.create(event=event, price=1, quantity=1, available_quantity=0)
+            self.stdout.write(f"Inserting {options['orders']} orders for one user...")
+            with connection.cursor() as cursor:
+                cursor.execute(INSERT_ORDERS_SQL, [user.pk, ticket.pk, options["orders"]])
+                cursor.execute(f"ANALYZE {Order._meta.db_table}")
+
+            history = Order.objects.filter(user=user)
+            self.stdout.write(f"{'page':>8} {'offset':>12} {'keyset':>12}")
+            for page in options["pages"]:
+                offset, end = (page - 1) * size, page * size
+                position = None
+                if offset:
+                    last = history.order_by("-created_at", "-id")[offset - 1]
+                    position = (last.created_at, last.pk)
+
+                offset_ms = self.measure(
+                    lambda: list(history.order_by("-created_at", "-id")[offset:end]),
+                    options["repeat"],
+                )
+                keyset_ms = self.measure(
+                    lambda: keyset_page(history, position, size), options["repeat"]
+                )
+                self.stdout.write(f"{page:>8} {offset_ms:>9.2f} ms {keyset_ms:>9.2f} ms")
+        finally:
+            venue.delete()
+            user.delete()
+
+    def measure(self, fetch, repeat: int) -> float:
+        fetch()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
@@ -0,0 +1,91 @@
+import statistics
+import time
+import uuid
+from datetime import date
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from events.models import Event, Venue
+from orders import outbox
+from orders.inventory import reserve
+from orders.models import Order, OutboxMessage, Ticket
+from orders.tasks import send_order_confirmations
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare how long an order holds its ticket lock when it calls delay() inside the "
+        "transaction or writes to the outbox, and measure the outbox relay throughput. "
+        "Published tasks go to the configured broker and find no orders to confirm."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=1000)
+        parser.add_argument("--messages", type=int, default=100_000)
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+
+        try:
+            stock = options["orders"] * 2
+            ticket = Ticket.objects.create(
+                event=event, price=1, quantity=stock, available_quantity=stock
+            )
+
+            def publish_in_transaction(order):
+                send_order_confirmations.delay([order.id])
+
+            def write_outbox(order):
+                outbox.add(outbox.ORDER_CONFIRMATION, {"order_id": order.id})
+
+            self.stdout.write(f"{'ticket lock held':<24} {'median':>10} {'p99':>10}")
+            for name, notify in (
+                ("delay() in transaction", publish_in_transaction),
+                ("outbox row", write_outbox),
+            ):
+                timings = self.lock_hold_times(ticket, user, notify, options["orders"])
+                median = statistics.median(timings)
+                p99 = statistics.quantiles(timings, n=100)[98]
+                self.stdout.write(f"{name:<24} {median:>7.3f} ms {p99:>7.3f} ms")
+            self.delete_messages(user)
+
+            OutboxMessage.objects.bulk_create(
+                OutboxMessage(topic=outbox.ORDER_CONFIRMATION, payload={"order_id": -number})
+                for number in range(1, options["messages"] + 1)
+            )
+            started = time.perf_counter()
+            while outbox.relay_batch(options["batch_size"]):
+                pass
+            elapsed = time.perf_counter() - started
+            self.stdout.write(f"relay: {options['messages'] / elapsed:,.0f} messages/sec")
+        finally:
+            self.delete_messages(user)
+            venue.delete()
+            user.delete()
+
+    def delete_messages(self, user) -> None:
+        order_ids = list(Order.objects.filter(user=user).values_list("pk", flat=True))
+        OutboxMessage.objects.filter(topic=outbox.ORDER_CONFIRMATION).filter(
+            Q(payload__order_id__in=order_ids) | Q(payload__order_id__lt=0)
+        ).delete()
+
+    def lock_hold_times(self, ticket, user, notify, orders: int) -> list[float]:
+        timings = []
+        for _ in range(orders):
+            started = time.perf_counter()
+            with transaction.atomic():
+                locked = reserve(ticket, 1)
+                order = Order.objects.create(
+                    user=user, ticket=locked, quantity=1, total_price=locked.price
+                )
+                notify(order)
+            timings.append((time.perf_counter() - started) * 1000)
+        return timings
@@ -0,0 +1,142 @@
+import asyncio
+import os
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date
+
+import aiohttp
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+
+from events.models import Event, Venue
+from eventservice.config import settings as config
+from orders.management.commands.bench_booking import Run
+from orders.management.commands.bench_serving import free_port, wait_until_ready
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure registrations/sec and catalog latency during a registration burst against "
+        "gunicorn, hashing passwords on all but one request thread and on the configured pool."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--seconds", type=float, default=10)
+        parser.add_argument("--registrations", type=int, default=32, help="Concurrent signups.")
+        parser.add_argument("--browsers", type=int, default=8, help="Concurrent catalog clients.")
+        parser.add_argument("--workers", type=int, default=1, help="Gunicorn workers.")
+        parser.add_argument(
+            "--threads", type=int, default=config.WEB_THREADS, help="Threads per worker."
+        )
+        parser.add_argument(
+            "--hash-workers", type=int, help="Hashing threads, by default as configured."
+        )
+        parser.add_argument(
+            "--hash-backlog", type=int, help="Waiting registrations, by default as configured."
+        )
+
+    def handle(self, *args, **options):
+        threads = options["threads"]
+        # As many threads hash at once as the API allows to start: all but one request thread.
+        unbounded = {
+            "PASSWORD_HASH_WORKERS": str(max(threads - 1, 1)),
+            "PASSWORD_HASH_BACKLOG": "0",
+        }
+        bounded = {}
+        if options["hash_workers"] is not None:
+            bounded["PASSWORD_HASH_WORKERS"] = str(options["hash_workers"])
+        if options["hash_backlog"] is not None:
+            bounded["PASSWORD_HASH_BACKLOG"] = str(options["hash_backlog"])
+        modes = {
+            "no_signups": (bounded, 0),
+            "unbounded": (unbounded, options["registrations"]),
+            "bounded": (bounded, options["registrations"]),
+        }
+        gunicorn = [
+            sys.executable,
+            "-m",
+            "gunicorn",
+            "-c",
+            "gunicorn.conf.py",
+            "--workers",
+            str(options["workers"]),
+            "--threads",
+            str(threads),
+        ]
+
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+        self.prefix = f"signup_{uuid.uuid4().hex[:8]}"
+        try:
+            self.stdout.write(
+                f"{'hashing':<12} {'signups/s':>10} {'503s':>6} {'catalog req/s':>14} "
+                f"{'p50 ms':>8} {'p99 ms':>8}"
+            )
+            for name, (env, registrations) in modes.items():
+                port = free_port()
+                process = subprocess.Popen(
+                    [*gunicorn, "--bind", f"127.0.0.1:{port}"],
+                    # Registration is rate limited per address, and every signup comes from here.
+                    env={
+                        **os.environ,
+                        "WEB_THREADS": str(threads),
+                        **env,
+                        "THROTTLE_REGISTRATION_IP_RATE": "",
+                    },
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                try:
+                    wait_until_ready(port)
+                    signups, catalog = asyncio.run(
+                        self.load(port, registrations, options["browsers"], options["seconds"])
+                    )
+                finally:
+                    process.terminate()
+                    process.wait()
+                summary = catalog.summary()
+                self.stdout.write(
+                    f"{name:<12} {signups.statuses[201] / signups.elapsed:>10.1f} "
+                    f"{signups.statuses[503]:>6} {summary['requests_per_sec']:>14.1f} "
+                    f"{summary['latency_ms']['p50']:>8.2f} {summary['latency_ms']['p99']:>8.2f}"
+                )
+        finally:
+            User.objects.filter(username__startswith=self.prefix).delete()
+            venue.delete()
+            user.delete()
+
+    async def load(
+        self, port: int, registrations: int, browsers: int, seconds: float
+    ) -> tuple[Run, Run]:
+        signups, catalog = Run("signups"), Run("catalog")
+        connector = aiohttp.TCPConnector(limit=registrations + browsers)
+        async with aiohttp.ClientSession(
+            base_url=f"http://127.0.0.1:{port}", connector=connector
+        ) as session:
+            warmup = Run("warmup")
+            await asyncio.gather(
+                *(warmup.request(session, "GET", "/api/events/") for _ in range(browsers))
+            )
+            deadline = time.perf_counter() + seconds
+
+            async def sign_up():
+                while time.perf_counter() < deadline:
+                    username = f"{self.prefix}_{uuid.uuid4().hex[:12]}"
+                    data = {"username": username, "email": "", "password": uuid.uuid4().hex}
+                    await signups.request(session, "POST", "/api/users/register/", json=data)
+
+            async def browse():
+                while time.perf_counter() < deadline:
+                    await catalog.request(session, "GET", "/api/events/")
+
+            started = time.perf_counter()
+            await asyncio.gather(
+                *(sign_up() for _ in range(registrations)), *(browse() for _ in range(browsers))
+            )
+            signups.elapsed = catalog.elapsed = time.perf_counter() - started
+        return signups, catalog
@@ -0,0 +1,101 @@
+import statistics
+import time
+import uuid
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.models import Q
+
+from events.filters import EVENT_SEARCH_VECTOR, prefix_search_query
+from events.models import Event, Venue
+from orders.models import Order, Ticket
+
+WORDS = ["rock", "jazz", "opera", "comedy", "ballet", "techno", "folk", "symphony"]
+
+INSERT_EVENTS_SQL = f"""
+INSERT INTO {Event._meta.db_table} (name, description, date, venue_id, organizer_id)
+SELECT initcap((%s::text[])[1 + i %% %s]) || ' night ' || i,
+       'Benchmark event number ' || i, current_date, %s, %s
+FROM generate_series(1, %s) AS i
+"""
+
+INSERT_TICKETS_SQL = f"""
+INSERT INTO {Ticket._meta.db_table}
+    (event_id, type, price, quantity, available_quantity, shard_count)
+SELECT id, 'standard', 1, 1, 0, 0 FROM {Event._meta.db_table} WHERE venue_id = %s
+"""
+
+INSERT_ORDERS_SQL = f"""
+INSERT INTO {Order._meta.db_table}
+    (user_id, ticket_id, quantity, total_price, status, created_at)
+SELECT %s, (%s::bigint[])[1 + i %% %s], 1, 1, 'paid', now() - make_interval(secs => i)
+FROM generate_series(1, %s) AS i
+"""
+
+
+class Command(BaseCommand):
+    help = "Compare icontains and full-text search latency over the order history."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--orders", type=int, default=10_000_000)
+        parser.add_argument("--events", type=int, default=10_000)
+        parser.add_argument("--terms", nargs="+", default=["jazz", "symph", "opera night 42"])
+        parser.add_argument("--page-size", type=int, default=20)
+        parser.add_argument("--repeat", type=int, default=10)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+
+        try:
+            self.stdout.write(
+                f"Inserting {options['events']} events and {options['orders']} orders..."
+            )
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    INSERT_EVENTS_SQL, [WORDS, len(WORDS), venue.pk, user.pk, options["events"]]
+                )
+                Event.objects.filter(venue=venue).update(search_vector=EVENT_SEARCH_VECTOR)
+                cursor.execute(INSERT_TICKETS_SQL, [venue.pk])
+                tickets = list(
+                    Ticket.objects.filter(event__venue=venue).values_list("pk", flat=True)
+                )
+                cursor.execute(
+                    INSERT_ORDERS_SQL, [user.pk, tickets, len(tickets), options["orders"]]
+                )
+                for model in (Event, Ticket, Order):
+                    cursor.execute(f"ANALYZE {model._meta.db_table}")
+
+            history = Order.objects.filter(user=user).order_by("-created_at", "-id")
+            size = options["page_size"]
+            self.stdout.write(f"{'term':>16} {'icontains':>12} {'full-text':>12}")
+            for term in options["terms"]:
+                words = term.split()
+                contains = Q()
+                for word in words:
+                    contains &= Q(status__icontains=word) | Q(ticket__event__name__icontains=word)
+                full_text = Q(ticket__event__search_vector=prefix_search_query(words)) | Q(
+                    ticket__event__name__trigram_word_similar=term
+                )
+
+                contains_ms = self.measure(
+                    lambda: list(history.filter(contains)[:size]), options["repeat"]
+                )
+                full_text_ms = self.measure(
+                    lambda: list(history.filter(full_text)[:size]), options["repeat"]
+                )
+                self.stdout.write(f"{term:>16} {contains_ms:>9.2f} ms {full_text_ms:>9.2f} ms")
+        finally:
+            Order.objects.filter(user=user).delete()
+            venue.delete()
+            user.delete()
+
+    def measure(self, fetch, repeat: int) -> float:
+        fetch()
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fetch()
+            timings.append(time.perf_counter() - started)
+        return statistics.median(timings) * 1000
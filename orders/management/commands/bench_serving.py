@@ -0,0 +1,119 @@
+import asyncio
+import socket
+import subprocess
+import sys
+import time
+import uuid
+from datetime import date
+
+import aiohttp
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+
+from events.models import Event, Venue
+from orders.management.commands.bench_booking import Run
+from orders.models import Ticket
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def wait_until_ready(port: int, timeout: float = 30) -> None:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=1):
+                return
+        except OSError:
+            time.sleep(0.2)
+    raise CommandError(f"No server is listening on port {port}.")
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare requests/sec of the development server with gunicorn, using thread and "
+        "uvicorn workers, on read-only catalog requests."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=3000)
+        parser.add_argument("--concurrency", type=int, default=50)
+        parser.add_argument("--workers", type=int, help="Gunicorn workers, WEB_WORKERS by default.")
+        parser.add_argument("--threads", type=int, help="Threads per gthread worker.")
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+        ticket = Ticket.objects.create(event=event, price=1, quantity=1, available_quantity=1)
+        paths = ["/api/events/", f"/api/events/{event.pk}/", f"/api/tickets/{ticket.pk}/"]
+
+        gunicorn = [sys.executable, "-m", "gunicorn", "-c", "gunicorn.conf.py"]
+        if options["workers"]:
+            gunicorn += ["--workers", str(options["workers"])]
+        if options["threads"]:
+            gunicorn += ["--threads", str(options["threads"])]
+        # Each command is completed with the address to listen on.
+        servers = {
+            "runserver": [sys.executable, "manage.py", "runserver", "--noreload"],
+            "gthread": [*gunicorn, "-k", "gthread", "eventservice.wsgi:application", "--bind"],
+            "uvicorn": [
+                *gunicorn,
+                "-k",
+                "uvicorn_worker.UvicornWorker",
+                "eventservice.asgi:application",
+                "--bind",
+            ],
+        }
+
+        try:
+            self.stdout.write(
+                f"{'server':<12} {'req/s':>9} {'p50 ms':>9} {'p99 ms':>9} {'errors':>7}"
+            )
+            for name, command in servers.items():
+                port = free_port()
+                process = subprocess.Popen(
+                    [*command, f"127.0.0.1:{port}"],
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.DEVNULL,
+                )
+                try:
+                    wait_until_ready(port)
+                    summary = asyncio.run(
+                        self.load(port, paths, options["requests"], options["concurrency"])
+                    ).summary()
+                finally:
+                    process.terminate()
+                    process.wait()
+                latency = summary["latency_ms"]
+                self.stdout.write(
+                    f"{name:<12} {summary['requests_per_sec']:>9.1f} {latency['p50']:>9.2f} "
+                    f"{latency['p99']:>9.2f} {summary['errors']:>7}"
+                )
+        finally:
+            venue.delete()
+            user.delete()
+
+    async def load(self, port: int, paths: list[str], requests: int, concurrency: int) -> Run:
+        run = Run("serving")
+        connector = aiohttp.TCPConnector(limit=concurrency)
+        async with aiohttp.ClientSession(
+            base_url=f"http://127.0.0.1:{port}", connector=connector
+        ) as session:
+            # Warm up every worker's connections and caches before measuring.
+            await asyncio.gather(*(Run("warmup").request(session, "GET", p) for p in paths * 10))
+
+            async def client(number: int):
+                while len(run.latencies) < requests:
+                    await run.request(session, "GET", paths[number % len(paths)])
+                    number += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(client(number) for number in range(concurrency)))
+            run.elapsed = time.perf_counter() - started
+        return run
@@ -0,0 +1,53 @@
+import asyncio
+import time
+
+from django.core.management.base import BaseCommand
+
+from eventservice.config import settings
+from orders.mailer import ses
+from orders.notifications import deliver
+from orders.utils import create_message, get_client
+
+
+async def deliver_with_new_client(recipient: str, message: dict) -> None:
+    """The previous send path: a new session and client, and a verification, per email."""
+    async with await get_client() as client:
+        await client.verify_email_identity(EmailAddress=settings.SENDER)
+        await client.send_email(
+            Source=settings.SENDER, Destination={"ToAddresses": [recipient]}, Message=message
+        )
+
+
+class Command(BaseCommand):
+    help = "Compare emails/sec of a client per send against the worker's pooled SES client."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--emails", type=int, default=200)
+        parser.add_argument(
+            "--endpoint-url",
+            default=settings.ENDPOINT_URL,
+            help="SES endpoint, e.g. localstack or `moto_server`.",
+        )
+
+    def handle(self, *args, **options):
+        settings.ENDPOINT_URL = options["endpoint_url"]
+        emails = options["emails"]
+        message = create_message(subject_data="Benchmark", text="Benchmark message")
+        recipients = [f"bench{number}@example.com" for number in range(emails)]
+
+        started = time.perf_counter()
+        for recipient in recipients:
+            asyncio.run(deliver_with_new_client(recipient, message))
+        per_send = emails / (time.perf_counter() - started)
+
+        ses.start()
+        try:
+            started = time.perf_counter()
+            for recipient in recipients:
+                ses.run(deliver(recipient=recipient, message=message))
+            pooled = emails / (time.perf_counter() - started)
+        finally:
+            ses.stop()
+
+        self.stdout.write(f"client per send: {per_send:>8.1f} emails/sec")
+        self.stdout.write(f"pooled client:   {pooled:>8.1f} emails/sec")
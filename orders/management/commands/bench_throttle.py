@@ -0,0 +1,92 @@
+import statistics
+import time
+import uuid
+from datetime import date
+from types import SimpleNamespace
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+from rest_framework.throttling import ScopedRateThrottle
+
+from events.models import Event, Venue
+from eventservice.redis_client import get_redis
+from eventservice.throttling import (
+    EventTokenBucketThrottle,
+    IPTokenBucketThrottle,
+    UserTokenBucketThrottle,
+)
+from orders.models import Ticket
+
+# High enough that no check is ever refused, so every call does the full work.
+RATE = "1000000/s"
+
+
+class Command(BaseCommand):
+    help = (
+        "Time one throttle check of an order request: the Redis token buckets per user, "
+        "address and event, and DRF's ScopedRateThrottle on the same cache for comparison."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--checks", type=int, default=10_000)
+
+    def handle(self, *args, **options):
+        user = User.objects.create(username=f"bench_{uuid.uuid4().hex[:8]}")
+        venue = Venue.objects.create(name="Benchmark venue", address="-", capacity=1)
+        event = Event.objects.create(
+            name="Benchmark event", description="", date=date.today(), venue=venue, organizer=user
+        )
+        ticket = Ticket.objects.create(event=event, price=1, quantity=1, available_quantity=1)
+        scope = f"bench{uuid.uuid4().hex[:8]}"
+
+        request = Request(
+            APIRequestFactory().post(
+                "/api/orders/", {"ticket": ticket.pk, "quantity": 1}, format="json"
+            ),
+            parsers=[JSONParser()],
+        )
+        request.user = user
+        request.data  # Parsed once by the view before throttles run.
+        view = SimpleNamespace(throttle_scope=scope, kwargs={})
+
+        throttles = {
+            "scoped_cache": ScopedRateThrottle,
+            "bucket_user": UserTokenBucketThrottle,
+            "bucket_ip": IPTokenBucketThrottle,
+            "bucket_event": EventTokenBucketThrottle,
+        }
+        try:
+            self.stdout.write(f"{'throttle':<14} {'mean us':>9} {'p50 us':>9} {'p99 us':>9}")
+            for name, throttle_class in throttles.items():
+                throttle_class.THROTTLE_RATES = {
+                    scope: RATE,
+                    f"{scope}_user": RATE,
+                    f"{scope}_ip": RATE,
+                    f"{scope}_event": RATE,
+                }
+                timings = self.time_checks(throttle_class, request, view, options["checks"])
+                percentiles = statistics.quantiles(timings, n=100)
+                self.stdout.write(
+                    f"{name:<14} {statistics.fmean(timings):>9.1f} {percentiles[49]:>9.1f} "
+                    f"{percentiles[98]:>9.1f}"
+                )
+        finally:
+            keys = list(get_redis().scan_iter(f"throttle:{scope}*"))
+            if keys:
+                get_redis().delete(*keys)
+            venue.delete()
+            user.delete()
+
+    def time_checks(self, throttle_class, request, view, checks: int) -> list[float]:
+        """Microseconds per check, each on a fresh instance as DRF creates them."""
+        throttle_class().allow_request(request, view)
+        timings = []
+        for _ in range(checks):
+            started = time.perf_counter()
+            allowed = throttle_class().allow_request(request, view)
+            timings.append((time.perf_counter() - started) * 1_000_000)
+            assert allowed
+        return timings
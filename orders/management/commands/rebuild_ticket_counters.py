@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from orders.models import Ticket
+from orders.reservations import sync_counters
+
+
+class Command(BaseCommand):
+    help = "Rebuild the Redis ticket counters used by the reservation layer from Postgres."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ticket", type=int, nargs="*", help="Only rebuild these tickets.")
+
+    def handle(self, *args, **options):
+        tickets = Ticket.objects.all()
+        if options["ticket"]:
+            tickets = tickets.filter(pk__in=options["ticket"])
+        synced = sync_counters(tickets)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {synced} ticket counters."))
@@ -0,0 +1,25 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from orders.outbox import relay_batch
+
+
+class Command(BaseCommand):
+    help = "Publish committed outbox messages to Celery in batches."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--interval", type=float, default=0.5, help="Seconds to wait when the outbox is empty."
+        )
+        parser.add_argument("--once", action="store_true", help="Drain the outbox and exit.")
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        while True:
+            relayed = relay_batch(batch_size)
+            if relayed < batch_size:
+                if options["once"]:
+                    return
+                time.sleep(options["interval"])
@@ -0,0 +1,27 @@
+from prometheus_client import Counter, Histogram
+
+TICKET_LOCK_WAIT = Histogram(
+    "ticket_lock_wait_seconds",
+    "Time an order waited to take stock from a ticket, by reservation engine.",
+    ["engine"],
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+SOLD_OUT = Counter(
+    "orders_sold_out",
+    "Orders rejected for lack of stock, by where they were stopped.",
+    ["source"],
+)
+IDEMPOTENT_REPLAYS = Counter(
+    "orders_idempotent_replays",
+    "Retried order requests answered with the stored response, by where it was found.",
+    ["source"],
+)
+
+# Bound once so the order path does not look the label values up on every call.
+row_lock_wait = TICKET_LOCK_WAIT.labels("row_lock")
+conditional_update_wait = TICKET_LOCK_WAIT.labels("conditional_update")
+sharded_wait = TICKET_LOCK_WAIT.labels("sharded")
+sold_out_in_redis = SOLD_OUT.labels("redis")
+sold_out_in_database = SOLD_OUT.labels("database")
+replayed_from_redis = IDEMPOTENT_REPLAYS.labels("redis")
+replayed_from_database = IDEMPOTENT_REPLAYS.labels("database")
@@ -0,0 +1,50 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:06
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0003_alter_order_quantity_alter_ticket_price_and_more"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="ticket",
+            name="shard_count",
+            field=models.PositiveSmallIntegerField(
+                default=0, validators=[django.core.validators.MaxValueValidator(128)]
+            ),
+        ),
+        migrations.CreateModel(
+            name="TicketShard",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("number", models.PositiveSmallIntegerField()),
+                ("available_quantity", models.IntegerField()),
+                (
+                    "ticket",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="shards",
+                        to="orders.ticket",
+                    ),
+                ),
+            ],
+            options={
+                "constraints": [
+                    models.UniqueConstraint(
+                        fields=("ticket", "number"), name="unique_ticket_shard_number"
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,28 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("orders", "0004_ticket_shard_count_ticketshard"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="expires_at",
+            field=models.DateTimeField(blank=True, null=True),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                condition=models.Q(("expires_at__isnull", False), ("status", "pending")),
+                fields=["expires_at"],
+                name="order_pending_expiry_idx",
+            ),
+        ),
+    ]
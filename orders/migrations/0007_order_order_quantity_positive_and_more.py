@@ -0,0 +1,54 @@
+# Generated by Django 5.1.15 on 2026-10-18 19:29
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("events", "0003_event_event_date_id_idx_and_more"),
+        ("orders", "0006_order_order_user_created_idx"),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name="order",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("quantity__gte", 1)), name="order_quantity_positive"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="order",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("total_price__gte", 0)), name="order_total_price_non_negative"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("quantity__gte", 1)), name="ticket_quantity_positive"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("available_quantity__gte", 0)),
+                name="ticket_available_quantity_non_negative",
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticket",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("price__gt", 0)), name="ticket_price_positive"
+            ),
+        ),
+        migrations.AddConstraint(
+            model_name="ticketshard",
+            constraint=models.CheckConstraint(
+                condition=models.Q(("available_quantity__gte", 0)),
+                name="ticket_shard_available_quantity_non_negative",
+            ),
+        ),
+    ]
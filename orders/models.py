@@ -1,7 +1,9 @@
 from decimal import Decimal
 
-from django.core.validators import MinValueValidator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.validators import MaxValueValidator, MinValueValidator
 from django.db import models
+from django.db.models import Sum
 
 
 class TicketType(models.TextChoices):
@@ -26,10 +28,47 @@ class Ticket(models.Model):
     )
     quantity = models.IntegerField(validators=[MinValueValidator(1)])
     available_quantity = models.IntegerField()
+    shard_count = models.PositiveSmallIntegerField(default=0, validators=[MaxValueValidator(128)])
+
+    class Meta:
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(quantity__gte=1), name="ticket_quantity_positive"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(available_quantity__gte=0),
+                name="ticket_available_quantity_non_negative",
+            ),
+            models.CheckConstraint(condition=models.Q(price__gt=0), name="ticket_price_positive"),
+        ]
 
     def __str__(self):
         return f"{self.event} ({self.type})"
 
+    @property
+    def total_available_quantity(self) -> int:
+        if not self.shard_count:
+            return self.available_quantity
+        sharded = getattr(self, "shards_available_quantity", None)
+        if sharded is None:
+            sharded = self.shards.aggregate(total=Sum("available_quantity"))["total"]
+        return self.available_quantity + (sharded or 0)
+
+
+class TicketShard(models.Model):
+    ticket = models.ForeignKey(Ticket, on_delete=models.CASCADE, related_name="shards")
+    number = models.PositiveSmallIntegerField()
+    available_quantity = models.IntegerField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["ticket", "number"], name="unique_ticket_shard_number"),
+            models.CheckConstraint(
+                condition=models.Q(available_quantity__gte=0),
+                name="ticket_shard_available_quantity_non_negative",
+            ),
+        ]
+
 
 class Order(models.Model):
     user = models.ForeignKey("auth.User", on_delete=models.CASCADE)
@@ -38,3 +77,45 @@ class Order(models.Model):
     total_price = models.DecimalField(decimal_places=2, max_digits=10)
     status = models.CharField(choices=PaidStatus, default=PaidStatus.pending)
     created_at = models.DateTimeField(auto_now_add=True)
+    expires_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"], name="order_user_created_idx"),
+            models.Index(
+                fields=["expires_at"],
+                name="order_pending_expiry_idx",
+                condition=models.Q(status=PaidStatus.pending, expires_at__isnull=False),
+            ),
+        ]
+        constraints = [
+            models.CheckConstraint(
+                condition=models.Q(quantity__gte=1), name="order_quantity_positive"
+            ),
+            models.CheckConstraint(
+                condition=models.Q(total_price__gte=0), name="order_total_price_non_negative"
+            ),
+        ]
+
+
+class IdempotencyKey(models.Model):
+    user = models.ForeignKey("auth.User", on_delete=models.CASCADE)
+    key = models.CharField(max_length=255)
+    fingerprint = models.CharField(max_length=64)
+    status_code = models.PositiveSmallIntegerField(null=True)
+    response = models.JSONField(null=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "key"], name="idempotency_key_unique_per_user")
+        ]
+
+
+class OutboxMessage(models.Model):
+    topic = models.CharField(max_length=64)
+    payload = models.JSONField()
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.topic} #{self.pk}"
@@ -0,0 +1,238 @@
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.db import close_old_connections
+
+from eventservice.circuit_breaker import HALF_OPEN, OPEN
+from orders.exeptions import CircuitOpenError, TransientSendError
+from orders.mailer import ses, ses_circuit
+from orders.models import Order
+from orders.utils import (
+    TRANSIENT_BULK_STATUSES,
+    create_message,
+    is_transient,
+    put_template,
+    send_bulk_templated_email,
+    send_email,
+)
+
+logger = logging.getLogger(__name__)
+
+# The outbox relay hands confirmations over in batches of up to NOTIFICATION_BATCH_SIZE
+# orders. Each batch is loaded with one query and its emails are sent concurrently on
+# the worker's SES loop, so there is one Celery task per batch rather than per order.
+# Notification tasks are coroutines on that shared loop and query through the async ORM,
+# so a thread pool worker interleaves the sends of all the tasks it is running.
+# Emails that fail transiently are not retried here: their ids go back to the task, which
+# Celery retries later with backoff, and the SES circuit breaker stops every worker from
+# calling SES while it keeps failing.
+
+CONFIRMATION_TEMPLATE = "OrderConfirmation"
+CONFIRMATION_SUBJECT = "Order Confirmation #{order_id}"
+CONFIRMATION_TEXT = (
+    "Hello, {username}!\n\n"
+    'Your order for the event "{event}" has been successfully created.\n'
+    "Number of tickets: {quantity}\n"
+    "Total price: {total_price}\n\n"
+    "Thank you for your purchase!"
+)
+CONFIRMATION_FIELDS = ("order_id", "username", "event", "quantity", "total_price")
+
+# SES accepts at most 50 destinations per SendBulkTemplatedEmail call.
+BULK_DESTINATIONS = 50
+
+
+def confirmation_data(order: Order) -> dict:
+    return {
+        "order_id": order.id,
+        "username": order.user.username,
+        "event": order.ticket.event.name,
+        "quantity": order.quantity,
+        "total_price": str(order.total_price),
+    }
+
+
+def confirmation_message(data: dict) -> dict:
+    return create_message(
+        subject_data=CONFIRMATION_SUBJECT.format(**data), text=CONFIRMATION_TEXT.format(**data)
+    )
+
+
+def batch_confirmation_message(orders: list[Order]) -> dict:
+    lines = "\n".join(
+        f'- "{order.ticket.event.name}" ({order.ticket.type}): '
+        f"{order.quantity} tickets, {order.total_price}"
+        for order in orders
+    )
+    return create_message(
+        subject_data="Order Confirmation " + ", ".join(f"#{order.id}" for order in orders),
+        text=(
+            f"Hello, {orders[0].user.username}!\n\n"
+            "Your orders have been successfully created:\n"
+            f"{lines}\n"
+            f"Total price: {sum(order.total_price for order in orders)}\n\n"
+            "Thank you for your purchase!"
+        ),
+    )
+
+
+def confirmation_template() -> dict:
+    placeholders = {field: f"{{{{{field}}}}}" for field in CONFIRMATION_FIELDS}
+    return {
+        "TemplateName": CONFIRMATION_TEMPLATE,
+        "SubjectPart": CONFIRMATION_SUBJECT.format(**placeholders),
+        "TextPart": CONFIRMATION_TEXT.format(**placeholders),
+    }
+
+
+def chunked(items: list, size: int) -> list[list]:
+    chunks = []
+    for start in range(0, len(items), size):
+        stop = start + size
+        chunks.append(items[start:stop])
+    return chunks
+
+
+async def call_ses(send):
+    """Make one SES call through the circuit breaker and return its result.
+
+    Transient failures count against the breaker and are raised as ``TransientSendError``;
+    an open circuit raises ``CircuitOpenError`` without calling SES. Any other error is
+    logged as permanent and raised unchanged.
+    """
+    state = await asyncio.to_thread(ses_circuit.allow)
+    if state == OPEN:
+        raise CircuitOpenError("The SES circuit is open.")
+    try:
+        result = await send()
+    except Exception as error:
+        if not is_transient(error):
+            logger.error("SES call failed and will not be retried.", exc_info=True)
+            raise
+        await asyncio.to_thread(ses_circuit.record_failure)
+        raise TransientSendError(str(error)) from error
+    if state == HALF_OPEN:
+        await asyncio.to_thread(ses_circuit.record_success)
+    return result
+
+
+async def deliver(recipient: str, message: dict) -> None:
+    await call_ses(partial(send_email, client=ses.client, email=recipient, message=message))
+
+
+async def send_confirmations(
+    recipients: list[tuple[str, dict]],
+) -> tuple[list[int], list[int]]:
+    """Send confirmation emails for ``(email, confirmation_data)`` pairs concurrently.
+
+    Returns the ids of the orders to retry: those whose emails failed transiently, and
+    those whose emails were not sent because the SES circuit was open.
+    """
+    semaphore = asyncio.Semaphore(settings.NOTIFICATION_CONCURRENCY)
+    deferred = []
+
+    async def send_one(email: str, data: dict) -> list[int]:
+        await deliver(recipient=email, message=confirmation_message(data))
+        return []
+
+    async def send_chunk(chunk: list[tuple[str, dict]]) -> list[int]:
+        statuses = await call_ses(
+            partial(send_bulk_templated_email, ses.client, CONFIRMATION_TEMPLATE, chunk)
+        )
+        failed = []
+        for (_, data), status in zip(chunk, statuses):
+            if status["Status"] in TRANSIENT_BULK_STATUSES:
+                failed.append(data["order_id"])
+            elif status["Status"] != "Success":
+                logger.error(
+                    "SES rejected the confirmation of order %s: %s",
+                    data["order_id"],
+                    status.get("Error", status["Status"]),
+                )
+        return failed
+
+    async def bounded(send, chunk: list[tuple[str, dict]]) -> list[int]:
+        async with semaphore:
+            try:
+                return await send
+            except CircuitOpenError:
+                deferred.extend(data["order_id"] for _, data in chunk)
+                return []
+            except TransientSendError:
+                return [data["order_id"] for _, data in chunk]
+            except Exception:
+                # Already logged by call_ses; sending it again would fail the same way.
+                return []
+
+    if settings.NOTIFICATION_BULK_TEMPLATES:
+        try:
+            await call_ses(partial(put_template, ses.client, confirmation_template()))
+        except CircuitOpenError:
+            return [], [data["order_id"] for _, data in recipients]
+        except TransientSendError:
+            return [data["order_id"] for _, data in recipients], []
+        sends = [
+            bounded(send_chunk(chunk), chunk) for chunk in chunked(recipients, BULK_DESTINATIONS)
+        ]
+    else:
+        sends = [bounded(send_one(email, data), [(email, data)]) for email, data in recipients]
+
+    results = await asyncio.gather(*sends)
+    return [order_id for failed in results for order_id in failed], deferred
+
+
+@asynccontextmanager
+async def database_connection():
+    """Close stale connections before and after the block, as Django does around requests.
+
+    Async ORM queries run on asgiref's shared sync thread, whose connection no Celery or
+    request hook ever recycles.
+    """
+    await sync_to_async(close_old_connections)()
+    try:
+        yield
+    finally:
+        await sync_to_async(close_old_connections)()
+
+
+def confirmed_orders():
+    return Order.objects.select_related("user", "ticket__event")
+
+
+async def confirm_order(order_id: int) -> bool:
+    try:
+        async with database_connection():
+            order = await confirmed_orders().aget(id=order_id)
+    except Order.DoesNotExist:
+        return False
+
+    await deliver(
+        recipient=order.user.email, message=confirmation_message(confirmation_data(order))
+    )
+    return True
+
+
+async def confirm_batch_order(order_ids: list[int]) -> bool:
+    async with database_connection():
+        orders = [
+            order async for order in confirmed_orders().filter(id__in=order_ids).order_by("id")
+        ]
+    if not orders:
+        return False
+
+    await deliver(recipient=orders[0].user.email, message=batch_confirmation_message(orders))
+    return True
+
+
+async def dispatch_confirmations(order_ids: list[int]) -> tuple[list[int], list[int]]:
+    """Send the confirmations for a batch of orders and return the failed and deferred ids."""
+    async with database_connection():
+        orders = [order async for order in confirmed_orders().filter(id__in=order_ids)]
+    recipients = [
+        (order.user.email, confirmation_data(order)) for order in orders if order.user.email
+    ]
+    return await send_confirmations(recipients)
@@ -0,0 +1,54 @@
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+
+from orders.models import OutboxMessage
+from orders.notifications import chunked
+from orders.tasks import send_batch_order_confirmation_notification, send_order_confirmations
+
+# Messages for Celery are written to the outbox table in the same transaction as the
+# orders they describe. The relay publishes committed rows in batches and deletes them
+# afterwards, so the broker is never called while ticket rows are locked and a rolled
+# back order never reaches a worker. Delivery is at least once: a relay that dies after
+# publishing but before committing publishes the same rows again.
+
+ORDER_CONFIRMATION = "order_confirmation"
+BATCH_ORDER_CONFIRMATION = "batch_order_confirmation"
+
+
+def add(topic: str, payload: dict) -> OutboxMessage:
+    return OutboxMessage.objects.create(topic=topic, payload=payload)
+
+
+def publish_order_confirmations(payloads: list[dict]) -> None:
+    order_ids = [payload["order_id"] for payload in payloads]
+    for batch in chunked(order_ids, settings.NOTIFICATION_BATCH_SIZE):
+        send_order_confirmations.delay(batch)
+
+
+def publish_batch_order_confirmations(payloads: list[dict]) -> None:
+    for payload in payloads:
+        send_batch_order_confirmation_notification.delay(payload["order_ids"])
+
+
+PUBLISHERS = {
+    ORDER_CONFIRMATION: publish_order_confirmations,
+    BATCH_ORDER_CONFIRMATION: publish_batch_order_confirmations,
+}
+
+
+def relay_batch(batch_size: int) -> int:
+    """Publish up to ``batch_size`` committed messages, oldest first, and delete them."""
+    with transaction.atomic():
+        messages = list(
+            OutboxMessage.objects.select_for_update(skip_locked=True).order_by("id")[:batch_size]
+        )
+        payloads = defaultdict(list)
+        for message in messages:
+            payloads[message.topic].append(message.payload)
+        for topic, topic_payloads in payloads.items():
+            PUBLISHERS[topic](topic_payloads)
+        OutboxMessage.objects.filter(id__in=[message.id for message in messages]).delete()
+
+    return len(messages)
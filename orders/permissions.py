@@ -6,4 +6,4 @@ class IsTicketOrganizerOrAdminOrReadOnly(permissions.BasePermission):
     def has_object_permission(self, request, view, obj):
         if request.method in permissions.SAFE_METHODS:
             return True
-        return obj.event.organizer.pk == request.user.pk or request.user.is_staff
+        return obj.event.organizer_id == request.user.pk or request.user.is_staff
@@ -0,0 +1,256 @@
+import logging
+import time
+import uuid
+from contextlib import contextmanager
+from dataclasses import dataclass
+from functools import partial
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
+from redis.exceptions import RedisError
+
+from eventservice.redis_client import get_redis
+from orders.exeptions import CreateOrderException
+from orders.metrics import sold_out_in_redis
+from orders.models import Ticket
+
+logger = logging.getLogger(__name__)
+
+# Redis mirrors each ticket's stock in a counter. An order first moves its quantity from
+# the counter into a hold (a sorted set member scored by its expiry time) and only then
+# goes to Postgres. The hold is dropped once the order commits and returned to the
+# counter if the database write fails or never confirms. Postgres stays authoritative:
+# a counter that is too high only lets a request through to the usual stock check.
+
+HELD_TICKETS_KEY = "tickets:held"
+
+RESERVE_SCRIPT = """
+local available = redis.call('GET', KEYS[1])
+if not available then
+    return -1
+end
+if tonumber(available) < tonumber(ARGV[1]) then
+    return 0
+end
+redis.call('DECRBY', KEYS[1], ARGV[1])
+redis.call('ZADD', KEYS[2], ARGV[2], ARGV[3])
+redis.call('SADD', KEYS[3], ARGV[4])
+return 1
+"""
+
+RELEASE_SCRIPT = """
+if redis.call('ZREM', KEYS[2], ARGV[1]) == 1 and redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBY', KEYS[1], ARGV[2])
+end
+return 1
+"""
+
+EXPIRE_SCRIPT = """
+local released = 0
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', ARGV[1])) do
+    local quantity = tonumber(string.match(member, ':(%d+)$'))
+    redis.call('ZREM', KEYS[2], member)
+    if redis.call('EXISTS', KEYS[1]) == 1 then
+        redis.call('INCRBY', KEYS[1], quantity)
+    end
+    released = released + quantity
+end
+if redis.call('ZCARD', KEYS[2]) == 0 then
+    redis.call('SREM', KEYS[3], ARGV[2])
+end
+return released
+"""
+
+RESTOCK_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return 1
+"""
+
+SYNC_SCRIPT = """
+local held = 0
+for _, member in ipairs(redis.call('ZRANGE', KEYS[2], 0, -1)) do
+    held = held + tonumber(string.match(member, ':(%d+)$'))
+end
+redis.call('SET', KEYS[1], math.max(tonumber(ARGV[1]) - held, 0))
+return held
+"""
+
+_reserve = get_redis().register_script(RESERVE_SCRIPT)
+_release = get_redis().register_script(RELEASE_SCRIPT)
+_expire = get_redis().register_script(EXPIRE_SCRIPT)
+_restock = get_redis().register_script(RESTOCK_SCRIPT)
+_sync = get_redis().register_script(SYNC_SCRIPT)
+
+
+def counter_key(ticket_id: int) -> str:
+    return f"tickets:{ticket_id}:available"
+
+
+def holds_key(ticket_id: int) -> str:
+    return f"tickets:{ticket_id}:holds"
+
+
+def event_key(ticket_id: int) -> str:
+    return f"tickets:{ticket_id}:event"
+
+
+@dataclass(frozen=True)
+class Reservation:
+    ticket_id: int
+    quantity: int
+    token: str
+
+    @property
+    def member(self) -> str:
+        return f"{self.token}:{self.quantity}"
+
+
+def reject_if_sold_out(ticket_id, quantity) -> None:
+    """Cheap read-only check run before the request is validated against Postgres."""
+    if not settings.TICKET_RESERVATIONS:
+        return
+    try:
+        ticket_id, quantity = int(ticket_id), int(quantity)
+        available = get_redis().get(counter_key(ticket_id))
+    except (TypeError, ValueError, RedisError):
+        return
+    if available is not None and int(available) < quantity:
+        sold_out_in_redis.inc()
+        raise CreateOrderException()
+
+
+def reserve(ticket_id: int, quantity: int) -> Reservation | None:
+    """Move ``quantity`` from the Redis counter of ``ticket_id`` into a hold.
+
+    Returns None when reservations are disabled, the counter is not mirrored yet or
+    Redis is unreachable, leaving the decision to Postgres.
+    """
+    if not settings.TICKET_RESERVATIONS:
+        return None
+
+    reservation = Reservation(ticket_id, quantity, uuid.uuid4().hex)
+    try:
+        result = _reserve(
+            keys=[counter_key(ticket_id), holds_key(ticket_id), HELD_TICKETS_KEY],
+            args=[
+                quantity,
+                time.time() + settings.TICKET_RESERVATION_TTL,
+                reservation.member,
+                ticket_id,
+            ],
+        )
+    except RedisError:
+        logger.warning("Redis is unavailable, skipping ticket reservation.", exc_info=True)
+        return None
+
+    if result == 0:
+        sold_out_in_redis.inc()
+        raise CreateOrderException()
+    return reservation if result == 1 else None
+
+
+def confirm(reservation: Reservation | None) -> None:
+    if reservation is None:
+        return
+    try:
+        get_redis().zrem(holds_key(reservation.ticket_id), reservation.member)
+    except RedisError:
+        logger.warning("Could not confirm reservation %s.", reservation.token, exc_info=True)
+
+
+def release(reservation: Reservation | None) -> None:
+    if reservation is None:
+        return
+    try:
+        _release(
+            keys=[counter_key(reservation.ticket_id), holds_key(reservation.ticket_id)],
+            args=[reservation.member, reservation.quantity],
+        )
+    except RedisError:
+        logger.warning("Could not release reservation %s.", reservation.token, exc_info=True)
+
+
+@contextmanager
+def admit(ticket_id: int, quantity: int):
+    """Hold stock in Redis for the database work done inside the block.
+
+    The hold is confirmed when the surrounding transaction commits and released right
+    away if the block raises.
+    """
+    reservation = reserve(ticket_id, quantity)
+    try:
+        yield reservation
+    except BaseException:
+        release(reservation)
+        raise
+    transaction.on_commit(partial(confirm, reservation))
+
+
+def expire_holds(now: float | None = None) -> int:
+    """Return holds whose order never confirmed to their counters."""
+    now = time.time() if now is None else now
+    client = get_redis()
+    released = 0
+    for ticket_id in client.smembers(HELD_TICKETS_KEY):
+        ticket_id = int(ticket_id)
+        released += _expire(
+            keys=[counter_key(ticket_id), holds_key(ticket_id), HELD_TICKETS_KEY],
+            args=[now, ticket_id],
+        )
+    return released
+
+
+def restock(quantities: dict[int, int]) -> None:
+    """Add stock returned to Postgres back to the counters that are mirrored."""
+    if not settings.TICKET_RESERVATIONS or not quantities:
+        return
+    try:
+        pipeline = get_redis().pipeline(transaction=False)
+        for ticket_id, quantity in quantities.items():
+            _restock(keys=[counter_key(ticket_id)], args=[quantity], client=pipeline)
+        pipeline.execute()
+    except RedisError:
+        logger.warning("Could not restock ticket counters.", exc_info=True)
+
+
+def sync_counters(tickets=None, chunk_size: int = 1000) -> int:
+    """Rebuild Redis counters from Postgres, minus the holds still in flight."""
+    tickets = Ticket.objects.all() if tickets is None else tickets
+    rows = tickets.annotate(
+        total=F("available_quantity") + Coalesce(Sum("shards__available_quantity"), 0)
+    ).values_list("pk", "event_id", "total")
+
+    synced = 0
+    pipeline = get_redis().pipeline(transaction=False)
+    for ticket_id, event_id, total in rows.iterator(chunk_size=chunk_size):
+        _sync(keys=[counter_key(ticket_id), holds_key(ticket_id)], args=[total], client=pipeline)
+        pipeline.set(event_key(ticket_id), event_id)
+        synced += 1
+        if synced % chunk_size == 0:
+            pipeline.execute()
+    pipeline.execute()
+    return synced
+
+
+def mirrored_event(ticket_id: int) -> int | None:
+    """The event of a mirrored ticket, or None when it is not mirrored or Redis is down."""
+    if not settings.TICKET_RESERVATIONS:
+        return None
+    try:
+        event_id = get_redis().get(event_key(ticket_id))
+    except RedisError:
+        return None
+    return None if event_id is None else int(event_id)
+
+
+def mirror_ticket(ticket_id: int) -> None:
+    if not settings.TICKET_RESERVATIONS:
+        return
+    try:
+        sync_counters(Ticket.objects.filter(pk=ticket_id))
+    except RedisError:
+        logger.warning("Could not mirror ticket %s to Redis.", ticket_id, exc_info=True)
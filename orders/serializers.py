@@ -1,23 +1,44 @@
+import time
+from collections import Counter
+from contextlib import ExitStack
+
 from django.db import transaction
+from django.db.models import OuterRef, Subquery
 from rest_framework import serializers
 
-from orders.exeptions import CreateOrderException, NotAuthenticatedException
+from events.models import Event
+from orders import outbox, waiting_room
+from orders.exeptions import NotAuthenticatedException
+from orders.holds import hold_expiry
+from orders.inventory import reserve, reserve_many
 from orders.models import Order, Ticket
-from orders.tasks import send_order_confirmation_notification
+from orders.reservations import admit
 
 
 class TicketSerializer(serializers.ModelSerializer):
+    available_quantity = serializers.IntegerField(source="total_available_quantity", read_only=True)
+
     class Meta:
         model = Ticket
         fields = "__all__"
         read_only_fields = ["id", "available_quantity"]
 
 
+# Tickets come with their event's waiting room flag, so ordering checks it without
+# another query. A correlated subquery always reads the event through its primary key,
+# where a join may scan the whole table when the planner thinks it is tiny.
+tickets_with_waiting_room = Ticket.objects.annotate(
+    waiting_room=Subquery(Event.objects.filter(pk=OuterRef("event_id")).values("waiting_room"))
+)
+
+
 class OrderSerializer(serializers.ModelSerializer):
+    ticket = serializers.PrimaryKeyRelatedField(queryset=tickets_with_waiting_room)
+
     class Meta:
         model = Order
         fields = "__all__"
-        read_only_fields = ["total_price", "status", "created_at", "user"]
+        read_only_fields = ["total_price", "status", "created_at", "expires_at", "user"]
 
     def validate(self, data):
         user = self.context["request"].user
@@ -27,32 +48,102 @@ class OrderSerializer(serializers.ModelSerializer):
 
         data["user"] = user
 
+        ticket = data["ticket"]
+        if ticket.waiting_room:
+            waiting_room.check_admission(self.context["request"], ticket.event_id)
+
         return data
 
     def create(self, validated_data):
         quantity = validated_data.get("quantity")
         ticket = validated_data.get("ticket")
+        gated_event = ticket.event_id if ticket.waiting_room else None
+        started = time.perf_counter()
 
-        with transaction.atomic():
-            ticket = Ticket.objects.select_for_update().get(pk=ticket.pk)
-
-            if quantity > ticket.available_quantity:
-                raise CreateOrderException("Not enough available ticket.")
+        with admit(ticket.pk, quantity), transaction.atomic():
+            ticket = reserve(ticket, quantity)
 
             total_price = quantity * ticket.price
 
             validated_data["total_price"] = total_price
 
-            ticket.available_quantity -= quantity
-            ticket.save()
-
             order = Order.objects.create(
-                user=validated_data["user"],
+                user_id=validated_data["user"].pk,
                 total_price=total_price,
                 quantity=quantity,
                 ticket=ticket,
+                expires_at=hold_expiry(),
             )
 
-            send_order_confirmation_notification.delay(order.id)
+            outbox.add(outbox.ORDER_CONFIRMATION, {"order_id": order.id})
 
+        if gated_event is not None:
+            waiting_room.record_order_latency(gated_event, time.perf_counter() - started)
         return order
+
+
+class OrderItemSerializer(serializers.Serializer):
+    ticket = serializers.IntegerField()
+    quantity = serializers.IntegerField(min_value=1)
+
+
+class BatchOrderSerializer(serializers.Serializer):
+    items = OrderItemSerializer(many=True, allow_empty=False)
+
+    def validate(self, data):
+        user = self.context["request"].user
+
+        if not user.is_authenticated:
+            raise NotAuthenticatedException("You are not authenticated.")
+
+        quantities = Counter()
+        for item in data["items"]:
+            quantities[item["ticket"]] += item["quantity"]
+
+        tickets = tickets_with_waiting_room.in_bulk(list(quantities))
+        missing = sorted(set(quantities) - set(tickets))
+        if missing:
+            raise serializers.ValidationError({"items": f"Tickets {missing} do not exist."})
+        gated_events = sorted(
+            {ticket.event_id for ticket in tickets.values() if ticket.waiting_room}
+        )
+        for event_id in gated_events:
+            waiting_room.check_admission(self.context["request"], event_id)
+
+        data["user"] = user
+        data["tickets"] = list(tickets.values())
+        data["quantities"] = dict(quantities)
+        data["gated_events"] = gated_events
+
+        return data
+
+    def create(self, validated_data):
+        quantities = validated_data["quantities"]
+        expires_at = hold_expiry()
+        started = time.perf_counter()
+
+        with ExitStack() as holds:
+            for ticket_id in sorted(quantities):
+                holds.enter_context(admit(ticket_id, quantities[ticket_id]))
+
+            with transaction.atomic():
+                tickets = reserve_many(validated_data["tickets"], quantities)
+
+                orders = Order.objects.bulk_create(
+                    Order(
+                        user_id=validated_data["user"].pk,
+                        ticket=tickets[ticket_id],
+                        quantity=quantity,
+                        total_price=quantity * tickets[ticket_id].price,
+                        expires_at=expires_at,
+                    )
+                    for ticket_id, quantity in quantities.items()
+                )
+
+                outbox.add(
+                    outbox.BATCH_ORDER_CONFIRMATION, {"order_ids": [order.id for order in orders]}
+                )
+
+        for event_id in validated_data["gated_events"]:
+            waiting_room.record_order_latency(event_id, time.perf_counter() - started)
+        return orders
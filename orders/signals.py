@@ -0,0 +1,10 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from eventservice.cache import bump_version_on_commit
+from orders.models import Ticket
+
+
+@receiver([post_save, post_delete], sender=Ticket)
+def bump_ticket_version(sender, **kwargs):
+    bump_version_on_commit("ticket")
@@ -1,57 +1,105 @@
-import asyncio
-
-from botocore.exceptions import (
-    ClientError,
-    EndpointConnectionError,
-    NoCredentialsError,
-    ParamValidationError,
-)
 from celery import shared_task
+from celery.signals import worker_process_init, worker_process_shutdown, worker_shutdown
+from celery.utils.time import get_exponential_backoff_interval
+from django.conf import settings
 
-from eventservice.config import settings
-from orders.models import Order
-from orders.utils import create_message, get_client, send_email
+from orders import holds, idempotency, notifications, reservations
+from orders.exeptions import CircuitOpenError, TransientSendError
+from orders.mailer import ses, ses_circuit
 
+# Transient send failures are retried by Celery with exponential backoff and full jitter,
+# so the worker thread is free while an email waits for its next attempt. While the SES
+# circuit is open sends are held back without calling SES; a task then waits for the
+# circuit to close, and up to NOTIFICATION_MAX_DEFERRALS such waits do not count as one
+# of its MAX_TRIES, so an outage longer than the backoff does not drop confirmations.
+RETRY_OPTIONS = {
+    "max_retries": settings.MAX_TRIES - 1,
+    "retry_backoff": settings.NOTIFICATION_RETRY_BACKOFF,
+    "retry_backoff_max": settings.NOTIFICATION_RETRY_BACKOFF_MAX,
+    "retry_jitter": True,
+}
 
-@shared_task
-async def handle_send_order_confirmation_notification(order_id: int):
-    try:
-        order = Order.objects.get(id=order_id)
-        user = order.user
-
-        recipient = user.email
-
-        message = create_message(
-            subject_data=f"Order Confirmation #{order_id}",
-            text=(
-                f"Hello, {user.username}!\n\n"
-                f'Your order for the event "{order.ticket.event.name}" '
-                f"has been successfully created.\n"
-                f"Number of tickets: {order.quantity}\n"
-                f"Total price: {order.total_price}\n\n"
-                "Thank you for your purchase!"
-            ),
+
+@worker_process_init.connect
+def start_ses_client(**kwargs):
+    ses.start()
+
+
+@worker_process_shutdown.connect
+@worker_shutdown.connect
+def stop_ses_client(**kwargs):
+    ses.stop()
+
+
+def retry_send(task, error: TransientSendError, deferrals: int, args=None):
+    """Retry a task whose send failed transiently.
+
+    ``deferrals`` counts the retries spent waiting for an open circuit that kept SES from
+    being called at all; they are added to the task's max_retries, so only sends that were
+    made use up its attempts, until NOTIFICATION_MAX_DEFERRALS is reached.
+    """
+    if isinstance(error, CircuitOpenError) and deferrals < settings.NOTIFICATION_MAX_DEFERRALS:
+        deferrals += 1
+        # While a half-open probe is in flight the circuit has no time left to wait out.
+        countdown = ses_circuit.open_for() or task.retry_backoff
+    else:
+        countdown = get_exponential_backoff_interval(
+            factor=task.retry_backoff,
+            retries=task.request.retries - deferrals,
+            maximum=task.retry_backoff_max,
+            full_jitter=task.retry_jitter,
         )
+    return task.retry(
+        args=args,
+        kwargs={"deferrals": deferrals},
+        exc=error,
+        countdown=countdown,
+        max_retries=task.max_retries + deferrals,
+    )
+
 
-        for attempt in range(settings.MAX_TRIES):
-            try:
-                async with await get_client() as client:
-                    await send_email(client=client, email=recipient, message=message)
-                return
-            except (
-                NoCredentialsError,
-                EndpointConnectionError,
-                ClientError,
-                ParamValidationError,
-            ):
-                if attempt < settings.MAX_TRIES - 1:
-                    await asyncio.sleep(1)
-                else:
-                    return
-    except Order.DoesNotExist:
+@shared_task(bind=True, **RETRY_OPTIONS)
+def send_order_confirmation_notification(self, order_id: int, deferrals: int = 0):
+    try:
+        sent = ses.run(notifications.confirm_order(order_id))
+    except TransientSendError as error:
+        raise retry_send(self, error, deferrals)
+    if not sent:
         return f"Order with id {order_id} does not exist."
 
 
+@shared_task(bind=True, **RETRY_OPTIONS)
+def send_batch_order_confirmation_notification(self, order_ids: list[int], deferrals: int = 0):
+    try:
+        sent = ses.run(notifications.confirm_batch_order(order_ids))
+    except TransientSendError as error:
+        raise retry_send(self, error, deferrals)
+    if not sent:
+        return f"Orders with ids {order_ids} do not exist."
+
+
+@shared_task(bind=True, **RETRY_OPTIONS)
+def send_order_confirmations(self, order_ids: list[int], deferrals: int = 0):
+    failed, deferred = ses.run(notifications.dispatch_confirmations(order_ids))
+    # Only the orders whose emails did not go out are sent again.
+    if failed:
+        error = TransientSendError(f"Confirmations for orders {failed} failed.")
+        raise retry_send(self, error, deferrals, args=[failed + deferred])
+    if deferred:
+        error = CircuitOpenError(f"Confirmations for orders {deferred} wait for SES.")
+        raise retry_send(self, error, deferrals, args=[deferred])
+
+
+@shared_task
+def expire_ticket_reservations():
+    return reservations.expire_holds()
+
+
+@shared_task
+def release_expired_order_holds():
+    return holds.release_expired_holds()
+
+
 @shared_task
-def send_order_confirmation_notification(order_id: int):
-    asyncio.run(handle_send_order_confirmation_notification(order_id=order_id))
+def purge_idempotency_keys():
+    return idempotency.purge_expired_keys()
@@ -0,0 +1,65 @@
+from datetime import timedelta
+
+import pytest
+from django.db import transaction
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+
+from orders.holds import release_expired_holds
+from orders.inventory import distribute_stock
+from orders.models import Order, PaidStatus
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ttl, expect_expiry", [(900, True), (0, False)])
+def test_order_hold_expiry_follows_ttl(
+    settings, api_client, create_user, create_ticket, ttl, expect_expiry
+):
+    settings.ORDER_HOLD_TTL = ttl
+    api_client.force_authenticate(user=create_user("customer"))
+
+    response = api_client.post(
+        reverse("order-list"), data={"ticket": create_ticket().id, "quantity": 1}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    order = Order.objects.get()
+    assert (order.expires_at is not None) == expect_expiry
+    if expect_expiry:
+        assert order.expires_at > timezone.now() + timedelta(seconds=ttl - 60)
+
+
+@pytest.mark.django_db
+def test_release_expired_holds_returns_stock(create_ticket, create_order):
+    ticket = create_ticket(quantity=100, available_quantity=90)
+    past = timezone.now() - timedelta(minutes=1)
+    expired = [create_order(ticket=ticket, quantity=2), create_order(ticket=ticket, quantity=3)]
+    Order.objects.filter(pk__in=[order.pk for order in expired]).update(expires_at=past)
+    paid = create_order(ticket=ticket, quantity=4)
+    Order.objects.filter(pk=paid.pk).update(expires_at=past, status=PaidStatus.paid)
+    active = create_order(ticket=ticket, quantity=1)
+    Order.objects.filter(pk=active.pk).update(expires_at=timezone.now() + timedelta(minutes=5))
+
+    assert release_expired_holds(batch_size=1) == 2
+
+    ticket.refresh_from_db()
+    assert ticket.available_quantity == 95
+    assert set(Order.objects.filter(status=PaidStatus.cancelled)) == set(expired)
+    assert Order.objects.get(pk=paid.pk).status == PaidStatus.paid
+    assert Order.objects.get(pk=active.pk).status == PaidStatus.pending
+
+
+@pytest.mark.django_db
+def test_release_expired_holds_restocks_shards(create_ticket, create_order):
+    ticket = create_ticket(quantity=10, available_quantity=8)
+    with transaction.atomic():
+        distribute_stock(ticket, 4)
+    order = create_order(ticket=ticket, quantity=2)
+    Order.objects.filter(pk=order.pk).update(expires_at=timezone.now() - timedelta(minutes=1))
+
+    assert release_expired_holds() == 1
+
+    ticket.refresh_from_db()
+    assert ticket.available_quantity == 0
+    assert ticket.total_available_quantity == 10
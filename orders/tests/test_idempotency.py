@@ -0,0 +1,178 @@
+import threading
+import time
+import uuid
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.urls import reverse
+from rest_framework import status
+from rest_framework.test import APIClient
+
+from eventservice.redis_client import get_redis
+from orders import idempotency
+from orders.models import IdempotencyKey, Order, Ticket
+from orders.views import OrderViewSet
+
+
+@pytest.fixture
+def customer(api_client, create_user):
+    user = create_user("customer")
+    api_client.force_authenticate(user=user)
+    return user
+
+
+@pytest.fixture
+def key(customer):
+    key = uuid.uuid4().hex
+    yield key
+    get_redis().delete(
+        idempotency.response_key(customer.pk, key), idempotency.lock_key(customer.pk, key)
+    )
+
+
+def place_order(client, ticket, key, quantity=1):
+    return client.post(
+        reverse("order-list"),
+        data={"ticket": ticket.id, "quantity": quantity},
+        format="json",
+        headers={"Idempotency-Key": key},
+    )
+
+
+@pytest.mark.django_db
+def test_retry_replays_response_without_touching_ticket(
+    api_client, customer, key, create_ticket, django_assert_num_queries
+):
+    ticket = create_ticket(available_quantity=5)
+    first = place_order(api_client, ticket, key)
+
+    with django_assert_num_queries(0):
+        retry = place_order(api_client, ticket, key)
+
+    assert first.status_code == retry.status_code == status.HTTP_201_CREATED
+    assert retry.data == first.data
+    assert retry["Idempotent-Replayed"] == "true"
+    assert Order.objects.filter(user=customer).count() == 1
+    assert Ticket.objects.get(pk=ticket.pk).available_quantity == 4
+
+
+@pytest.mark.django_db
+def test_response_is_replayed_from_database_when_redis_lost_it(
+    api_client, customer, key, create_ticket
+):
+    ticket = create_ticket(available_quantity=5)
+    first = place_order(api_client, ticket, key)
+    get_redis().delete(idempotency.response_key(customer.pk, key))
+
+    retry = place_order(api_client, ticket, key)
+
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert retry.data["id"] == first.data["id"]
+    assert Order.objects.filter(user=customer).count() == 1
+    assert get_redis().exists(idempotency.response_key(customer.pk, key))
+
+
+@pytest.mark.django_db
+def test_key_reused_for_different_request_is_rejected(api_client, customer, key, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+    place_order(api_client, ticket, key)
+
+    response = place_order(api_client, ticket, key, quantity=2)
+
+    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+    assert Order.objects.filter(user=customer).count() == 1
+
+
+@pytest.mark.django_db
+def test_failed_request_can_be_retried_with_same_key(api_client, customer, key, create_ticket):
+    ticket = create_ticket(available_quantity=1)
+
+    sold_out = place_order(api_client, ticket, key, quantity=2)
+    Ticket.objects.filter(pk=ticket.pk).update(available_quantity=2)
+    retry = place_order(api_client, ticket, key, quantity=2)
+
+    assert sold_out.status_code == status.HTTP_409_CONFLICT
+    assert retry.status_code == status.HTTP_201_CREATED
+    assert not retry.has_header("Idempotent-Replayed")
+
+
+@pytest.mark.django_db
+def test_duplicate_waits_for_request_in_flight(settings, api_client, customer, key, create_ticket):
+    settings.IDEMPOTENCY_LOCK_TIMEOUT = 5
+    ticket = create_ticket(available_quantity=5)
+    stored = {"fingerprint": None, "status": 201, "data": {"id": 42}}
+    get_redis().set(idempotency.lock_key(customer.pk, key), "first")
+
+    def finish_first():
+        time.sleep(0.2)
+        idempotency.store(customer.pk, key, stored)
+
+    finisher = threading.Thread(target=finish_first)
+    with patch.object(idempotency, "fingerprint", return_value=None):
+        finisher.start()
+        response = place_order(api_client, ticket, key)
+        finisher.join()
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data == {"id": 42}
+    assert not Order.objects.filter(user=customer).exists()
+
+
+@pytest.mark.django_db
+def test_duplicate_times_out_while_first_is_in_flight(
+    settings, api_client, customer, key, create_ticket
+):
+    settings.IDEMPOTENCY_LOCK_TIMEOUT = 1
+    ticket = create_ticket(available_quantity=5)
+    get_redis().set(idempotency.lock_key(customer.pk, key), "first")
+
+    response = place_order(api_client, ticket, key)
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert not Order.objects.filter(user=customer).exists()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_concurrent_duplicates_without_redis_create_one_order(customer, key, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+    create_order = OrderViewSet.create_order
+    responses = []
+
+    def slow_create_order(self, request, *args, **kwargs):
+        response = create_order(self, request, *args, **kwargs)
+        time.sleep(0.2)
+        return response
+
+    def buyer():
+        client = APIClient()
+        client.force_authenticate(user=customer)
+        try:
+            responses.append(place_order(client, ticket, key))
+        finally:
+            connection.close()
+
+    with (
+        patch.object(idempotency, "read_stored", return_value=None),
+        patch.object(idempotency, "acquire", return_value="token"),
+        patch.object(OrderViewSet, "create_order", slow_create_order),
+    ):
+        threads = [threading.Thread(target=buyer) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    assert [response.status_code for response in responses] == [201, 201]
+    assert responses[0].data["id"] == responses[1].data["id"]
+    assert Order.objects.filter(user=customer).count() == 1
+    assert IdempotencyKey.objects.filter(user=customer, key=key).count() == 1
+
+
+@pytest.mark.django_db
+def test_expired_keys_are_purged(settings, api_client, customer, key, create_ticket):
+    place_order(api_client, create_ticket(available_quantity=5), key)
+    settings.IDEMPOTENCY_KEY_TTL = 0
+
+    assert idempotency.purge_expired_keys() == 1
+    assert not IdempotencyKey.objects.exists()
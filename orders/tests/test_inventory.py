@@ -0,0 +1,145 @@
+import threading
+
+import pytest
+from django.db import connection, transaction
+from django.urls import reverse
+from rest_framework import status
+
+from orders.exeptions import CreateOrderException
+from orders.inventory import distribute_stock, reserve, reserve_conditional
+from orders.models import Order, Ticket, TicketShard
+
+
+@pytest.mark.django_db
+def test_distribute_stock_splits_available_quantity(create_ticket):
+    ticket = create_ticket(quantity=10, available_quantity=10)
+
+    with transaction.atomic():
+        distribute_stock(ticket, 4)
+
+    ticket.refresh_from_db()
+    shards = list(TicketShard.objects.filter(ticket=ticket).order_by("number"))
+    assert ticket.shard_count == 4
+    assert ticket.available_quantity == 0
+    assert [shard.available_quantity for shard in shards] == [3, 3, 2, 2]
+    assert ticket.total_available_quantity == 10
+
+
+@pytest.mark.django_db
+def test_distribute_stock_zero_folds_shards_back(create_ticket):
+    ticket = create_ticket(quantity=10, available_quantity=10)
+    with transaction.atomic():
+        distribute_stock(ticket, 4)
+        distribute_stock(ticket, 0)
+
+    ticket.refresh_from_db()
+    assert ticket.shard_count == 0
+    assert ticket.available_quantity == 10
+    assert not TicketShard.objects.filter(ticket=ticket).exists()
+
+
+@pytest.mark.django_db
+def test_reserve_sharded_falls_back_across_shards(create_ticket):
+    ticket = create_ticket(quantity=8, available_quantity=8)
+    with transaction.atomic():
+        distribute_stock(ticket, 4)
+    ticket.refresh_from_db()
+
+    with transaction.atomic():
+        reserve(ticket, 5)
+
+    assert ticket.total_available_quantity == 3
+
+    with pytest.raises(CreateOrderException):
+        with transaction.atomic():
+            reserve(ticket, 4)
+
+    assert ticket.total_available_quantity == 3
+
+
+@pytest.mark.django_db
+def test_create_sharded_ticket_exposes_shard_sum(api_client, create_user, create_event):
+    organizer = create_user("organizer")
+    event = create_event(organizer=organizer)
+    api_client.force_authenticate(user=organizer)
+
+    url = reverse("ticket-list")
+    data = {"event": event.id, "price": 10.0, "quantity": 100, "shard_count": 8}
+    response = api_client.post(url, data=data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert response.data["available_quantity"] == 100
+    ticket = Ticket.objects.get()
+    assert TicketShard.objects.filter(ticket=ticket).count() == 8
+
+    response = api_client.get(reverse("ticket-detail", args=[ticket.id]))
+    assert response.data["available_quantity"] == 100
+
+
+@pytest.mark.django_db
+def test_sharded_order_decrements_shards(api_client, create_user, create_ticket):
+    ticket = create_ticket(quantity=10, available_quantity=10)
+    with transaction.atomic():
+        distribute_stock(ticket, 2)
+
+    api_client.force_authenticate(user=create_user("customer"))
+    url = reverse("order-list")
+    response = api_client.post(url, data={"ticket": ticket.id, "quantity": 7}, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    ticket.refresh_from_db()
+    assert ticket.total_available_quantity == 3
+
+
+@pytest.mark.django_db
+def test_reserve_conditional_returns_price(create_ticket):
+    ticket = create_ticket(quantity=10, available_quantity=3, price=25.0)
+
+    with transaction.atomic():
+        reserved = reserve_conditional(ticket, 2)
+
+    assert reserved.price == 25
+    ticket.refresh_from_db()
+    assert ticket.available_quantity == 1
+
+    with pytest.raises(CreateOrderException):
+        with transaction.atomic():
+            reserve_conditional(ticket, 2)
+
+
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize(
+    "engine, shard_count", [("row_lock", 0), ("conditional_update", 0), ("row_lock", 4)]
+)
+def test_concurrent_orders_never_oversell(
+    settings, create_ticket, create_user, engine, shard_count
+):
+    settings.ORDER_ENGINE = engine
+    ticket = create_ticket(quantity=10, available_quantity=10)
+    if shard_count:
+        with transaction.atomic():
+            distribute_stock(ticket, shard_count)
+        ticket.refresh_from_db()
+    user = create_user("customer")
+    rejected = []
+
+    def buyer():
+        try:
+            with transaction.atomic():
+                reserved = reserve(ticket, 1)
+                Order.objects.create(user=user, ticket=reserved, quantity=1, total_price=1)
+        except CreateOrderException:
+            rejected.append(1)
+        finally:
+            connection.close()
+
+    threads = [threading.Thread(target=buyer) for _ in range(30)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    ticket = Ticket.objects.get(pk=ticket.pk)
+    assert Order.objects.filter(ticket=ticket).count() == 10
+    assert len(rejected) == 20
+    assert ticket.total_available_quantity == 0
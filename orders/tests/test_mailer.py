@@ -0,0 +1,56 @@
+import asyncio
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, patch
+
+import pytest
+
+from orders import utils
+from orders.mailer import SESClientPool
+
+
+@pytest.fixture
+def ses_client():
+    utils.verified_senders.clear()
+    client = AsyncMock()
+    opened = []
+
+    @asynccontextmanager
+    async def create_client():
+        opened.append(client)
+        yield client
+        client.closed = True
+
+    with patch("orders.mailer.create_client", create_client):
+        yield client, opened
+    utils.verified_senders.clear()
+
+
+def test_send_email_verifies_sender_once(ses_client):
+    client, _ = ses_client
+    message = utils.create_message(subject_data="Subject", text="Text")
+
+    for recipient in ("first@example.com", "second@example.com"):
+        asyncio.run(utils.send_email(client, recipient, message, sender="sender@example.com"))
+
+    client.verify_email_identity.assert_awaited_once_with(EmailAddress="sender@example.com")
+    assert client.send_email.await_count == 2
+    assert client.send_email.await_args.kwargs["Destination"] == {
+        "ToAddresses": ["second@example.com"]
+    }
+
+
+def test_pool_reuses_one_client_on_one_loop(ses_client):
+    client, opened = ses_client
+    pool = SESClientPool()
+
+    async def current():
+        return pool.client, asyncio.get_running_loop()
+
+    first = pool.run(current())
+    second = pool.run(current())
+    pool.stop()
+
+    assert first == second == (client, first[1])
+    assert opened == [client]
+    assert client.closed
+    assert pool.loop is None
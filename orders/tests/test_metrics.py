@@ -0,0 +1,75 @@
+import pytest
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from rest_framework import status
+
+from orders import tasks
+
+
+def sample(name: str, **labels) -> float:
+    return REGISTRY.get_sample_value(name, labels) or 0
+
+
+@pytest.mark.django_db
+def test_order_request_records_latency_queries_and_lock_wait(
+    api_client, create_user, create_ticket
+):
+    ticket = create_ticket(available_quantity=5)
+    api_client.force_authenticate(user=create_user("customer"))
+    labels = {"view": "OrderViewSet", "action": "create"}
+    requests = sample("http_request_duration_seconds_count", method="POST", status="201", **labels)
+    queries = sample("http_request_db_queries_sum", **labels)
+    lock_waits = sample("ticket_lock_wait_seconds_count", engine="row_lock")
+
+    response = api_client.post(
+        reverse("order-list"), data={"ticket": ticket.id, "quantity": 1}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    count = sample("http_request_duration_seconds_count", method="POST", status="201", **labels)
+    assert count == requests + 1
+    assert sample("http_request_db_queries_sum", **labels) > queries
+    assert sample("ticket_lock_wait_seconds_count", engine="row_lock") == lock_waits + 1
+
+
+@pytest.mark.django_db
+def test_sold_out_order_is_counted(api_client, create_user, create_ticket):
+    ticket = create_ticket(available_quantity=1)
+    api_client.force_authenticate(user=create_user("customer"))
+    sold_out = sample("orders_sold_out_total", source="database")
+
+    response = api_client.post(
+        reverse("order-list"), data={"ticket": ticket.id, "quantity": 2}, format="json"
+    )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert sample("orders_sold_out_total", source="database") == sold_out + 1
+
+
+@pytest.mark.django_db
+def test_task_duration_is_recorded():
+    labels = {"task": tasks.release_expired_order_holds.name, "state": "SUCCESS"}
+    runs = sample("celery_task_duration_seconds_count", **labels)
+
+    tasks.release_expired_order_holds.apply()
+
+    assert sample("celery_task_duration_seconds_count", **labels) == runs + 1
+
+
+@pytest.mark.django_db
+def test_metrics_endpoint(client):
+    response = client.get(reverse("metrics"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert b"http_request_duration_seconds" in response.content
+    assert b"ticket_lock_wait_seconds" in response.content
+
+
+def test_metrics_are_hidden_from_other_networks(client, settings):
+    settings.METRICS_ALLOWED_NETWORKS = ["10.0.0.0/8"]
+
+    outside = client.get(reverse("metrics"), HTTP_X_FORWARDED_FOR="10.0.0.2")
+    scraper = client.get(reverse("metrics"), REMOTE_ADDR="10.1.2.3")
+
+    assert outside.status_code == status.HTTP_404_NOT_FOUND
+    assert scraper.status_code == status.HTTP_200_OK
@@ -0,0 +1,354 @@
+import asyncio
+import json
+import threading
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
+
+import pytest
+from asgiref.sync import async_to_sync, sync_to_async
+from botocore.exceptions import ClientError, ParamValidationError
+from django.db import connections
+from django.urls import reverse
+from prometheus_client import REGISTRY
+from redis.exceptions import RedisError
+
+from eventservice import circuit_breaker
+from eventservice.redis_client import get_redis
+from orders import notifications, tasks, utils
+from orders.exeptions import CircuitOpenError, TransientSendError
+from orders.mailer import SESClientPool, ses_circuit
+
+
+def throttled():
+    return ClientError({"Error": {"Code": "Throttling"}}, "SendEmail")
+
+
+@pytest.fixture(autouse=True)
+def closed_circuit():
+    get_redis().delete(*ses_circuit.keys)
+    yield ses_circuit
+    get_redis().delete(*ses_circuit.keys)
+
+
+@pytest.fixture
+def ses_client():
+    client = AsyncMock()
+    utils.verified_senders.clear()
+    utils.stored_templates.clear()
+    with patch("orders.notifications.ses", SimpleNamespace(client=client)):
+        yield client
+    utils.verified_senders.clear()
+    utils.stored_templates.clear()
+
+
+@pytest.fixture
+def ses_pool():
+    """A real loop thread and pool, shared by the tasks, around a mocked SES client."""
+    client = AsyncMock()
+
+    @asynccontextmanager
+    async def create_client():
+        yield client
+
+    pool = SESClientPool()
+    with (
+        patch("orders.mailer.create_client", create_client),
+        patch("orders.tasks.ses", pool),
+        patch("orders.notifications.ses", pool),
+    ):
+        yield client
+        # ORM calls on the pool's loop run on asgiref's sync thread, whose persistent
+        # connection would otherwise keep the test database from being dropped.
+        pool.run(sync_to_async(connections.close_all)())
+    pool.stop()
+    utils.verified_senders.clear()
+
+
+@pytest.fixture
+def orders(create_user, create_order):
+    return [
+        create_order(user=create_user("customer", email=f"customer{number}@example.com"))
+        for number in range(3)
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_sends_batch_with_one_query(ses_client, orders, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        failed = async_to_sync(notifications.dispatch_confirmations)([order.id for order in orders])
+
+    assert failed == ([], [])
+    assert ses_client.send_email.await_count == 3
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_uses_bulk_templates(settings, ses_client, orders):
+    settings.NOTIFICATION_BULK_TEMPLATES = True
+
+    async_to_sync(notifications.dispatch_confirmations)([order.id for order in orders])
+
+    ses_client.create_template.assert_awaited_once_with(
+        Template=notifications.confirmation_template()
+    )
+    destinations = ses_client.send_bulk_templated_email.await_args.kwargs["Destinations"]
+    assert sorted(json.loads(d["ReplacementTemplateData"])["order_id"] for d in destinations) == [
+        order.id for order in orders
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_skips_users_without_email(ses_client, create_order):
+    order = create_order()
+
+    assert async_to_sync(notifications.dispatch_confirmations)([order.id]) == ([], [])
+    ses_client.send_email.assert_not_awaited()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_confirm_order_loads_order_with_one_query(ses_client, orders, django_assert_num_queries):
+    with django_assert_num_queries(1):
+        assert async_to_sync(notifications.confirm_order)(orders[0].id)
+
+    kwargs = ses_client.send_email.await_args.kwargs
+    assert kwargs["Destination"] == {"ToAddresses": ["customer0@example.com"]}
+    assert f"#{orders[0].id}" in kwargs["Message"]["Subject"]["Data"]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_confirm_missing_order(ses_client):
+    assert not async_to_sync(notifications.confirm_order)(0)
+    ses_client.send_email.assert_not_awaited()
+
+
+@pytest.mark.django_db(transaction=True)
+def test_tasks_share_the_loop_and_send_concurrently(ses_pool, orders):
+    started = []
+    both_in_flight = asyncio.Event()
+
+    async def send_email(**kwargs):
+        started.append(kwargs["Destination"])
+        if len(started) == 2:
+            both_in_flight.set()
+        await asyncio.wait_for(both_in_flight.wait(), timeout=5)
+
+    ses_pool.send_email.side_effect = send_email
+    errors = []
+
+    def run_task(order):
+        try:
+            tasks.send_order_confirmation_notification(order.id)
+        except Exception as error:
+            errors.append(error)
+
+    threads = [threading.Thread(target=run_task, args=(order,)) for order in orders[:2]]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert not errors
+    assert len(started) == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_returns_transient_failures_for_retry(ses_client, orders):
+    async def send_email(**kwargs):
+        if kwargs["Destination"] == {"ToAddresses": ["customer1@example.com"]}:
+            raise throttled()
+
+    ses_client.send_email.side_effect = send_email
+
+    failed, deferred = async_to_sync(notifications.dispatch_confirmations)(
+        [order.id for order in orders]
+    )
+
+    assert failed == [orders[1].id]
+    assert deferred == []
+    assert ses_circuit.state() == circuit_breaker.CLOSED
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_drops_permanent_failures(ses_client, orders, caplog):
+    ses_client.send_email.side_effect = ParamValidationError(report="Invalid Destination")
+
+    failed = async_to_sync(notifications.dispatch_confirmations)([order.id for order in orders])
+
+    assert failed == ([], [])
+    assert ses_client.send_email.await_count == 3
+    assert "will not be retried" in caplog.text
+
+
+@pytest.mark.django_db(transaction=True)
+def test_dispatch_retries_transient_bulk_statuses(settings, ses_client, orders):
+    settings.NOTIFICATION_BULK_TEMPLATES = True
+    ses_client.send_bulk_templated_email.return_value = {
+        "Status": [
+            {"Status": "Success"},
+            {"Status": "AccountThrottled"},
+            {"Status": "MessageRejected", "Error": "Rejected"},
+        ]
+    }
+
+    failed, _ = async_to_sync(notifications.dispatch_confirmations)([order.id for order in orders])
+
+    destinations = ses_client.send_bulk_templated_email.await_args.kwargs["Destinations"]
+    order_ids = [json.loads(d["ReplacementTemplateData"])["order_id"] for d in destinations]
+    assert failed == [order_ids[1]]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_circuit_opens_after_repeated_transient_failures(ses_client, orders):
+    ses_client.send_email.side_effect = throttled()
+    order_ids = [order.id for order in orders]
+
+    for _ in range(ses_circuit.failure_threshold):
+        with pytest.raises(TransientSendError):
+            async_to_sync(notifications.confirm_order)(orders[0].id)
+    assert ses_circuit.state() == circuit_breaker.OPEN
+
+    ses_client.send_email.reset_mock()
+    failed, deferred = async_to_sync(notifications.dispatch_confirmations)(order_ids)
+
+    assert failed == []
+    assert sorted(deferred) == order_ids
+    ses_client.send_email.assert_not_awaited()
+
+
+def test_half_open_circuit_lets_one_probe_through(closed_circuit):
+    for _ in range(closed_circuit.failure_threshold):
+        closed_circuit.record_failure()
+    get_redis().delete(closed_circuit.keys[0])
+
+    assert closed_circuit.state() == circuit_breaker.HALF_OPEN
+    assert closed_circuit.allow() == circuit_breaker.HALF_OPEN
+    assert closed_circuit.allow() == circuit_breaker.OPEN
+
+    closed_circuit.record_success()
+    assert closed_circuit.allow() == circuit_breaker.CLOSED
+
+
+def test_failed_probe_opens_circuit_again(closed_circuit):
+    for _ in range(closed_circuit.failure_threshold):
+        closed_circuit.record_failure()
+    get_redis().delete(closed_circuit.keys[0])
+
+    assert closed_circuit.allow() == circuit_breaker.HALF_OPEN
+    closed_circuit.record_failure()
+
+    assert closed_circuit.state() == circuit_breaker.OPEN
+
+
+def test_circuit_lets_calls_through_without_redis(closed_circuit):
+    with patch("eventservice.circuit_breaker._allow", side_effect=RedisError):
+        assert closed_circuit.allow() == circuit_breaker.CLOSED
+
+
+@pytest.mark.django_db
+def test_metrics_report_circuit_state(client, closed_circuit):
+    for _ in range(closed_circuit.failure_threshold):
+        closed_circuit.record_failure()
+
+    response = client.get(reverse("metrics"))
+
+    body = response.content.decode()
+    assert 'circuit_breaker_state{circuit="ses",circuit_breaker_state="open"} 1.0' in body
+    assert 'circuit_breaker_state{circuit="ses",circuit_breaker_state="closed"} 0.0' in body
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_task_retries_only_failed_orders(ses_pool, orders, monkeypatch):
+    monkeypatch.setattr(tasks.send_order_confirmations, "max_retries", 1)
+    attempts = []
+
+    async def send_email(**kwargs):
+        recipient = kwargs["Destination"]["ToAddresses"][0]
+        attempts.append(recipient)
+        if recipient == "customer1@example.com" and attempts.count(recipient) == 1:
+            raise throttled()
+
+    ses_pool.send_email.side_effect = send_email
+
+    result = tasks.send_order_confirmations.apply(args=[[order.id for order in orders]])
+
+    assert result.successful()
+    assert sorted(attempts) == [
+        "customer0@example.com",
+        "customer1@example.com",
+        "customer1@example.com",
+        "customer2@example.com",
+    ]
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_task_gives_up_after_max_retries(ses_pool, orders, monkeypatch):
+    monkeypatch.setattr(tasks.send_order_confirmations, "max_retries", 1)
+    ses_pool.send_email.side_effect = throttled()
+
+    result = tasks.send_order_confirmations.apply(args=[[orders[0].id]])
+
+    assert isinstance(result.result, TransientSendError)
+    assert ses_pool.send_email.await_count == 2
+
+
+@pytest.mark.django_db(transaction=True)
+def test_order_task_retries_transient_failure(ses_pool, orders, monkeypatch):
+    task = tasks.send_order_confirmation_notification
+    monkeypatch.setattr(task, "max_retries", 1)
+    ses_pool.send_email.side_effect = [throttled(), None]
+    retries = REGISTRY.get_sample_value("celery_task_retries_total", {"task": task.name}) or 0
+
+    result = task.apply(args=[orders[0].id])
+
+    assert result.successful()
+    assert ses_pool.send_email.await_count == 2
+    assert REGISTRY.get_sample_value("celery_task_retries_total", {"task": task.name}) == (
+        retries + 1
+    )
+
+
+@pytest.mark.django_db(transaction=True)
+def test_task_waits_out_an_open_circuit_without_using_retries(
+    ses_pool, orders, closed_circuit, monkeypatch
+):
+    task = tasks.send_order_confirmations
+    monkeypatch.setattr(task, "max_retries", 1)
+    for _ in range(closed_circuit.failure_threshold):
+        closed_circuit.record_failure()
+    allow, checks = closed_circuit.allow, []
+
+    def recover_after_four_checks():
+        checks.append(closed_circuit.open_for())
+        if len(checks) == 4:
+            get_redis().delete(*closed_circuit.keys)
+        return allow()
+
+    monkeypatch.setattr(closed_circuit, "allow", recover_after_four_checks)
+
+    result = task.apply(args=[[orders[0].id]])
+
+    assert result.successful()
+    assert all(0 < wait <= closed_circuit.recovery_timeout for wait in checks[:4])
+    assert ses_pool.send_email.await_count == 1
+
+
+@pytest.mark.django_db(transaction=True)
+def test_failures_that_open_the_circuit_use_up_retries(
+    settings, ses_pool, orders, closed_circuit, monkeypatch
+):
+    task = tasks.send_order_confirmation_notification
+    monkeypatch.setattr(task, "max_retries", 1)
+    monkeypatch.setattr(closed_circuit, "failure_threshold", 1)
+    settings.NOTIFICATION_MAX_DEFERRALS = 2
+    ses_pool.send_email.side_effect = throttled()
+    retries = REGISTRY.get_sample_value("celery_task_retries_total", {"task": task.name}) or 0
+
+    result = task.apply(args=[orders[0].id])
+
+    # The failed send opens the circuit and uses up the one retry. The retries held back by
+    # the open circuit are free, but only NOTIFICATION_MAX_DEFERRALS of them.
+    assert isinstance(result.result, CircuitOpenError)
+    assert ses_pool.send_email.await_count == 1
+    assert REGISTRY.get_sample_value("celery_task_retries_total", {"task": task.name}) == (
+        retries + 3
+    )
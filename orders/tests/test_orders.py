@@ -2,7 +2,7 @@ import pytest
 from django.urls import reverse
 from rest_framework import status
 
-from orders.models import Order
+from orders.models import Order, OutboxMessage, PaidStatus, TicketType
 
 
 @pytest.mark.django_db
@@ -52,8 +52,8 @@ def test_list_orders_by_owner_success(api_client, create_ticket, create_user, cr
     response = api_client.get(url)
 
     assert response.status_code == status.HTTP_200_OK
-    assert len(response.data) == 1
-    assert response.data[0]["user"] == user1.id
+    assert len(response.data["results"]) == 1
+    assert response.data["results"][0]["user"] == user1.id
 
 
 @pytest.mark.django_db
@@ -107,3 +107,119 @@ def test_forbidden_order_methods_failure(api_client, create_user, create_order,
         response = api_client.delete(url)
 
     assert response.status_code == status.HTTP_405_METHOD_NOT_ALLOWED
+
+
+@pytest.mark.django_db
+def test_batch_order_creates_all_orders_with_one_notification(
+    api_client, create_user, create_event, create_ticket
+):
+    user = create_user("customer")
+    event = create_event()
+    standard = create_ticket(event=event, type=TicketType.standard, price=10.0)
+    vip = create_ticket(event=event, type=TicketType.vip, price=50.0)
+    api_client.force_authenticate(user=user)
+
+    data = {
+        "items": [
+            {"ticket": standard.id, "quantity": 2},
+            {"ticket": vip.id, "quantity": 1},
+            {"ticket": standard.id, "quantity": 1},
+        ]
+    }
+    response = api_client.post(reverse("order-batch"), data=data, format="json")
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert len(response.data) == 2
+    assert Order.objects.get(ticket=standard).quantity == 3
+    assert Order.objects.get(ticket=vip).total_price == 50
+    assert OutboxMessage.objects.get().payload == {
+        "order_ids": [order["id"] for order in response.data]
+    }
+    standard.refresh_from_db()
+    assert standard.available_quantity == standard.quantity - 3
+
+
+@pytest.mark.django_db
+def test_batch_order_is_all_or_nothing(api_client, create_user, create_ticket):
+    user = create_user("customer")
+    plenty = create_ticket(available_quantity=100)
+    scarce = create_ticket(available_quantity=1)
+    api_client.force_authenticate(user=user)
+
+    data = {"items": [{"ticket": plenty.id, "quantity": 5}, {"ticket": scarce.id, "quantity": 2}]}
+    response = api_client.post(reverse("order-batch"), data=data, format="json")
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert Order.objects.count() == 0
+    plenty.refresh_from_db()
+    assert plenty.available_quantity == 100
+
+
+@pytest.mark.django_db
+def test_batch_order_unknown_ticket_failure(api_client, create_user, create_ticket):
+    api_client.force_authenticate(user=create_user("customer"))
+
+    data = {
+        "items": [{"ticket": create_ticket().id, "quantity": 1}, {"ticket": 999999, "quantity": 1}]
+    }
+    response = api_client.post(reverse("order-batch"), data=data, format="json")
+
+    assert response.status_code == status.HTTP_400_BAD_REQUEST
+    assert Order.objects.count() == 0
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("ordering", [None, "created_at"])
+def test_list_orders_keyset_pagination(api_client, create_user, create_order, ordering):
+    user = create_user("customer")
+    orders = [create_order(user=user, quantity=1) for _ in range(5)]
+    Order.objects.filter(pk__in=[orders[1].pk, orders[2].pk]).update(
+        created_at=orders[1].created_at
+    )
+    api_client.force_authenticate(user=user)
+
+    params = {"page_size": 2}
+    if ordering:
+        params["ordering"] = ordering
+    response = api_client.get(reverse("order-list"), params)
+    seen = [order["id"] for order in response.data["results"]]
+    while response.data["next"]:
+        response = api_client.get(response.data["next"])
+        seen += [order["id"] for order in response.data["results"]]
+
+    expected = Order.objects.filter(user=user).order_by(
+        *(("created_at", "id") if ordering else ("-created_at", "-id"))
+    )
+    assert seen == [order.id for order in expected]
+
+
+@pytest.mark.django_db
+def test_list_orders_invalid_cursor_failure(api_client, create_user):
+    api_client.force_authenticate(user=create_user("customer"))
+
+    response = api_client.get(reverse("order-list"), {"cursor": "not-a-cursor"})
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize(
+    "term, expected",
+    [("concert", ["Rock Concert"]), ("concrt", ["Rock Concert"]), ("paid", ["Opera Gala"])],
+)
+def test_search_orders(
+    api_client, create_user, create_event, create_ticket, create_order, term, expected
+):
+    user = create_user("customer")
+    for name in ("Rock Concert", "Opera Gala"):
+        create_order(ticket=create_ticket(event=create_event(name=name)), user=user)
+    Order.objects.filter(ticket__event__name="Opera Gala").update(status=PaidStatus.paid)
+    api_client.force_authenticate(user=user)
+
+    response = api_client.get(reverse("order-list"), {"search": term})
+
+    assert response.status_code == status.HTTP_200_OK
+    names = [
+        Order.objects.get(pk=order["id"]).ticket.event.name for order in response.data["results"]
+    ]
+    assert names == expected
@@ -0,0 +1,60 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from orders import outbox
+from orders.models import Order, OutboxMessage
+
+
+@pytest.mark.django_db
+def test_order_writes_outbox_message(api_client, create_user, order_data):
+    api_client.force_authenticate(user=create_user("customer"))
+
+    response = api_client.post(reverse("order-list"), data=order_data)
+
+    message = OutboxMessage.objects.get()
+    assert message.topic == outbox.ORDER_CONFIRMATION
+    assert message.payload == {"order_id": response.data["id"]}
+
+
+@pytest.mark.django_db
+def test_rejected_order_writes_no_message(api_client, create_user, create_ticket):
+    api_client.force_authenticate(user=create_user("customer"))
+    ticket = create_ticket(available_quantity=1)
+
+    response = api_client.post(reverse("order-list"), data={"ticket": ticket.id, "quantity": 2})
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert not Order.objects.exists()
+    assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db
+def test_relay_publishes_batches_and_deletes_messages(settings):
+    settings.NOTIFICATION_BATCH_SIZE = 2
+    for order_id in (1, 2, 3):
+        outbox.add(outbox.ORDER_CONFIRMATION, {"order_id": order_id})
+    outbox.add(outbox.BATCH_ORDER_CONFIRMATION, {"order_ids": [4, 5]})
+
+    with (
+        patch("orders.outbox.send_order_confirmations.delay") as confirmations,
+        patch("orders.outbox.send_batch_order_confirmation_notification.delay") as batch,
+    ):
+        assert outbox.relay_batch(batch_size=10) == 4
+
+    assert [call.args for call in confirmations.call_args_list] == [([1, 2],), ([3],)]
+    batch.assert_called_once_with([4, 5])
+    assert not OutboxMessage.objects.exists()
+
+
+@pytest.mark.django_db
+def test_failed_publish_keeps_messages(settings):
+    outbox.add(outbox.ORDER_CONFIRMATION, {"order_id": 1})
+
+    with patch("orders.outbox.send_order_confirmations.delay", side_effect=ConnectionError):
+        with pytest.raises(ConnectionError):
+            outbox.relay_batch(batch_size=10)
+
+    assert OutboxMessage.objects.count() == 1
@@ -0,0 +1,132 @@
+from unittest.mock import patch
+
+import pytest
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.urls import reverse
+from redis.exceptions import RedisError
+from rest_framework import status
+
+from events.models import Event
+from eventservice import db_router
+from eventservice.cache import local_cache, version_key
+from eventservice.redis_client import get_redis
+from orders.models import Order
+
+
+@pytest.fixture
+def replica_reads(settings, monkeypatch):
+    """Route replica reads to the test database and record the models read from one."""
+    settings.DATABASE_REPLICAS = ["default"]
+    models = []
+    db_for_read = db_router.ReplicaRouter.db_for_read
+
+    def recording_db_for_read(self, model, **hints):
+        if db_router.read_from_replica.get():
+            models.append(model)
+        return db_for_read(self, model, **hints)
+
+    monkeypatch.setattr(db_router.ReplicaRouter, "db_for_read", recording_db_for_read)
+    return models
+
+
+@pytest.fixture
+def response_cache(settings):
+    settings.RESPONSE_CACHE = True
+    cache.delete_many([version_key(label) for label in ("venue", "event", "ticket")])
+    local_cache.clear()
+
+
+@pytest.fixture
+def customer(create_user):
+    user = create_user("customer")
+    get_redis().delete(db_router.pin_key(user))
+    yield user
+    get_redis().delete(db_router.pin_key(user))
+
+
+def test_router_reads_from_replica_only_when_asked(settings):
+    settings.DATABASE_REPLICAS = ["replica_0"]
+    router = db_router.ReplicaRouter()
+
+    assert router.db_for_read(Event) == DEFAULT_DB_ALIAS
+    token = db_router.read_from_replica.set(True)
+    try:
+        assert router.db_for_read(Event) == "replica_0"
+        assert router.db_for_write(Event) == DEFAULT_DB_ALIAS
+        with db_router.primary_reads():
+            assert router.db_for_read(Event) == DEFAULT_DB_ALIAS
+    finally:
+        db_router.read_from_replica.reset(token)
+    assert not router.allow_migrate("replica_0", "events")
+
+
+@pytest.mark.django_db
+def test_order_list_reads_from_replica(replica_reads, api_client, customer, create_order):
+    create_order(user=customer)
+    api_client.force_authenticate(user=customer)
+
+    response = api_client.get(reverse("order-list"))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert Order in replica_reads
+    assert not db_router.read_from_replica.get()
+
+
+@pytest.mark.django_db
+def test_user_is_pinned_to_primary_after_ordering(
+    replica_reads, settings, api_client, customer, create_ticket
+):
+    ticket = create_ticket(available_quantity=5)
+    api_client.force_authenticate(user=customer)
+
+    created = api_client.post(
+        reverse("order-list"), data={"ticket": ticket.id, "quantity": 1}, format="json"
+    )
+    listed = api_client.get(reverse("order-list"))
+
+    assert created.status_code == status.HTTP_201_CREATED
+    assert [order["id"] for order in listed.data["results"]] == [created.data["id"]]
+    assert replica_reads == []
+    assert 0 < get_redis().ttl(db_router.pin_key(customer)) <= settings.DB_PRIMARY_PIN_SECONDS
+
+
+@pytest.mark.django_db
+def test_cached_catalog_is_built_from_replica_briefly(
+    replica_reads, response_cache, settings, api_client, create_event
+):
+    create_event(name="Event1")
+
+    with patch.object(cache, "set", wraps=cache.set) as cache_set:
+        first = api_client.get(reverse("event-list"))
+    built_from = list(replica_reads)
+    replica_reads.clear()
+    second = api_client.get(reverse("event-list"))
+
+    assert Event in built_from
+    assert first.data == second.data
+    assert replica_reads == []
+    assert cache_set.call_args.args[2] == settings.DB_PRIMARY_PIN_SECONDS
+    assert not local_cache._data
+
+
+@pytest.mark.django_db
+def test_cached_catalog_of_pinned_user_is_kept(
+    replica_reads, response_cache, settings, api_client, customer, create_event
+):
+    create_event(name="Event1")
+    db_router.pin_to_primary(customer)
+    api_client.force_authenticate(user=customer)
+
+    with patch.object(cache, "set", wraps=cache.set) as cache_set:
+        api_client.get(reverse("event-list"))
+
+    assert replica_reads == []
+    assert cache_set.call_args.args[2] == settings.RESPONSE_CACHE_TIMEOUT
+    assert local_cache._data
+
+
+@pytest.mark.django_db
+def test_unreadable_pin_keeps_user_on_primary(customer):
+    with patch.object(get_redis(), "exists", side_effect=RedisError):
+        assert db_router.is_pinned(customer)
@@ -0,0 +1,116 @@
+import time
+
+import pytest
+from django.core.management import call_command
+from django.urls import reverse
+from rest_framework import status
+
+from eventservice.redis_client import get_redis
+from orders import reservations
+from orders.exeptions import CreateOrderException
+from orders.models import Order
+
+
+@pytest.fixture
+def redis_reservations(settings):
+    settings.TICKET_RESERVATIONS = True
+    yield get_redis()
+    keys = list(get_redis().scan_iter("tickets:*"))
+    if keys:
+        get_redis().delete(*keys)
+
+
+def counter(ticket) -> int:
+    return int(get_redis().get(reservations.counter_key(ticket.pk)))
+
+
+@pytest.mark.django_db
+def test_reserve_without_counter_defers_to_database(redis_reservations, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+
+    assert reservations.reserve(ticket.pk, 2) is None
+
+
+@pytest.mark.django_db
+def test_reserve_moves_stock_into_hold(redis_reservations, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+    reservations.sync_counters()
+
+    reservation = reservations.reserve(ticket.pk, 2)
+
+    assert counter(ticket) == 3
+    assert redis_reservations.zcard(reservations.holds_key(ticket.pk)) == 1
+
+    reservations.confirm(reservation)
+    assert counter(ticket) == 3
+    assert redis_reservations.zcard(reservations.holds_key(ticket.pk)) == 0
+
+
+@pytest.mark.django_db
+def test_sold_out_order_rejected_without_database(
+    redis_reservations, api_client, create_user, create_ticket, django_assert_num_queries
+):
+    ticket = create_ticket(available_quantity=1)
+    reservations.sync_counters()
+    api_client.force_authenticate(user=create_user("customer"))
+
+    with django_assert_num_queries(0):
+        response = api_client.post(
+            reverse("order-list"), data={"ticket": ticket.id, "quantity": 2}, format="json"
+        )
+
+    assert response.status_code == status.HTTP_409_CONFLICT
+    assert Order.objects.count() == 0
+
+
+@pytest.mark.django_db
+def test_order_confirms_reservation(
+    redis_reservations, api_client, create_user, create_ticket, django_capture_on_commit_callbacks
+):
+    ticket = create_ticket(available_quantity=5)
+    reservations.sync_counters()
+    api_client.force_authenticate(user=create_user("customer"))
+
+    with django_capture_on_commit_callbacks(execute=True):
+        response = api_client.post(
+            reverse("order-list"), data={"ticket": ticket.id, "quantity": 2}, format="json"
+        )
+
+    assert response.status_code == status.HTTP_201_CREATED
+    assert counter(ticket) == 3
+    assert redis_reservations.zcard(reservations.holds_key(ticket.pk)) == 0
+
+
+@pytest.mark.django_db
+def test_failed_database_write_releases_hold(redis_reservations, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+    reservations.sync_counters()
+
+    with pytest.raises(CreateOrderException):
+        with reservations.admit(ticket.pk, 2):
+            raise CreateOrderException()
+
+    assert counter(ticket) == 5
+    assert redis_reservations.zcard(reservations.holds_key(ticket.pk)) == 0
+
+
+@pytest.mark.django_db
+def test_expire_holds_returns_stale_stock(redis_reservations, create_ticket):
+    ticket = create_ticket(available_quantity=5)
+    reservations.sync_counters()
+    reservations.reserve(ticket.pk, 2)
+
+    assert reservations.expire_holds(now=time.time()) == 0
+    assert reservations.expire_holds(now=time.time() + 3600) == 2
+    assert counter(ticket) == 5
+    assert not redis_reservations.sismember(reservations.HELD_TICKETS_KEY, ticket.pk)
+
+
+@pytest.mark.django_db
+def test_rebuild_ticket_counters_command(redis_reservations, create_ticket):
+    ticket = create_ticket(available_quantity=7)
+    redis_reservations.set(reservations.counter_key(ticket.pk), 0)
+
+    call_command("rebuild_ticket_counters")
+
+    assert counter(ticket) == 7
@@ -0,0 +1,65 @@
+from unittest.mock import patch
+
+import pytest
+from django.urls import reverse
+from redis.exceptions import RedisError
+from rest_framework import status
+
+from eventservice import throttling
+
+
+def place_order(client, ticket):
+    return client.post(
+        reverse("order-list"), data={"ticket": ticket.id, "quantity": 1}, format="json"
+    )
+
+
+@pytest.mark.django_db
+def test_orders_are_limited_per_user(throttle_rates, api_client, create_user, create_ticket):
+    throttle_rates["orders_user"] = "2/min"
+    ticket = create_ticket(available_quantity=10)
+    api_client.force_authenticate(user=create_user("customer"))
+
+    statuses = [place_order(api_client, ticket).status_code for _ in range(3)]
+    throttled = place_order(api_client, ticket)
+    listed = api_client.get(reverse("order-list"))
+
+    assert statuses == [201, 201, 429]
+    assert int(throttled["Retry-After"]) == 30
+    assert listed.status_code == status.HTTP_200_OK
+
+    api_client.force_authenticate(user=create_user("another"))
+    assert place_order(api_client, ticket).status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_orders_are_limited_per_event(throttle_rates, api_client, create_user, create_ticket):
+    throttle_rates["orders_event"] = "1/min"
+    ticket = create_ticket(available_quantity=10)
+    other_event_ticket = create_ticket(available_quantity=10)
+
+    api_client.force_authenticate(user=create_user("first"))
+    first = place_order(api_client, ticket)
+    api_client.force_authenticate(user=create_user("second"))
+    second = place_order(api_client, ticket)
+    batch = api_client.post(
+        reverse("order-batch"),
+        data={"items": [{"ticket": other_event_ticket.id, "quantity": 1}]},
+        format="json",
+    )
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert batch.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_requests_go_through_without_redis(throttle_rates, api_client, create_user, create_ticket):
+    throttle_rates["orders_user"] = "1/min"
+    ticket = create_ticket(available_quantity=10)
+    api_client.force_authenticate(user=create_user("customer"))
+
+    with patch.object(throttling, "_take", side_effect=RedisError):
+        statuses = [place_order(api_client, ticket).status_code for _ in range(2)]
+
+    assert statuses == [201, 201]
@@ -0,0 +1,170 @@
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from eventservice import throttling
+from eventservice.redis_client import get_redis
+from orders import waiting_room
+from orders.models import Order
+
+
+@pytest.fixture
+def gated_ticket(settings, create_ticket):
+    settings.WAITING_ROOM_RATE = 1
+    ticket = create_ticket(available_quantity=10)
+    ticket.event.waiting_room = True
+    ticket.event.save()
+    get_redis().delete(waiting_room.room_key(ticket.event_id))
+    yield ticket
+    get_redis().delete(waiting_room.room_key(ticket.event_id))
+
+
+def join(client, event_id):
+    return client.post(reverse("event-queue", args=[event_id]))
+
+
+def rewind(event_id: int, seconds: float) -> None:
+    """Move the room's clock back, as if ``seconds`` had passed since it was last read."""
+    room = waiting_room.room_key(event_id)
+    clock = float(get_redis().hget(room, "clock"))
+    get_redis().hset(room, "clock", clock - seconds)
+
+
+def place_order(client, ticket, token=None):
+    headers = {waiting_room.HEADER: token} if token else {}
+    return client.post(
+        reverse("order-list"),
+        data={"ticket": ticket.id, "quantity": 1},
+        format="json",
+        headers=headers,
+    )
+
+
+@pytest.mark.django_db
+def test_buyers_are_queued_and_admitted_at_rate(api_client, create_user, gated_ticket):
+    api_client.force_authenticate(user=create_user("first"))
+    first = join(api_client, gated_ticket.event_id)
+    api_client.force_authenticate(user=create_user("second"))
+    second = join(api_client, gated_ticket.event_id)
+
+    assert first.status_code == second.status_code == status.HTTP_201_CREATED
+    assert first.data["admitted"]
+    assert not second.data["admitted"]
+    assert second.data["position"] == 1
+    assert second.data["retry_after"] == 1
+
+    rewind(gated_ticket.event_id, 1)
+    position = api_client.get(
+        reverse("event-queue-position", args=[gated_ticket.event_id]),
+        headers={waiting_room.HEADER: second.data["token"]},
+    )
+    assert position.data == {"position": 0, "admitted": True, "retry_after": 0}
+
+
+@pytest.mark.django_db
+def test_joining_again_keeps_the_same_place(api_client, create_user, gated_ticket):
+    api_client.force_authenticate(user=create_user("first"))
+    join(api_client, gated_ticket.event_id)
+    api_client.force_authenticate(user=create_user("second"))
+    first_join = join(api_client, gated_ticket.event_id)
+    second_join = join(api_client, gated_ticket.event_id)
+    api_client.force_authenticate(user=create_user("third"))
+    third = join(api_client, gated_ticket.event_id)
+
+    assert first_join.data["position"] == second_join.data["position"] == 1
+    assert third.data["position"] == 2
+
+
+@pytest.mark.django_db
+def test_joining_is_throttled_per_user(monkeypatch, api_client, create_user, gated_ticket):
+    monkeypatch.setattr(throttling.TokenBucketThrottle, "THROTTLE_RATES", {"queue_user": "2/min"})
+    user = create_user("customer")
+    api_client.force_authenticate(user=user)
+
+    statuses = [join(api_client, gated_ticket.event_id).status_code for _ in range(3)]
+    get_redis().delete(f"throttle:queue_user:{user.pk}")
+
+    assert statuses == [201, 201, 429]
+
+
+@pytest.mark.django_db
+def test_position_is_served_without_database(
+    api_client, create_user, gated_ticket, django_assert_num_queries
+):
+    api_client.force_authenticate(user=create_user("customer"))
+    token = join(api_client, gated_ticket.event_id).data["token"]
+    api_client.force_authenticate(user=None)
+
+    with django_assert_num_queries(0):
+        response = api_client.get(
+            reverse("event-queue-position", args=[gated_ticket.event_id]),
+            headers={waiting_room.HEADER: token},
+        )
+
+    assert response.status_code == status.HTTP_200_OK
+    assert response.data["admitted"]
+
+
+@pytest.mark.django_db
+def test_event_without_waiting_room_cannot_be_joined(api_client, create_user, create_event):
+    api_client.force_authenticate(user=create_user("customer"))
+
+    response = join(api_client, create_event().id)
+
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+
+@pytest.mark.django_db
+def test_order_needs_admitted_token(api_client, create_user, gated_ticket):
+    api_client.force_authenticate(user=create_user("first"))
+    admitted = join(api_client, gated_ticket.event_id).data["token"]
+    api_client.force_authenticate(user=create_user("second"))
+    waiting = join(api_client, gated_ticket.event_id).data["token"]
+
+    without_token = place_order(api_client, gated_ticket)
+    not_admitted = place_order(api_client, gated_ticket, waiting)
+    someone_elses = place_order(api_client, gated_ticket, admitted)
+
+    assert without_token.status_code == status.HTTP_403_FORBIDDEN
+    assert not_admitted.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+    assert not_admitted["Retry-After"] == "1"
+    assert someone_elses.status_code == status.HTTP_403_FORBIDDEN
+    assert not Order.objects.exists()
+
+    rewind(gated_ticket.event_id, 1)
+    assert place_order(api_client, gated_ticket, waiting).status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_batch_order_needs_admitted_token(api_client, create_user, gated_ticket):
+    api_client.force_authenticate(user=create_user("customer"))
+    url = reverse("order-batch")
+    data = {"items": [{"ticket": gated_ticket.id, "quantity": 1}]}
+
+    rejected = api_client.post(url, data=data, format="json")
+    token = join(api_client, gated_ticket.event_id).data["token"]
+    accepted = api_client.post(url, data=data, format="json", headers={waiting_room.HEADER: token})
+
+    assert rejected.status_code == status.HTTP_403_FORBIDDEN
+    assert accepted.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_admission_rate_follows_order_latency(settings, gated_ticket):
+    settings.WAITING_ROOM_RATE = 20
+    settings.WAITING_ROOM_TARGET_LATENCY = 0.25
+    room = waiting_room.room_key(gated_ticket.event_id)
+
+    def rate():
+        return float(get_redis().hget(room, "rate"))
+
+    waiting_room.record_order_latency(gated_ticket.event_id, 0.01)
+    assert rate() == 20 + waiting_room.RATE_INCREASE
+
+    # Within the adjustment interval only the latency average moves.
+    waiting_room.record_order_latency(gated_ticket.event_id, 5)
+    assert rate() == 20 + waiting_room.RATE_INCREASE
+
+    get_redis().hset(room, "adjusted_at", 0)
+    waiting_room.record_order_latency(gated_ticket.event_id, 5)
+    assert rate() == (20 + waiting_room.RATE_INCREASE) * waiting_room.RATE_DECREASE
@@ -1,9 +1,44 @@
+import asyncio
+import json
+
 import aioboto3
+from botocore.config import Config
+from botocore.exceptions import ClientError
+from botocore.exceptions import ConnectionError as BotocoreConnectionError
+from botocore.exceptions import HTTPClientError
 
 from eventservice.config import settings
 
+# Senders this process has already asked SES to verify, and templates it has stored.
+verified_senders: set[str] = set()
+stored_templates: set[str] = set()
 
-async def get_client() -> aioboto3.Session.client:
+# SES errors that say "not now" rather than "never": throttling and server-side failures.
+# Anything else, such as a rejected message, an invalid parameter or missing credentials,
+# fails the same way on every attempt.
+TRANSIENT_ERROR_CODES = {
+    "Throttling",
+    "ThrottlingException",
+    "TooManyRequestsException",
+    "ServiceUnavailable",
+    "InternalFailure",
+    "RequestTimeout",
+    "RequestTimeoutException",
+}
+TRANSIENT_BULK_STATUSES = {"TransientFailure", "AccountThrottled"}
+
+
+def is_transient(error: Exception) -> bool:
+    if isinstance(error, (BotocoreConnectionError, HTTPClientError, asyncio.TimeoutError)):
+        return True
+    if isinstance(error, ClientError):
+        code = error.response.get("Error", {}).get("Code")
+        status = error.response.get("ResponseMetadata", {}).get("HTTPStatusCode", 0)
+        return code in TRANSIENT_ERROR_CODES or status >= 500
+    return False
+
+
+def create_client():
     session = aioboto3.Session()
     return session.client(
         settings.SERVICES,
@@ -11,9 +46,14 @@ async def get_client() -> aioboto3.Session.client:
         region_name=settings.AWS_DEFAULT_REGION,
         aws_access_key_id=settings.AWS_ACCESS_KEY_ID,
         aws_secret_access_key=settings.AWS_SECRET_ACCESS_KEY,
+        config=Config(max_pool_connections=settings.SES_MAX_CONNECTIONS),
     )
 
 
+async def get_client() -> aioboto3.Session.client:
+    return create_client()
+
+
 def create_message(subject_data: str, text: str) -> dict:
     message = {
         "Subject": {"Data": subject_data, "Charset": "UTF-8"},
@@ -28,17 +68,63 @@ def create_message(subject_data: str, text: str) -> dict:
     return message
 
 
+async def verify_sender(client: aioboto3.Session.client, sender: str) -> None:
+    if sender not in verified_senders:
+        # Mark it first so concurrent sends on the same loop do not all verify it too.
+        verified_senders.add(sender)
+        try:
+            await client.verify_email_identity(EmailAddress=sender)
+        except Exception:
+            verified_senders.discard(sender)
+            raise
+
+
 async def send_email(
     client: aioboto3.Session.client,
     email: str,
     message: dict,
     sender: str = settings.SENDER,
 ) -> None:
-    await client.verify_email_identity(EmailAddress=sender)
+    await verify_sender(client, sender)
     await client.send_email(
         Source=sender,
         Destination={
-            "ToAddresses": email,
+            "ToAddresses": [email],
         },
         Message=message,
     )
+
+
+async def put_template(client: aioboto3.Session.client, template: dict) -> None:
+    if template["TemplateName"] in stored_templates:
+        return
+    try:
+        await client.create_template(Template=template)
+    except ClientError as error:
+        if error.response["Error"]["Code"] != "AlreadyExists":
+            raise
+        await client.update_template(Template=template)
+    stored_templates.add(template["TemplateName"])
+
+
+async def send_bulk_templated_email(
+    client: aioboto3.Session.client,
+    template: str,
+    recipients: list[tuple[str, dict]],
+    sender: str = settings.SENDER,
+) -> list[dict]:
+    """Send one templated email per recipient and return SES's status for each, in order."""
+    await verify_sender(client, sender)
+    response = await client.send_bulk_templated_email(
+        Source=sender,
+        Template=template,
+        DefaultTemplateData="{}",
+        Destinations=[
+            {
+                "Destination": {"ToAddresses": [email]},
+                "ReplacementTemplateData": json.dumps(data),
+            }
+            for email, data in recipients
+        ],
+    )
+    return response["Status"]
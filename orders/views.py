@@ -1,35 +1,92 @@
-from rest_framework import permissions, viewsets
+from functools import partial
+
+from django.db import transaction
+from django.db.models import Sum
+from rest_framework import permissions, status, viewsets
+from rest_framework.decorators import action
 from rest_framework.exceptions import PermissionDenied
-from rest_framework.filters import OrderingFilter, SearchFilter
+from rest_framework.filters import OrderingFilter
+from rest_framework.response import Response
 
+from events.filters import FullTextSearchFilter
+from eventservice.cache import CachedResponseMixin
+from eventservice.db_router import ReadReplicaMixin
+from eventservice.throttling import EventTokenBucketThrottle, UserTokenBucketThrottle
+from orders.idempotency import idempotent
+from orders.inventory import distribute_stock
 from orders.models import Order, Ticket
+from orders.pagination import OrderKeysetPagination
 from orders.permissions import IsTicketOrganizerOrAdminOrReadOnly
-from orders.serializers import OrderSerializer, TicketSerializer
+from orders.reservations import mirror_ticket, reject_if_sold_out
+from orders.serializers import BatchOrderSerializer, OrderSerializer, TicketSerializer
 
 
-class TicketViewSet(viewsets.ModelViewSet):
-    queryset = Ticket.objects.all()
+class TicketViewSet(ReadReplicaMixin, CachedResponseMixin, viewsets.ModelViewSet):
+    cache_models = ("ticket",)
+    queryset = Ticket.objects.annotate(shards_available_quantity=Sum("shards__available_quantity"))
     serializer_class = TicketSerializer
     permission_classes = [IsTicketOrganizerOrAdminOrReadOnly]
 
     def perform_create(self, serializer):
         event = serializer.validated_data.get("event")
-        if event.organizer != self.request.user and not self.request.user.is_staff:
+        if event.organizer_id != self.request.user.pk and not self.request.user.is_staff:
             raise PermissionDenied("Ticket can only be made by an organizer or admin.")
-        serializer.save(available_quantity=serializer.validated_data.get("quantity"))
+        with transaction.atomic():
+            ticket = serializer.save(available_quantity=serializer.validated_data.get("quantity"))
+            if ticket.shard_count:
+                distribute_stock(ticket, ticket.shard_count)
+                serializer.instance = self.get_queryset().get(pk=ticket.pk)
+            transaction.on_commit(partial(mirror_ticket, ticket.pk))
+
+    def perform_update(self, serializer):
+        shard_count = serializer.instance.shard_count
+        with transaction.atomic():
+            ticket = serializer.save()
+            if ticket.shard_count != shard_count:
+                distribute_stock(ticket, ticket.shard_count)
+                serializer.instance = self.get_queryset().get(pk=ticket.pk)
 
 
-class OrderViewSet(viewsets.ModelViewSet):
+class OrderViewSet(ReadReplicaMixin, viewsets.ModelViewSet):
+    replica_actions = ("list",)
     queryset = Order.objects.all()
     serializer_class = OrderSerializer
     permission_classes = [permissions.IsAuthenticated]
     http_method_names = ["get", "post", "head", "options"]
-    filter_backends = [SearchFilter, OrderingFilter]
+    filter_backends = [FullTextSearchFilter, OrderingFilter]
+    pagination_class = OrderKeysetPagination
 
-    search_fields = ["status", "ticket__event__name"]
-    ordering_fields = ["created_at", "status"]
+    throttle_scope = "orders"
+    throttle_classes = [UserTokenBucketThrottle, EventTokenBucketThrottle]
+
+    search_vector_field = "ticket__event__search_vector"
+    search_trigram_field = "ticket__event__name"
+    search_exact_fields = ["status"]
+    ordering_fields = ["created_at"]
     ordering = ["-created_at"]
 
     def get_queryset(self):
-        user = self.request.user
-        return Order.objects.filter(user=user)
+        return Order.objects.filter(user_id=self.request.user.pk)
+
+    def get_throttles(self):
+        # Only placing orders takes stock; reading them back is not limited.
+        if self.action in ("create", "batch"):
+            return super().get_throttles()
+        return []
+
+    def create(self, request, *args, **kwargs):
+        return idempotent(request, partial(self.create_order, request, *args, **kwargs))
+
+    def create_order(self, request, *args, **kwargs):
+        reject_if_sold_out(request.data.get("ticket"), request.data.get("quantity"))
+        return super().create(request, *args, **kwargs)
+
+    @action(detail=False, methods=["post"], serializer_class=BatchOrderSerializer)
+    def batch(self, request):
+        return idempotent(request, partial(self.create_batch, request))
+
+    def create_batch(self, request):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        orders = serializer.save()
+        return Response(OrderSerializer(orders, many=True).data, status=status.HTTP_201_CREATED)
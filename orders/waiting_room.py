@@ -0,0 +1,180 @@
+import logging
+import math
+import time
+
+from django.conf import settings
+from django.core import signing
+from redis.exceptions import RedisError
+from rest_framework.exceptions import PermissionDenied, Throttled
+
+from eventservice.redis_client import get_redis
+from orders.exeptions import WaitingRoomUnavailable
+
+logger = logging.getLogger(__name__)
+
+# Events with ``waiting_room`` set only take orders from buyers admitted through their
+# queue. Joining hands out the next number in line inside a signed token; each user gets
+# one number per room, so joining again returns the same place. Numbers are
+# admitted in order at the room's rate, which a Lua script applies lazily whenever the
+# room is read, so no process has to tick it. Orders for the event report how long they
+# took: while the moving average stays under WAITING_ROOM_TARGET_LATENCY the rate grows
+# by RATE_INCREASE each interval, and above it the rate is halved (AIMD).
+
+HEADER = "Queue-Token"
+TOKEN_SALT = "orders.waiting_room"
+
+RATE_INCREASE = 5.0
+RATE_DECREASE = 0.5
+ADJUST_INTERVAL = 1.0
+LATENCY_SMOOTHING = 0.2
+
+ADMIT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local number
+if ARGV[2] ~= '' then
+    local place = 'user:' .. ARGV[2]
+    number = tonumber(redis.call('HGET', KEYS[1], place))
+    if not number then
+        number = redis.call('HINCRBY', KEYS[1], 'tail', 1)
+        redis.call('HSET', KEYS[1], place, number)
+    end
+end
+local tail = tonumber(redis.call('HGET', KEYS[1], 'tail') or '0')
+local room = redis.call('HMGET', KEYS[1], 'admitted', 'clock', 'rate')
+local admitted = tonumber(room[1] or '0')
+-- A new room starts with one second's worth of admissions.
+local clock = tonumber(room[2] or now - 1)
+local rate = tonumber(room[3] or ARGV[3])
+admitted = math.min(tail, admitted + math.max(now - clock, 0) * rate)
+redis.call('HSET', KEYS[1], 'admitted', tostring(admitted), 'clock', ARGV[1])
+redis.call('EXPIRE', KEYS[1], ARGV[4])
+return {number or tail, tostring(admitted), tostring(rate)}
+"""
+
+ADAPT_SCRIPT = """
+local now = tonumber(ARGV[1])
+local latency = tonumber(ARGV[2])
+local target, min_rate, max_rate = tonumber(ARGV[3]), tonumber(ARGV[4]), tonumber(ARGV[5])
+local increase, decrease = tonumber(ARGV[6]), tonumber(ARGV[7])
+local interval, smoothing = tonumber(ARGV[8]), tonumber(ARGV[9])
+local room = redis.call('HMGET', KEYS[1], 'latency', 'adjusted_at', 'rate')
+if room[1] then
+    latency = smoothing * latency + (1 - smoothing) * tonumber(room[1])
+end
+local rate = tonumber(room[3] or ARGV[10])
+if now - tonumber(room[2] or '0') >= interval then
+    if latency > target then
+        rate = math.max(min_rate, rate * decrease)
+    else
+        rate = math.min(max_rate, rate + increase)
+    end
+    redis.call('HSET', KEYS[1], 'rate', tostring(rate), 'adjusted_at', ARGV[1])
+end
+redis.call('HSET', KEYS[1], 'latency', tostring(latency))
+return tostring(rate)
+"""
+
+_admit = get_redis().register_script(ADMIT_SCRIPT)
+_adapt = get_redis().register_script(ADAPT_SCRIPT)
+
+
+def room_key(event_id: int) -> str:
+    return f"waiting_room:{event_id}"
+
+
+def advance(event_id: int, user_id: int | None = None) -> tuple[int, float, float]:
+    """Admit buyers owed since the last call and, given ``user_id``, put them in line.
+
+    Returns the user's number (the last one handed out without a user), how many numbers
+    are admitted and the room's rate.
+    """
+    number, admitted, rate = _admit(
+        keys=[room_key(event_id)],
+        args=[
+            time.time(),
+            "" if user_id is None else user_id,
+            settings.WAITING_ROOM_RATE,
+            settings.WAITING_ROOM_TOKEN_TTL,
+        ],
+    )
+    return int(number), float(admitted), float(rate)
+
+
+def status(number: int, admitted: float, rate: float) -> dict:
+    position = max(number - math.floor(admitted), 0)
+    return {
+        "position": position,
+        "admitted": position == 0,
+        "retry_after": math.ceil(position / rate) if position else 0,
+    }
+
+
+def join(event_id: int, user) -> dict:
+    try:
+        number, admitted, rate = advance(event_id, user.pk)
+    except RedisError:
+        logger.warning("Could not join the waiting room of event %s.", event_id, exc_info=True)
+        raise WaitingRoomUnavailable()
+    token = signing.dumps({"event": event_id, "user": user.pk, "number": number}, salt=TOKEN_SALT)
+    return {"token": token, **status(number, admitted, rate)}
+
+
+def read_token(token: str | None, event_id: int) -> dict:
+    try:
+        claims = signing.loads(
+            token or "", salt=TOKEN_SALT, max_age=settings.WAITING_ROOM_TOKEN_TTL
+        )
+    except signing.BadSignature:
+        raise PermissionDenied(f"A valid {HEADER} from this event's waiting room is required.")
+    if claims["event"] != event_id:
+        raise PermissionDenied(f"This {HEADER} is for another event.")
+    return claims
+
+
+def position(event_id: int, token: str | None) -> dict:
+    claims = read_token(token, event_id)
+    try:
+        _, admitted, rate = advance(event_id)
+    except RedisError:
+        logger.warning("Could not read the waiting room of event %s.", event_id, exc_info=True)
+        raise WaitingRoomUnavailable()
+    return status(claims["number"], admitted, rate)
+
+
+def check_admission(request, event_id: int) -> None:
+    """Let an order for a waiting room event through only with an admitted token."""
+    claims = read_token(request.headers.get(HEADER), event_id)
+    if claims["user"] != request.user.pk:
+        raise PermissionDenied(f"This {HEADER} belongs to another user.")
+    try:
+        _, admitted, rate = advance(event_id)
+    except RedisError:
+        # The ticket row lock still keeps stock right, only unthrottled.
+        logger.warning("Waiting room of event %s is unavailable.", event_id, exc_info=True)
+        return
+    waiting = status(claims["number"], admitted, rate)
+    if not waiting["admitted"]:
+        raise Throttled(
+            wait=waiting["retry_after"], detail="Not admitted from the waiting room yet."
+        )
+
+
+def record_order_latency(event_id: int, seconds: float) -> None:
+    try:
+        _adapt(
+            keys=[room_key(event_id)],
+            args=[
+                time.time(),
+                seconds,
+                settings.WAITING_ROOM_TARGET_LATENCY,
+                settings.WAITING_ROOM_MIN_RATE,
+                settings.WAITING_ROOM_MAX_RATE,
+                RATE_INCREASE,
+                RATE_DECREASE,
+                ADJUST_INTERVAL,
+                LATENCY_SMOOTHING,
+                settings.WAITING_ROOM_RATE,
+            ],
+        )
+    except RedisError:
+        logger.warning("Could not adapt the waiting room of event %s.", event_id, exc_info=True)
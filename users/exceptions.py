@@ -0,0 +1,10 @@
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class RegistrationBusy(APIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = "Too many registrations are in progress, try again shortly."
+    default_code = "registration_busy"
+    # Sent back as Retry-After.
+    wait = 1
@@ -0,0 +1,44 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.hashers import make_password
+
+from users.exceptions import RegistrationBusy
+
+# Hashing a new password takes ~100 ms of CPU. Each process hashes on at most
+# PASSWORD_HASH_WORKERS threads, with up to PASSWORD_HASH_BACKLOG more passwords waiting
+# for one; registrations beyond that are turned away with a 503 instead of tying up more
+# request threads. hashlib releases the GIL while it hashes, so the pool's threads do not
+# slow down the requests served next to them beyond the CPU they use.
+
+
+class HashingPool:
+    def __init__(self, workers: int, backlog: int) -> None:
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="password")
+        self.slots = threading.BoundedSemaphore(workers + backlog)
+
+    def make_password(self, password: str) -> str:
+        if not self.slots.acquire(blocking=False):
+            raise RegistrationBusy()
+        try:
+            return self.executor.submit(make_password, password).result()
+        finally:
+            self.slots.release()
+
+
+_pool: HashingPool | None = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> HashingPool:
+    """The process's pool, started on first use so that each forked worker gets its own."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = HashingPool(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_BACKLOG)
+        return _pool
+
+
+def hash_password(password: str) -> str:
+    return get_pool().make_password(password)
@@ -1,5 +1,8 @@
 from django.contrib.auth.models import User
 from rest_framework import serializers
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer
+
+from users.hashing import hash_password
 
 
 class UserSerializer(serializers.ModelSerializer):
@@ -9,8 +12,20 @@ class UserSerializer(serializers.ModelSerializer):
         extra_kwargs = {"password": {"write_only": True}}
 
     def create(self, validated_data):
-        return User.objects.create_user(
-            username=validated_data.get("username"),
-            email=validated_data.get("email"),
-            password=validated_data.get("password"),
+        return User.objects.create(
+            username=User.normalize_username(validated_data.get("username")),
+            email=User.objects.normalize_email(validated_data.get("email")),
+            password=hash_password(validated_data.get("password")),
         )
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    """Put what permission checks need into the token, so requests never load the user."""
+
+    @classmethod
+    def get_token(cls, user):
+        token = super().get_token(user)
+        token["username"] = user.username
+        token["is_staff"] = user.is_staff
+        token["is_superuser"] = user.is_superuser
+        return token
@@ -0,0 +1,129 @@
+import time
+import uuid
+
+import jwt
+import pytest
+from django.urls import reverse
+from rest_framework import status
+
+from events.models import Event
+from orders.models import Order
+
+
+def obtain_tokens(client, user) -> dict:
+    response = client.post(
+        reverse("token-obtain"),
+        data={"username": user.username, "password": "password123"},
+        format="json",
+    )
+    assert response.status_code == status.HTTP_200_OK
+    return response.data
+
+
+def bearer(token: str) -> dict:
+    return {"Authorization": f"Bearer {token}"}
+
+
+@pytest.mark.django_db
+def test_token_requests_do_not_load_the_user(api_client, capture_sql, create_user, create_order):
+    user = create_user("customer")
+    order = create_order(user=user)
+    access = obtain_tokens(api_client, user)["access"]
+
+    with capture_sql() as statements:
+        response = api_client.get(reverse("order-list"), headers=bearer(access))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert [item["id"] for item in response.data["results"]] == [order.id]
+    assert statements
+    assert not [sql for sql in statements if "auth_user" in sql or "django_session" in sql]
+
+
+@pytest.mark.django_db
+def test_token_user_places_orders_and_creates_events(
+    api_client, create_user, create_ticket, event_data
+):
+    user = create_user("organizer")
+    headers = bearer(obtain_tokens(api_client, user)["access"])
+    ticket = create_ticket()
+
+    order = api_client.post(
+        reverse("order-list"),
+        data={"ticket": ticket.id, "quantity": 1},
+        format="json",
+        headers=headers,
+    )
+    event = api_client.post(reverse("event-list"), data=event_data, format="json", headers=headers)
+    update = api_client.patch(
+        reverse("event-detail", args=[event.data["id"]]),
+        data={"name": "Renamed"},
+        format="json",
+        headers=headers,
+    )
+
+    assert order.status_code == status.HTTP_201_CREATED
+    assert Order.objects.get().user == user
+    assert event.status_code == status.HTTP_201_CREATED
+    assert Event.objects.get(pk=event.data["id"]).organizer == user
+    assert update.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_staff_claim_grants_user_list(api_client, create_user):
+    staff = obtain_tokens(api_client, create_user("admin", is_staff=True))["access"]
+    customer = obtain_tokens(api_client, create_user("customer"))["access"]
+
+    assert api_client.get(reverse("user-list"), headers=bearer(staff)).status_code == 200
+    assert api_client.get(reverse("user-list"), headers=bearer(customer)).status_code == 403
+
+
+@pytest.mark.django_db
+def test_refresh_token_renews_access(api_client, create_user):
+    refresh = obtain_tokens(api_client, create_user("customer"))["refresh"]
+
+    response = api_client.post(reverse("token-refresh"), data={"refresh": refresh}, format="json")
+    orders = api_client.get(reverse("order-list"), headers=bearer(response.data["access"]))
+
+    assert response.status_code == status.HTTP_200_OK
+    assert orders.status_code == status.HTTP_200_OK
+
+
+@pytest.mark.django_db
+def test_logins_are_limited_per_address(throttle_rates, api_client, create_user):
+    throttle_rates["login_ip"] = "2/min"
+    user = create_user("customer")
+    data = {"username": user.username, "password": "wrong"}
+
+    statuses = [
+        api_client.post(reverse("token-obtain"), data=data, format="json").status_code
+        for _ in range(3)
+    ]
+
+    assert statuses == [401, 401, 429]
+
+
+@pytest.mark.django_db
+def test_invalid_token_is_rejected(api_client):
+    response = api_client.get(reverse("order-list"), headers=bearer("not-a-token"))
+    anonymous = api_client.get(reverse("order-list"))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
+    assert anonymous.status_code == status.HTTP_403_FORBIDDEN
+
+
+@pytest.mark.django_db
+def test_token_signed_with_another_key_is_rejected(api_client, create_user):
+    admin = create_user("admin", is_staff=True)
+    claims = {
+        "token_type": "access",
+        "exp": int(time.time()) + 300,
+        "jti": uuid.uuid4().hex,
+        "user_id": str(admin.pk),
+        "is_staff": True,
+        "is_superuser": True,
+    }
+    forged = jwt.encode(claims, "an-attacker-chosen-signing-key-" * 2, algorithm="HS256")
+
+    response = api_client.get(reverse("user-list"), headers=bearer(forged))
+
+    assert response.status_code == status.HTTP_401_UNAUTHORIZED
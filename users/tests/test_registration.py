@@ -0,0 +1,80 @@
+import pytest
+from django.contrib.auth.models import User
+from django.urls import reverse
+from rest_framework import status
+
+from users import hashing
+
+
+def register(client, username: str, **extra):
+    data = {"username": username, "email": f"{username}@EXAMPLE.com", "password": "x" * 12}
+    return client.post(reverse("user-registration"), data=data, format="json", **extra)
+
+
+@pytest.mark.django_db
+def test_registered_user_can_log_in(api_client):
+    response = register(api_client, "newcomer")
+
+    user = User.objects.get(username="newcomer")
+    assert response.status_code == status.HTTP_201_CREATED
+    assert "password" not in response.data
+    assert user.email == "newcomer@example.com"
+    assert user.check_password("x" * 12)
+
+
+@pytest.mark.django_db
+def test_registration_is_turned_away_when_hashing_is_saturated(api_client, monkeypatch):
+    pool = hashing.HashingPool(workers=1, backlog=0)
+    monkeypatch.setattr(hashing, "_pool", pool)
+
+    pool.slots.acquire()
+    busy = register(api_client, "first")
+    pool.slots.release()
+    free = register(api_client, "second")
+
+    assert busy.status_code == status.HTTP_503_SERVICE_UNAVAILABLE
+    assert busy["Retry-After"] == "1"
+    assert not User.objects.filter(username="first").exists()
+    assert free.status_code == status.HTTP_201_CREATED
+
+
+@pytest.mark.django_db
+def test_user_list_is_paginated_without_password_hashes(api_client, capture_sql, create_user):
+    admin = create_user("admin", is_staff=True)
+    users = [admin, *(create_user(f"user{number}") for number in range(3))]
+    api_client.force_authenticate(user=admin)
+
+    with capture_sql() as statements:
+        first = api_client.get(reverse("user-list"), data={"page_size": 2})
+    second = api_client.get(first.data["next"])
+
+    assert [user["id"] for user in first.data["results"] + second.data["results"]] == [
+        user.id for user in users
+    ]
+    assert second.data["next"] is None
+    assert len(statements) == 1
+    assert "password" not in statements[0]
+
+
+@pytest.mark.django_db
+def test_registration_is_limited_per_address(throttle_rates, api_client):
+    throttle_rates["registration_ip"] = "1/h"
+
+    first = register(api_client, "first", REMOTE_ADDR="10.0.0.1")
+    second = register(api_client, "second", REMOTE_ADDR="10.0.0.1")
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
+
+
+@pytest.mark.django_db
+def test_registration_limit_ignores_forwarded_for(throttle_rates, api_client):
+    throttle_rates["registration_ip"] = "1/h"
+
+    first = register(api_client, "first", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.1")
+    second = register(
+        api_client, "second", REMOTE_ADDR="10.0.0.1", HTTP_X_FORWARDED_FOR="192.0.2.2"
+    )
+
+    assert first.status_code == status.HTTP_201_CREATED
+    assert second.status_code == status.HTTP_429_TOO_MANY_REQUESTS
@@ -1,8 +1,11 @@
 from django.urls import path
+from rest_framework_simplejwt.views import TokenRefreshView
 
-from users.views import UserListView, UserRegistrationView
+from users.views import TokenObtainView, UserListView, UserRegistrationView
 
 urlpatterns = [
     path("register/", UserRegistrationView.as_view(), name="user-registration"),
+    path("token/", TokenObtainView.as_view(), name="token-obtain"),
+    path("token/refresh/", TokenRefreshView.as_view(), name="token-refresh"),
     path("", UserListView.as_view(), name="user-list"),
 ]
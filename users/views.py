@@ -1,16 +1,31 @@
 from django.contrib.auth.models import User
 from rest_framework import generics, permissions
+from rest_framework_simplejwt.views import TokenObtainPairView
 
-from users.serializers import UserSerializer
+from eventservice.throttling import IPTokenBucketThrottle
+from users.pagination import UserCursorPagination
+from users.serializers import ClaimsTokenObtainPairSerializer, UserSerializer
 
 
 class UserRegistrationView(generics.CreateAPIView):
     queryset = User.objects.all()
     serializer_class = UserSerializer
     permission_classes = [permissions.AllowAny]
+    # Every registration hashes a password, so one client must not be able to flood it.
+    throttle_scope = "registration"
+    throttle_classes = [IPTokenBucketThrottle]
 
 
 class UserListView(generics.ListAPIView):
-    queryset = User.objects.all()
+    # Only the serialized columns, leaving out password hashes and the rest of the row.
+    queryset = User.objects.only("id", "username", "email")
     serializer_class = UserSerializer
     permission_classes = [permissions.IsAdminUser]
+    pagination_class = UserCursorPagination
+
+
+class TokenObtainView(TokenObtainPairView):
+    serializer_class = ClaimsTokenObtainPairSerializer
+    # Every login checks a password hash, and guesses must not come unlimited.
+    throttle_scope = "login"
+    throttle_classes = [IPTokenBucketThrottle]